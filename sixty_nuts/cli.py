@@ -5,7 +5,7 @@ import os
 import shutil
 import time
 import json  # Add missing import
-from typing import Annotated, Optional, cast
+from typing import Annotated, Any, Coroutine, Optional, TypeVar, cast
 
 import typer
 from rich.console import Console
@@ -21,6 +21,13 @@ try:
 except ImportError:
     HAS_QRCODE = False
 
+try:
+    import uvloop  # type: ignore
+
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
 from .types import WalletError
 from .wallet import (
     Wallet,
@@ -48,9 +55,22 @@ app = typer.Typer(
 )
 console = Console()
 
+T = TypeVar("T")
+
 # Environment variable for NSEC is "NSEC"
 
 
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a command coroutine, on uvloop when it is installed.
+
+    The libuv-based loop cuts the per-message scheduling overhead of the
+    relay websocket loops compared to the default selector event loop.
+    """
+    if HAS_UVLOOP:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
 def get_nsec_from_env() -> str | None:
     """Get NSEC from environment variable or .env file.
 
@@ -1153,7 +1173,7 @@ def balance(
                                         )
 
     try:
-        asyncio.run(_balance())
+        run_async(_balance())
     except Exception as e:
         handle_wallet_error(e)
         raise typer.Exit(1)
@@ -1308,7 +1328,7 @@ def send(
                 )
 
     try:
-        asyncio.run(_send())
+        run_async(_send())
     except Exception as e:
         handle_wallet_error(e)
         raise typer.Exit(1)
@@ -1382,7 +1402,7 @@ def redeem(
                 )
 
     try:
-        asyncio.run(_redeem())
+        run_async(_redeem())
     except Exception as e:
         handle_wallet_error(e)
         raise typer.Exit(1)
@@ -1417,7 +1437,7 @@ def pay(
             console.print(f"Remaining balance: {balance} sats")
 
     try:
-        asyncio.run(_pay())
+        run_async(_pay())
     except Exception as e:
         handle_wallet_error(e)
         raise typer.Exit(1)
@@ -1614,7 +1634,7 @@ def mint(
                 raise
 
     try:
-        asyncio.run(_mint())
+        run_async(_mint())
     except Exception as e:
         handle_wallet_error(e)
         raise typer.Exit(1)
@@ -1692,7 +1712,7 @@ def info(
             console.print(table)
 
     try:
-        asyncio.run(_info())
+        run_async(_info())
     except Exception as e:
         handle_wallet_error(e)
         raise typer.Exit(1)
@@ -1929,7 +1949,7 @@ def relays(
                 console.print(f"[red]❌ Configuration failed: {e}[/red]")
 
     try:
-        asyncio.run(_relays())
+        run_async(_relays())
     except Exception as e:
         handle_wallet_error(e)
         raise typer.Exit(1)
@@ -2069,7 +2089,7 @@ def status(
         except Exception as e:
             handle_wallet_error(e)
 
-    asyncio.run(_status())
+    run_async(_status())
 
 
 @app.command()
@@ -2397,7 +2417,7 @@ def erase(
         except Exception as e:
             handle_wallet_error(e)
 
-        asyncio.run(_erase())
+        run_async(_erase())
 
 
 @app.command()
@@ -2520,7 +2540,7 @@ def cleanup(
                     "undecryptable_events": len(undecryptable_events),
                     "empty_events": len(empty_events),
                     "valid_proofs": len(state.proofs),
-                    "balance_by_unit": state.balance_by_unit,
+                    "balance_by_unit": dict(state.balance_by_unit),
                     "events_consolidated": 0,
                     "events_marked_superseded": 0,
                 }
@@ -2713,7 +2733,7 @@ def cleanup(
             handle_wallet_error(e)
         return None
 
-    asyncio.run(_cleanup())
+    run_async(_cleanup())
 
 
 @app.command()
@@ -2974,7 +2994,7 @@ def backup(
                 console.print("  nuts backup --clean    # Clean up verified backups")
 
     try:
-        asyncio.run(_backup())
+        run_async(_backup())
     except KeyboardInterrupt:
         console.print("\n[yellow]Backup operation cancelled[/yellow]")
         raise typer.Exit()
@@ -3065,7 +3085,7 @@ def history(
         except Exception as e:
             handle_wallet_error(e)
 
-    asyncio.run(_history())
+    run_async(_history())
 
 
 @app.command()
@@ -3458,12 +3478,11 @@ def debug(
             )
 
             for i, proof in enumerate(sample_proofs):
-                proof_id = f"{proof['secret']}:{proof['C']}"
                 mint_url = proof.get("mint", "unknown")
                 currency = proof.get("unit", "sat")
 
                 # Check cache status
-                is_cached, cached_state = wallet_obj._is_proof_state_cached(proof_id)
+                is_cached, cached_state = wallet_obj._is_proof_state_cached(proof)
                 cache_status = f"cached ({cached_state})" if is_cached else "not cached"
 
                 # Format amount display based on currency
@@ -3592,7 +3611,7 @@ def debug(
         except Exception as e:
             console.print(f"  ❌ History analysis error: {e}")
 
-    asyncio.run(_debug())
+    run_async(_debug())
 
 
 def cli() -> None:
@@ -3645,7 +3664,7 @@ def swap(
         return
 
     try:
-        asyncio.run(_swap())
+        run_async(_swap())
     except Exception as e:
         handle_wallet_error(e)
         raise typer.Exit(1)
@@ -0,0 +1,29 @@
+"""JSON encoding shared by relay messages, event content and tokens.
+
+Uses orjson when it is installed (the ``fast`` extra) and the standard
+library otherwise; both produce compact UTF-8 output.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover – allow runtime miss
+    orjson = None  # type: ignore
+
+
+def encode_json(data: Any) -> bytes:
+    """Serialize a JSON document to compact UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def decode_json(data: str | bytes) -> Any:
+    """Parse a JSON document from text or raw UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
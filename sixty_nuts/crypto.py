@@ -11,7 +11,7 @@ import secrets
 import struct
 import time
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Iterable, Tuple
 
 from coincurve import PrivateKey, PublicKey
 from cryptography.hazmat.backends import default_backend
@@ -46,6 +46,30 @@ class BlindingData:
     r: str  # Blinding factor (hex) - KEEP SECRET!
 
 
+# Domain separator as per Cashu NUT-00 specification
+_H2C_DOMAIN_SEPARATOR = b"Secp256k1_HashToCurve_Cashu_"
+
+
+def hash_to_curve_bytes(message: bytes) -> bytes:
+    """Return the compressed encoding of hash_to_curve(message).
+
+    Only the '02' prefix is tried: both parities exist for any valid x, so a
+    candidate rejected with '02' is rejected with '03' too.
+    """
+    sha256 = hashlib.sha256
+    # First hash: SHA256(DOMAIN_SEPARATOR || message)
+    msg_hash = sha256(_H2C_DOMAIN_SEPARATOR + message).digest()
+    for counter in range(2**32):
+        # SHA256(msg_hash || counter) - counter is little-endian
+        candidate = b"\x02" + sha256(msg_hash + counter.to_bytes(4, "little")).digest()
+        try:
+            PublicKey(candidate)
+        except ValueError:
+            continue
+        return candidate
+    raise ValueError("Could not find valid curve point after 2^32 iterations")
+
+
 def hash_to_curve(message: bytes) -> PublicKey:
     """Hash a message to a point on the secp256k1 curve.
 
@@ -59,37 +83,16 @@ def hash_to_curve(message: bytes) -> PublicKey:
     Returns:
         PublicKey point on the secp256k1 curve
     """
-    # Domain separator as per Cashu NUT-00 specification
-    DOMAIN_SEPARATOR = b"Secp256k1_HashToCurve_Cashu_"
-
-    # First hash: SHA256(DOMAIN_SEPARATOR || message)
-    msg_hash = hashlib.sha256(DOMAIN_SEPARATOR + message).digest()
+    return PublicKey(hash_to_curve_bytes(message))
 
-    # Try to find a valid point by incrementing counter
-    counter = 0
-    while counter < 2**32:
-        # SHA256(msg_hash || counter) - counter is little-endian
-        counter_bytes = counter.to_bytes(4, byteorder="little")
-        hash_input = msg_hash + counter_bytes
-        hash_output = hashlib.sha256(hash_input).digest()
 
-        # Try to create a compressed public key with '02' prefix
-        try:
-            pubkey_bytes = b"\x02" + hash_output
-            pubkey = PublicKey(pubkey_bytes)
-            return pubkey
-        except Exception:
-            # If not valid, try with '03' prefix
-            try:
-                pubkey_bytes = b"\x03" + hash_output
-                pubkey = PublicKey(pubkey_bytes)
-                return pubkey
-            except Exception:
-                pass
-
-        counter += 1
+def hash_to_curve_batch(messages: Iterable[bytes]) -> list[bytes]:
+    """Hash many messages to curve points, returned as compressed bytes.
 
-    raise ValueError("Could not find valid curve point after 2^32 iterations")
+    A convenience loop over hash_to_curve_bytes; each message is still hashed
+    on its own.
+    """
+    return [hash_to_curve_bytes(message) for message in messages]
 
 
 def blind_message(secret: bytes, r: bytes | None = None) -> tuple[PublicKey, bytes]:
@@ -135,29 +138,14 @@ def unblind_signature(C_: PublicKey, r: bytes, K: PublicKey) -> PublicKey:
     Returns:
         Unblinded signature C
     """
-    # Create r as private key
-    r_key = PrivateKey(r)
-
     # Calculate r*K
-    rK = K.multiply(r_key.secret)
-
-    # Calculate C = C_ - r*K
-    # To subtract, we need to add the negation of rK
-    # The negation of a point (x, y) is (x, -y)
-    rK_bytes = rK.format(compressed=False)
-    x = rK_bytes[1:33]
-    y = rK_bytes[33:65]
-
-    # Negate y coordinate (p - y where p is the field prime)
-    # For secp256k1: p = 2^256 - 2^32 - 977
-    p = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F
-    y_int = int.from_bytes(y, "big")
-    neg_y_int = (p - y_int) % p
-    neg_y = neg_y_int.to_bytes(32, "big")
-
-    # Reconstruct negated point
-    neg_rK_bytes = b"\x04" + x + neg_y
-    neg_rK = PublicKey(neg_rK_bytes)
+    rK = K.multiply(r)
+
+    # Calculate C = C_ - r*K by adding the negation of rK. Negating (x, y)
+    # gives (x, -y), and -y has the opposite parity, so in compressed form
+    # only the 02/03 prefix flips.
+    rK_bytes = rK.format(compressed=True)
+    neg_rK = PublicKey(bytes((rK_bytes[0] ^ 1,)) + rK_bytes[1:])
 
     # Combine C_ + (-r*K) = C_ - r*K
     C = PublicKey.combine_keys([C_, neg_rK])
@@ -194,7 +182,10 @@ def verify_signature(secret: bytes, C: PublicKey, K: PublicKey) -> bool:
 
 
 def create_blinded_message(
-    amount: int, keyset_id: str, secret: bytes | None = None
+    amount: int,
+    keyset_id: str,
+    secret: bytes | None = None,
+    r: bytes | None = None,
 ) -> tuple[BlindedMessage, BlindingData]:
     """Create a blinded message for the mint with proper separation of concerns.
 
@@ -202,6 +193,7 @@ def create_blinded_message(
         amount: The amount for this blinded message
         keyset_id: The keyset ID to use
         secret: Optional secret (will be generated if not provided)
+        r: Optional blinding factor (will be generated if not provided)
 
     Returns:
         Tuple of (BlindedMessage for network, BlindingData for internal use)
@@ -210,15 +202,15 @@ def create_blinded_message(
         secret = secrets.token_bytes(32)
 
     # Blind the message
-    B_, r = blind_message(secret)
+    B_, r = blind_message(secret, r)
+
+    B_hex = B_.format(compressed=True).hex()
 
     # Create protocol message (without blinding factor)
-    blinded_msg = BlindedMessage(
-        amount=amount, id=keyset_id, B_=B_.format(compressed=True).hex()
-    )
+    blinded_msg = BlindedMessage(amount=amount, id=keyset_id, B_=B_hex)
 
     # Create internal data (with blinding factor)
-    blinding_data = BlindingData(B_=B_.format(compressed=True).hex(), r=r.hex())
+    blinding_data = BlindingData(B_=B_hex, r=r.hex())
 
     return blinded_msg, blinding_data
 
@@ -540,10 +532,7 @@ def create_blinded_messages_for_amount(
     Returns:
         Tuple of (blinded_messages, secrets, blinding_factors)
     """
-    outputs: list[BlindedMessage] = []
-    secrets_list: list[str] = []
-    blinding_factors: list[str] = []
-
+    amounts: list[int] = []
     remaining = amount
 
     for denom in [
@@ -564,15 +553,10 @@ def create_blinded_messages_for_amount(
         1,
     ]:
         while remaining >= denom:
-            secret, r_hex, blinded_msg = create_blinded_message_with_secret(
-                denom, keyset_id
-            )
-            outputs.append(blinded_msg)
-            secrets_list.append(secret)
-            blinding_factors.append(r_hex)
+            amounts.append(denom)
             remaining -= denom
 
-    return outputs, secrets_list, blinding_factors
+    return create_blinded_messages_with_secrets(amounts, keyset_id)
 
 
 def create_blinded_message_with_secret(
@@ -604,6 +588,43 @@ def create_blinded_message_with_secret(
     return secret_hex, blinding_factor_hex, blinded_msg
 
 
+def create_blinded_messages_with_secrets(
+    amounts: list[int], keyset_id: str
+) -> tuple[list[BlindedMessage], list[str], list[str]]:
+    """Create one blinded message per amount, drawing all randomness at once.
+
+    Equivalent to calling create_blinded_message_with_secret for each amount,
+    but takes every secret and blinding factor from a single CSPRNG read.
+
+    Returns:
+        Tuple of (blinded_messages, secrets, blinding_factors)
+    """
+    outputs: list[BlindedMessage] = []
+    secrets_list: list[str] = []
+    blinding_factors: list[str] = []
+
+    # 32 bytes of secret followed by 32 bytes of blinding factor per output
+    randomness = secrets.token_bytes(64 * len(amounts))
+    from_secret = PublicKey.from_secret
+    combine_keys = PublicKey.combine_keys
+    for i, amount in enumerate(amounts):
+        offset = 64 * i
+        secret_hex = randomness[offset : offset + 32].hex()
+        r = randomness[offset + 32 : offset + 64]
+        # B_ = Y + rG, inlined from blind_message
+        Y = PublicKey(hash_to_curve_bytes(secret_hex.encode("utf-8")))
+        B_ = combine_keys([Y, from_secret(r)])
+        outputs.append(
+            BlindedMessage(
+                amount=amount, id=keyset_id, B_=B_.format(compressed=True).hex()
+            )
+        )
+        secrets_list.append(secret_hex)
+        blinding_factors.append(r.hex())
+
+    return outputs, secrets_list, blinding_factors
+
+
 def get_mint_pubkey_for_amount(
     keys_data: dict[str, str], amount: int
 ) -> PublicKey | None:
@@ -3,15 +3,20 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from typing import Literal, cast
 import base64
 
 from coincurve import PrivateKey
 
 from .types import Proof, WalletError
-from .relay import NostrEvent, RelayClient, EventKind, create_event
-from .crypto import get_pubkey, nip44_encrypt, nip44_decrypt
+from .relay import (
+    NostrEvent,
+    RelayClient,
+    EventKind,
+    create_event,
+)
+from .codec import decode_json, encode_json
+from .crypto import compute_event_id, get_pubkey, nip44_encrypt, nip44_decrypt
 
 
 class EventManager:
@@ -152,7 +157,7 @@ class EventManager:
             content_data.append(["mint", mint_url])
 
         # Encrypt content
-        content_json = json.dumps(content_data)
+        content_json = encode_json(content_data).decode()
         encrypted_content = nip44_encrypt(content_json, self._privkey)
 
         # NIP-60 requires at least one mint tag in the tags array (unencrypted)
@@ -268,7 +273,7 @@ class EventManager:
         for event in history_events:
             try:
                 decrypted = nip44_decrypt(event["content"], self._privkey)
-                history_data = json.loads(decrypted)
+                history_data = decode_json(decrypted)
 
                 # Convert list format to dict
                 history_entry = {
@@ -332,6 +337,36 @@ class EventManager:
         redeemed_event_id: str | None = None,
     ) -> str:
         """Publish kind 7376 spending history event and return its id."""
+        event = self._build_spending_history_event(
+            direction=direction,
+            amount=amount,
+            unit=unit,
+            created_token_ids=created_token_ids,
+            destroyed_token_ids=destroyed_token_ids,
+            redeemed_event_id=redeemed_event_id,
+        )
+        return await self.relay_manager.publish_to_relays(event)
+
+    async def publish_spending_histories(self, entries: list[dict]) -> list[str]:
+        """Publish several kind 7376 history events in one batch.
+
+        Each entry holds the keyword arguments of publish_spending_history.
+        Returns the event ids in entry order.
+        """
+        events = [self._build_spending_history_event(**entry) for entry in entries]
+        return await self.relay_manager.publish_batch_to_relays(events)
+
+    def _build_spending_history_event(
+        self,
+        *,
+        direction: Literal["in", "out"],
+        amount: int,
+        unit: str = "sat",
+        created_token_ids: list[str] | None = None,
+        destroyed_token_ids: list[str] | None = None,
+        redeemed_event_id: str | None = None,
+    ) -> dict:
+        """Build an unsigned kind 7376 spending history event."""
         # Build encrypted content
         content_data = [
             ["direction", direction],
@@ -350,7 +385,7 @@ class EventManager:
                 content_data.append(["e", token_id, "", "destroyed"])
 
         # Encrypt content
-        content_json = json.dumps(content_data)
+        content_json = encode_json(content_data).decode()
         encrypted_content = nip44_encrypt(content_json, self._privkey)
 
         # Build tags (redeemed tags stay unencrypted)
@@ -359,14 +394,12 @@ class EventManager:
             tags.append(["e", redeemed_event_id, "", "redeemed"])
 
         # Create history event
-        event = create_event(
+        return create_event(
             kind=EventKind.History,
             content=encrypted_content,
             tags=tags,
         )
 
-        return await self.relay_manager.publish_to_relays(event)
-
     async def clear_spending_history(self) -> int:
         """Delete all spending history events for this wallet.
 
@@ -447,7 +480,7 @@ class EventManager:
             if deleted_token_ids and not event_ids:
                 content_data["del"] = deleted_token_ids
 
-            content_json = json.dumps(content_data)
+            content_json = encode_json(content_data).decode()
             encrypted_content = nip44_encrypt(content_json, self._privkey)
 
             test_event = create_event(
@@ -471,7 +504,7 @@ class EventManager:
                 if deleted_token_ids and not event_ids:
                     final_content_data["del"] = deleted_token_ids
 
-                final_content_json = json.dumps(final_content_data)
+                final_content_json = encode_json(final_content_data).decode()
                 final_encrypted_content = nip44_encrypt(
                     final_content_json, self._privkey
                 )
@@ -503,7 +536,7 @@ class EventManager:
             if deleted_token_ids and not event_ids:
                 final_content_data["del"] = deleted_token_ids
 
-            final_content_json = json.dumps(final_content_data)
+            final_content_json = encode_json(final_content_data).decode()
             final_encrypted_content = nip44_encrypt(final_content_json, self._privkey)
 
             final_event = create_event(
@@ -532,6 +565,73 @@ class EventManager:
         SAFETY: This method now publishes new events BEFORE deleting old ones
         to prevent proof loss if relay publishing fails.
         """
+        test_event, content_data = self._build_token_event(
+            proofs, deleted_token_ids=deleted_token_ids
+        )
+
+        # If event is too large, split it
+        if self.relay_manager.estimate_event_size(test_event) > 60000:
+            event_ids = await self._split_large_token_events(
+                cast(list[Proof], content_data["proofs"]),
+                cast(str, content_data["mint"]),
+                deleted_token_ids,
+            )
+            return event_ids[0] if event_ids else ""
+
+        # Event is small enough, publish as single event
+        return await self.relay_manager.publish_to_relays(
+            test_event,
+            token_data=cast(dict[str, object], content_data),
+            priority=10,  # High priority for token events
+        )
+
+    async def publish_token_event_with_history(
+        self,
+        proofs: list[Proof],
+        *,
+        direction: Literal["in", "out"],
+        amount: int,
+        unit: str = "sat",
+    ) -> str:
+        """Publish a token event and the history entry that created it together.
+
+        The token event id is computed before signing so the history event can
+        reference it, letting both go out in a single relay round-trip.
+        Returns the token event id.
+        """
+        token_event, content_data = self._build_token_event(proofs)
+        if self.relay_manager.estimate_event_size(token_event) > 60000:
+            # Split token events are published one by one anyway
+            token_event_id = await self.publish_token_event(proofs)
+            await self.publish_spending_history(
+                direction=direction,
+                amount=amount,
+                unit=unit,
+                created_token_ids=[token_event_id],
+            )
+            return token_event_id
+
+        token_event["pubkey"] = get_pubkey(self._privkey)
+        token_event_id = compute_event_id(token_event)
+        history_event = self._build_spending_history_event(
+            direction=direction,
+            amount=amount,
+            unit=unit,
+            created_token_ids=[token_event_id],
+        )
+        event_ids = await self.relay_manager.publish_batch_to_relays(
+            [token_event, history_event],
+            token_data=[cast(dict[str, object], content_data), None],
+        )
+        return event_ids[0]
+
+    def _build_token_event(
+        self,
+        proofs: list[Proof],
+        *,
+        deleted_token_ids: list[str] | None = None,
+    ) -> tuple[dict, dict]:
+        """Build an unsigned kind 7375 token event and its plaintext content."""
         # Convert proofs to NIP-60 format (base64 secrets)
         nip60_proofs = [self._convert_proof_to_nip60(p) for p in proofs]
 
@@ -555,7 +655,7 @@ class EventManager:
         if deleted_token_ids:
             content_data["del"] = deleted_token_ids
 
-        content_json = json.dumps(content_data)
+        content_json = encode_json(content_data).decode()
         encrypted_content = nip44_encrypt(content_json, self._privkey)
 
         test_event = create_event(
@@ -563,20 +663,7 @@ class EventManager:
             content=encrypted_content,
             tags=[],
         )
-
-        # If event is too large, split it
-        if self.relay_manager.estimate_event_size(test_event) > 60000:
-            event_ids = await self._split_large_token_events(
-                nip60_proofs, mint_url, deleted_token_ids
-            )
-            return event_ids[0] if event_ids else ""
-
-        # Event is small enough, publish as single event
-        return await self.relay_manager.publish_to_relays(
-            test_event,
-            token_data=cast(dict[str, object], content_data),
-            priority=10,  # High priority for token events
-        )
+        return test_event, content_data
 
     async def delete_token_event(self, event_id: str) -> None:
         """Delete a token event via NIP-09 (kind 5)."""
@@ -593,6 +680,10 @@ class EventManager:
         # Publish unsigned event (signing handled by relay manager)
         await self.relay_manager.publish_to_relays(event)
 
+    async def delete_token_events(self, event_ids: list[str]) -> int:
+        """Delete several token events with as few NIP-09 events as possible."""
+        return await self._batch_delete_events(event_ids, EventKind.Token)
+
     async def clear_all_token_events(self) -> int:
         """Delete all token events for this wallet.
 
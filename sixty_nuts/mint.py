@@ -3,11 +3,22 @@ Cashu Mint API client wrapper."""
 
 from __future__ import annotations
 
+import asyncio
+import json
+from collections import Counter
 import os
 import time
-from typing import TypedDict, cast, Any
+from functools import lru_cache
+from typing import Callable, TypedDict, cast, Any
+from uuid import uuid4
 
 import httpx
+import websockets
+
+try:
+    import h2  # type: ignore  # noqa: F401 – lets httpx speak HTTP/2
+except ModuleNotFoundError:  # pragma: no cover – allow runtime miss
+    h2 = None
 
 from .types import (
     BlindedMessage,
@@ -19,6 +30,37 @@ from .types import (
 from .lnurl import parse_lightning_invoice_amount
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Denomination helpers
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+@lru_cache(maxsize=64)
+def _power_of_two_ladder_top(denominations: tuple[int, ...]) -> int:
+    """Return the largest denomination if they are exactly 1, 2, 4, ... 2^n, else 0."""
+    ordered = sorted(denominations)
+    if ordered != [1 << i for i in range(len(ordered))]:
+        return 0
+    return ordered[-1]
+
+
+def _binary_split(amount: int, top: int) -> dict[int, int]:
+    """Greedy split over the denominations 1, 2, 4, ... ``top`` (a power of two).
+
+    Equivalent to the generic greedy loop, but visits only the set bits of
+    the amount instead of every denomination.
+    """
+    denominations: dict[int, int] = {}
+    if amount >= top:
+        denominations[top] = amount // top
+        amount %= top
+    while amount > 0:
+        denom = 1 << (amount.bit_length() - 1)
+        denominations[denom] = 1
+        amount -= denom
+    return denominations
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Mint API client
 # ──────────────────────────────────────────────────────────────────────────────
@@ -28,20 +70,55 @@ class InvalidKeysetError(MintError):
     """Raised when keyset structure is invalid per NUT-01."""
 
 
+# NUT-00 error codes for an unknown or inactive keyset (i.e. keys rotated)
+_KEYSET_ERROR_CODES = frozenset({12001, 12002})
+
+
+def _is_keyset_error(response: httpx.Response) -> bool:
+    try:
+        detail = response.json()
+    except ValueError:
+        return False
+    return isinstance(detail, dict) and detail.get("code") in _KEYSET_ERROR_CODES
+
+
+def create_mint_client() -> httpx.AsyncClient:
+    """Create an HTTP client suited to sharing across mints.
+
+    Keeps connections alive between the many small mint requests and uses
+    HTTP/2 (one multiplexed connection per mint) when ``h2`` is installed.
+    """
+    return httpx.AsyncClient(
+        http2=h2 is not None,
+        limits=httpx.Limits(
+            max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0
+        ),
+        timeout=httpx.Timeout(10.0, connect=5.0),
+    )
+
+
 class Mint:
-    def __init__(self, url: str) -> None:
+    def __init__(self, url: str, client: httpx.AsyncClient | None = None) -> None:
         # Normalize URL by removing trailing slashes
         self.url = url.rstrip("/")
-        self.client = httpx.AsyncClient()
+        # A client passed in is shared (e.g. by a Wallet) and closed by its owner
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient()
         self._active_keysets: list[Keyset] = []
         self._currencies: list[CurrencyUnit] = []
+        self._keysets_info: list[KeysetInfo] = []
+        # Keysets rotate rarely; refetch after the TTL or on a keyset error
+        self._keysets_fetched_at = 0.0
+        self._keysets_info_fetched_at = 0.0
+        self._keyset_cache_ttl = 3600  # 1 hour cache TTL
+        self._keyset_lock = asyncio.Lock()
         # Exchange rate cache: {cache_key: (rate, timestamp)}
         self._exchange_rate_cache: dict[str, tuple[float, float]] = {}
         self._exchange_rate_cache_ttl = 300  # 5 minutes cache TTL
 
     async def aclose(self) -> None:
         """Close the HTTP client if we created it."""
-        if self.client:
+        if self.client and self._owns_client:
             await self.client.aclose()
 
     async def _request(
@@ -63,6 +140,8 @@ class Mint:
         )
 
         if response.status_code >= 400:
+            if _is_keyset_error(response):
+                self.invalidate_keyset_cache()
             raise MintError(f"Mint returned {response.status_code}: {response.text}")
 
         return response.json()
@@ -208,6 +287,11 @@ class Mint:
         if not available_denominations:
             return Mint._default_split(amount)
 
+        # Standard keysets are 1, 2, 4, ... 2^n: greedy is then just the bits
+        top = _power_of_two_ladder_top(tuple(available_denominations))
+        if top:
+            return _binary_split(amount, top)
+
         denominations: dict[int, int] = {}
         remaining = amount
 
@@ -229,32 +313,7 @@ class Mint:
     @staticmethod
     def _default_split(amount: int) -> dict[int, int]:
         """Default split using powers of 2."""
-        denominations: dict[int, int] = {}
-        remaining = amount
-
-        for denom in [
-            16384,
-            8192,
-            4096,
-            2048,
-            1024,
-            512,
-            256,
-            128,
-            64,
-            32,
-            16,
-            8,
-            4,
-            2,
-            1,
-        ]:
-            if remaining >= denom:
-                count = remaining // denom
-                denominations[denom] = count
-                remaining -= denom * count
-
-        return denominations
+        return _binary_split(amount, 16384)
 
     async def validate_denominations_for_currency(
         self, unit: CurrencyUnit, requested_denominations: dict[int, int]
@@ -287,16 +346,10 @@ class Mint:
         Returns:
             Merged denomination dict
         """
-        merged: dict[int, int] = {}
-
+        merged: Counter[int] = Counter()
         for denoms in denominations_list:
-            for denom, count in denoms.items():
-                if denom in merged:
-                    merged[denom] += count
-                else:
-                    merged[denom] = count
-
-        return merged
+            merged.update(denoms)
+        return dict(merged)
 
     # ───────────────────────── Info & Keys ─────────────────────────────────
 
@@ -315,12 +368,17 @@ class Mint:
         Returns:
             NUT-01 compliant KeysResponse with validated structure
         """
-        if self._active_keysets:
+        if self._keyset_cache_fresh(self._keysets_fetched_at):
             return self._active_keysets
-        response = await self._request("GET", "/v1/keys")
-        keysets = self._validate_keys_response(response)["keysets"]
-        self._active_keysets = [Keyset(**keyset) for keyset in keysets]
-        self._currencies = [keyset["unit"] for keyset in self._active_keysets]
+        async with self._keyset_lock:
+            # Another caller may have refreshed while we waited
+            if self._keyset_cache_fresh(self._keysets_fetched_at):
+                return self._active_keysets
+            response = await self._request("GET", "/v1/keys")
+            keysets = self._validate_keys_response(response)["keysets"]
+            self._active_keysets = [Keyset(**keyset) for keyset in keysets]
+            self._currencies = [keyset["unit"] for keyset in self._active_keysets]
+            self._keysets_fetched_at = time.time()
         return self._active_keysets
 
     async def get_keyset(self, id: str) -> Keyset:
@@ -331,13 +389,28 @@ class Mint:
 
     async def get_keysets_info(self) -> list[KeysetInfo]:
         """Get all active keyset IDs."""
-        response = await self._request("GET", "/v1/keysets")
-        return cast(list[KeysetInfo], response["keysets"])
+        if self._keyset_cache_fresh(self._keysets_info_fetched_at):
+            return self._keysets_info
+        async with self._keyset_lock:
+            if self._keyset_cache_fresh(self._keysets_info_fetched_at):
+                return self._keysets_info
+            response = await self._request("GET", "/v1/keysets")
+            self._keysets_info = cast(list[KeysetInfo], response["keysets"])
+            self._keysets_info_fetched_at = time.time()
+        return self._keysets_info
 
     async def get_currencies(self) -> list[CurrencyUnit]:
-        return self._currencies or [
-            keyset["unit"] for keyset in (await self.get_active_keysets())
-        ]
+        if self._keyset_cache_fresh(self._keysets_fetched_at):
+            return self._currencies
+        return [keyset["unit"] for keyset in (await self.get_active_keysets())]
+
+    def _keyset_cache_fresh(self, fetched_at: float) -> bool:
+        return fetched_at > 0 and time.time() - fetched_at < self._keyset_cache_ttl
+
+    def invalidate_keyset_cache(self) -> None:
+        """Drop cached keysets so the next call refetches them from the mint."""
+        self._keysets_fetched_at = 0.0
+        self._keysets_info_fetched_at = 0.0
 
     async def mint_exchange_rate(self, unit: CurrencyUnit) -> float:
         """Get exchange rate for converting a currency unit to satoshis.
@@ -561,6 +634,54 @@ class Mint:
             PostRestoreResponse, await self._request("POST", "/v1/restore", json=body)
         )
 
+    # ───────────────────────── Subscriptions (NUT-17) ─────────────────────────────────
+
+    async def watch_mint_quote(
+        self, quote_id: str, on_update: Callable[[], None]
+    ) -> None:
+        """Call ``on_update`` each time the mint pushes a state change for a quote.
+
+        Uses the NUT-17 WebSocket subscription. Returns straight away if the
+        mint doesn't advertise it, and when the connection drops or fails, so
+        callers should keep polling as a fallback while this task is running.
+        """
+        try:
+            info = await self.get_info()
+            commands = {
+                command
+                for method in info.get("nuts", {}).get("17", {}).get("supported", [])
+                for command in method.get("commands", [])
+            }
+            if "bolt11_mint_quote" not in commands:
+                return
+
+            sub_id = str(uuid4())
+            ws_url = "ws" + self.url.removeprefix("http") + "/v1/ws"
+            async with websockets.connect(ws_url) as ws:
+                await ws.send(
+                    json.dumps(
+                        {
+                            "jsonrpc": "2.0",
+                            "id": 0,
+                            "method": "subscribe",
+                            "params": {
+                                "kind": "bolt11_mint_quote",
+                                "subId": sub_id,
+                                "filters": [quote_id],
+                            },
+                        }
+                    )
+                )
+                async for raw in ws:
+                    msg = json.loads(raw)
+                    if "error" in msg:
+                        raise MintError(f"Subscription rejected: {msg['error']}")
+                    if msg.get("params", {}).get("subId") == sub_id:
+                        on_update()
+        except Exception as e:
+            if os.environ.get("MINT_DEBUG", "false").lower() == "true":
+                print(f"MINT_DEBUG quote subscription on {self.url} ended: {e}")
+
     # ───────────────────────── Quote Status & Minting ─────────────────────────────────
 
     async def check_quote_status_and_mint(
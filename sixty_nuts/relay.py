@@ -4,18 +4,23 @@ from __future__ import annotations
 
 import json
 import os
-from typing import TypedDict, Callable, Any
+import random
+import weakref
+from typing import TypedDict, Callable, Any, ClassVar
 from enum import IntEnum
 from uuid import uuid4
 import time
 from dataclasses import dataclass, field
 from collections import deque
 import asyncio
+import bisect
 from contextlib import asynccontextmanager
 
 import websockets
 from coincurve import PrivateKey
 
+from .codec import decode_json, encode_json
+
 # Environment variable for relays
 RELAYS_ENV_VAR = "RELAYS"
 
@@ -631,6 +636,45 @@ class RelayError(Exception):
     """Raised when relay returns an error."""
 
 
+_EVENT_FIELDS = frozenset(
+    ("id", "pubkey", "created_at", "kind", "tags", "content", "sig")
+)
+
+
+def _encode_event(event: NostrEvent) -> bytes:
+    """Serialize an ``["EVENT", event]`` message using the fixed NIP-01 layout.
+
+    id, pubkey and sig are hex and need no escaping, so only tags and content
+    go through the JSON encoder. Events that do not match the expected shape
+    fall back to the generic encoder.
+    """
+    if event.keys() != _EVENT_FIELDS:
+        return encode_json(["EVENT", event])
+    event_id, pubkey, sig = event["id"], event["pubkey"], event["sig"]
+    created_at, kind = event["created_at"], event["kind"]
+    if not (
+        type(event_id) is str
+        and type(pubkey) is str
+        and type(sig) is str
+        and event_id.isalnum()
+        and pubkey.isalnum()
+        and sig.isalnum()
+        and type(created_at) is int
+        and type(kind) is int
+    ):
+        return encode_json(["EVENT", event])
+    return b"".join(
+        (
+            f'["EVENT",{{"id":"{event_id}","pubkey":"{pubkey}",'
+            f'"created_at":{created_at},"kind":{kind},"tags":'.encode(),
+            encode_json(event["tags"]),
+            b',"content":',
+            encode_json(event["content"]),
+            f',"sig":"{sig}"}}]'.encode(),
+        )
+    )
+
+
 @dataclass
 class QueuedEvent:
     """Event queued for publishing with metadata."""
@@ -641,25 +685,39 @@ class QueuedEvent:
     max_retries: int = 3
     created_at: float = field(default_factory=time.time)
     callback: Callable[[bool, str | None], None] | None = None  # Success callback
+    frame: bytes | None = field(default=None, repr=False)  # Serialized EVENT message
 
     def __lt__(self, other: "QueuedEvent") -> bool:
         """For priority queue comparison."""
         return self.priority > other.priority  # Higher priority first
 
+    def encode(self) -> bytes:
+        """Get the serialized EVENT message, reusing it across retries."""
+        if self.frame is None:
+            self.frame = _encode_event(self.event)
+        return self.frame
+
 
 class EventQueue:
-    """Thread-safe event queue with retry logic."""
+    """Event queue with retry logic.
+
+    Meant for use from a single event loop. None of the methods await while
+    touching the queue, so each one runs atomically without a lock.
+    """
 
     def __init__(self, max_queue_size: int = 1000) -> None:
-        self._queue: deque[QueuedEvent] = deque(maxlen=max_queue_size)
+        self.max_queue_size = max_queue_size
+        # FIFO bucket per priority level; only a handful of levels are ever used
+        self._buckets: dict[int, deque[QueuedEvent]] = {}
+        self._priorities: list[int] = []  # Levels with a non-empty bucket, ascending
+        self._size = 0
         self._processing = False
-        self._lock = asyncio.Lock()
-        self._event = asyncio.Event()
+        self._waiter: asyncio.Future[None] | None = None  # Set by wait_for_events()
 
-        # Cache for pending events by ID
+        # Cache for pending events by ID (insertion-ordered, capped at max_queue_size)
         self._pending_by_id: dict[str, QueuedEvent] = {}
 
-        # Cache for pending token events (for balance calculation)
+        # Cache for pending token events (for balance calculation, same cap)
         self._pending_token_events: dict[str, dict[str, Any]] = {}
 
     async def add(
@@ -671,60 +729,97 @@ class EventQueue:
         token_data: dict[str, Any] | None = None,
     ) -> None:
         """Add event to queue."""
-        async with self._lock:
-            queued = QueuedEvent(event=event, priority=priority, callback=callback)
-
-            # Add to queue
-            self._queue.append(queued)
+        queued = QueuedEvent(event=event, priority=priority, callback=callback)
 
-            # Track by ID
-            self._pending_by_id[event["id"]] = queued
+        # Add to queue
+        self._push(queued)
 
-            # If this is a token event, cache the data
-            if token_data and event["kind"] == 7375:
-                self._pending_token_events[event["id"]] = token_data
+        # Track by ID
+        self._track(self._pending_by_id, event["id"], queued)
 
-            # Sort by priority
-            self._queue = deque(sorted(self._queue), maxlen=self._queue.maxlen)
+        # If this is a token event, cache the data
+        if token_data and event["kind"] == 7375:
+            self._track(self._pending_token_events, event["id"], token_data)
 
-            # Signal that new events are available
-            self._event.set()
+        # Signal that new events are available
+        self.wake()
 
     async def get_batch(self, max_size: int = 10) -> list[QueuedEvent]:
         """Get a batch of events to process."""
-        async with self._lock:
-            batch = []
-            for _ in range(min(max_size, len(self._queue))):
-                if self._queue:
-                    batch.append(self._queue.popleft())
-            return batch
+        return [self._pop() for _ in range(min(max_size, self._size))]
 
     async def requeue(self, event: QueuedEvent) -> bool:
         """Requeue a failed event if retries remain."""
         event.retry_count += 1
         if event.retry_count < event.max_retries:
-            async with self._lock:
-                # Add back with lower priority after retry
-                event.priority -= 1
-                self._queue.append(event)
-                self._queue = deque(sorted(self._queue), maxlen=self._queue.maxlen)
-                self._event.set()
+            # Add back with lower priority after retry
+            event.priority -= 1
+            self._push(event)
+            self.wake()
             return True
         else:
             # Max retries exceeded
             await self.remove(event.event["id"])
             return False
 
+    def _push(self, queued: QueuedEvent) -> None:
+        """Append to the bucket for the event's priority, evicting if full."""
+        if self._size >= self.max_queue_size:
+            # Drop the event that would be sent last
+            dropped = self._take(self._priorities[0])
+            print(f"Event queue full, dropping event {dropped.event['id'][:16]}...")
+            self._forget(dropped.event["id"])
+        bucket = self._buckets.get(queued.priority)
+        if bucket is None:
+            bucket = self._buckets[queued.priority] = deque()
+            bisect.insort(self._priorities, queued.priority)
+        bucket.append(queued)
+        self._size += 1
+
+    def _pop(self) -> QueuedEvent:
+        """Take the oldest event from the highest priority bucket."""
+        return self._take(self._priorities[-1])
+
+    def _take(self, priority: int) -> QueuedEvent:
+        bucket = self._buckets[priority]
+        queued = bucket.popleft()
+        self._size -= 1
+        if not bucket:
+            del self._buckets[priority]
+            self._priorities.remove(priority)
+        return queued
+
+    def _track(self, cache: dict[str, Any], event_id: str, value: Any) -> None:
+        """Record a pending entry, evicting the oldest once the cap is reached."""
+        cache.pop(event_id, None)
+        cache[event_id] = value
+        while len(cache) > self.max_queue_size:
+            stale_id = next(iter(cache))
+            del cache[stale_id]
+            print(f"Pending event cache full, forgetting event {stale_id[:16]}...")
+
+    def _forget(self, event_id: str) -> None:
+        self._pending_by_id.pop(event_id, None)
+        self._pending_token_events.pop(event_id, None)
+
     async def remove(self, event_id: str) -> None:
         """Remove event from pending caches."""
-        async with self._lock:
-            self._pending_by_id.pop(event_id, None)
-            self._pending_token_events.pop(event_id, None)
+        self._forget(event_id)
 
     async def wait_for_events(self) -> None:
-        """Wait for new events in the queue."""
-        await self._event.wait()
-        self._event.clear()
+        """Wait until the queue holds events (returns at once if it does)."""
+        if self._size:
+            return
+        self._waiter = asyncio.get_running_loop().create_future()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
+
+    def wake(self) -> None:
+        """Wake up a pending wait_for_events() call."""
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
 
     def get_pending_token_data(self) -> list[dict[str, Any]]:
         """Get all pending token event data for balance calculation."""
@@ -733,7 +828,7 @@ class EventQueue:
     @property
     def size(self) -> int:
         """Current queue size."""
-        return len(self._queue)
+        return self._size
 
 
 class Relay:
@@ -749,24 +844,55 @@ class Relay:
         self.ws: Any = None
         self.subscriptions: dict[str, Callable[[NostrEvent], None]] = {}
         self._recv_lock = asyncio.Lock()  # Prevent concurrent recv() calls
+        self._connect_task: asyncio.Task[None] | None = None  # In-flight connect
+        # Reconnect backoff: consecutive failures and loop time of next attempt
+        self._connect_failures = 0
+        self._retry_at = 0.0
 
     async def connect(self) -> None:
-        """Connect to the relay."""
-        import asyncio
+        """Connect to the relay.
 
-        if self.ws is None or self.ws.close_code is not None:
-            try:
-                # Add connection timeout
-                async with asyncio.timeout(5.0):
-                    self.ws = await websockets.connect(
-                        self.url, ping_interval=20, ping_timeout=10, close_timeout=10
-                    )
-            except asyncio.TimeoutError:
-                print(f"Timeout connecting to relay: {self.url}")
-                raise RelayError(f"Connection timeout: {self.url}")
-            except Exception as e:
-                print(f"Failed to connect to relay {self.url}: {e}")
-                raise RelayError(f"Connection failed: {e}")
+        Concurrent callers share a single in-flight connection attempt.
+        """
+        if self.ws is not None and self.ws.close_code is None:
+            return
+
+        task = self._connect_task
+        if task is None or task.done():
+            # Fail fast while backing off instead of hammering a down relay
+            if asyncio.get_running_loop().time() < self._retry_at:
+                raise RelayError(f"Backing off reconnect to {self.url}")
+            task = self._connect_task = asyncio.create_task(self._open())
+        try:
+            # Shielded so one cancelled caller doesn't abort the others' attempt
+            await asyncio.shield(task)
+        finally:
+            if task.done() and self._connect_task is task:
+                self._connect_task = None
+
+    async def _open(self) -> None:
+        """Open the websocket connection."""
+        try:
+            # Add connection timeout
+            async with asyncio.timeout(5.0):
+                self.ws = await websockets.connect(
+                    self.url, ping_interval=20, ping_timeout=10, close_timeout=10
+                )
+        except asyncio.TimeoutError:
+            print(f"Timeout connecting to relay: {self.url}")
+            self._schedule_retry()
+            raise RelayError(f"Connection timeout: {self.url}")
+        except Exception as e:
+            print(f"Failed to connect to relay {self.url}: {e}")
+            self._schedule_retry()
+            raise RelayError(f"Connection failed: {e}")
+        self._connect_failures = 0
+
+    def _schedule_retry(self, base: float = 1.0, cap: float = 60.0) -> None:
+        """Push the next connect attempt out with jittered exponential backoff."""
+        delay = min(cap, base * 2**self._connect_failures + random.random() * base)
+        self._connect_failures += 1
+        self._retry_at = asyncio.get_running_loop().time() + delay
 
     async def disconnect(self) -> None:
         """Disconnect from the relay."""
@@ -775,17 +901,34 @@ class Relay:
 
     async def _send(self, message: list[Any]) -> None:
         """Send a message to the relay."""
+        await self._send_raw(encode_json(message))
+
+    async def _send_raw(self, frame: bytes) -> None:
+        """Send an already serialized message to the relay."""
         if not self.ws or self.ws.close_code is not None:
             raise RelayError("Not connected to relay")
-        await self.ws.send(json.dumps(message))
+        # NIP-01 requires text frames; text=True sends the bytes as-is
+        await self.ws.send(frame, text=True)
+
+    async def _send_many(self, frames: list[bytes]) -> None:
+        """Send several serialized messages back-to-back without waiting for replies."""
+        for frame in frames:
+            await self._send_raw(frame)
 
     async def _recv(self) -> list[Any]:
         """Receive a message from the relay with concurrency protection."""
+        return decode_json(await self._recv_frame())
+
+    async def _recv_frame(self) -> str | bytes:
+        """Receive a raw, still serialized message from the relay."""
         async with self._recv_lock:
             if not self.ws or self.ws.close_code is not None:
                 raise RelayError("Not connected to relay")
-            data = await self.ws.recv()
-            return json.loads(data)
+            # Take the raw payload; the JSON parser validates UTF-8 itself.
+            # websockets assembles each message into its own bytes object and
+            # has no receive-into-buffer API, so this is already the only copy:
+            # staging it in a reusable bytearray would add a memcpy, not save one.
+            return await self.ws.recv(decode=False)
 
     # ───────────────────────── Publishing Events ─────────────────────────────────
 
@@ -794,19 +937,21 @@ class Relay:
 
         Returns True if accepted, False if rejected.
         """
-        import asyncio
+        return await self._publish_frame(event["id"], _encode_event(event))
 
+    async def _publish_frame(self, event_id: str, frame: bytes) -> bool:
+        """Send a pre-serialized EVENT frame and wait for its OK response."""
         try:
             await self.connect()
 
             # Send EVENT command
-            await self._send(["EVENT", event])
+            await self._send_raw(frame)
 
             # Wait for OK response with timeout
             async with asyncio.timeout(10.0):  # 10 second timeout
                 while True:
                     msg = await self._recv()
-                    if msg[0] == "OK" and msg[1] == event["id"]:
+                    if msg[0] == "OK" and msg[1] == event_id:
                         if not msg[2]:  # Event was rejected
                             if len(msg) > 3:
                                 print(f"Relay rejected event: {msg[3]}")
@@ -821,6 +966,58 @@ class Relay:
             print(f"Error publishing to {self.url}: {e}")
             return False
 
+    async def publish_events(
+        self, events: list[NostrEvent], *, timeout: float = 10.0
+    ) -> dict[str, bool]:
+        """Publish several events, pipelining the OK round-trips.
+
+        All EVENT frames are written first, then OK responses are collected
+        until every event is acknowledged or the timeout expires.
+
+        Returns:
+            Mapping of event id -> True if accepted. Events that were rejected
+            or not acknowledged in time map to False.
+        """
+        return await self._publish_frames(
+            [event["id"] for event in events],
+            [_encode_event(event) for event in events],
+            timeout=timeout,
+        )
+
+    async def _publish_frames(
+        self, event_ids: list[str], frames: list[bytes], *, timeout: float = 10.0
+    ) -> dict[str, bool]:
+        """Send pre-serialized EVENT frames and collect their OK responses."""
+        results = {event_id: False for event_id in event_ids}
+        if not frames:
+            return results
+
+        pending = set(results)
+        try:
+            await self.connect()
+
+            # Send all EVENT commands before waiting for any OK
+            await self._send_many(frames)
+
+            async with asyncio.timeout(timeout):
+                while pending:
+                    msg = await self._recv()
+                    kind = msg[0]
+                    if kind == "OK" and msg[1] in pending:
+                        pending.discard(msg[1])
+                        results[msg[1]] = bool(msg[2])
+                        if not msg[2] and len(msg) > 3:
+                            print(f"Relay rejected event: {msg[3]}")
+                    elif kind == "NOTICE":
+                        print(f"Relay notice: {msg[1]}")
+
+        except asyncio.TimeoutError:
+            print(f"Timeout waiting for OK responses from {self.url}")
+        except Exception as e:
+            print(f"Error publishing to {self.url}: {e}")
+
+        return results
+
     # ───────────────────────── Fetching Events ─────────────────────────────────
 
     async def fetch_events(
@@ -843,6 +1040,7 @@ class Relay:
         # Generate subscription ID
         sub_id = str(uuid4())
         events: list[NostrEvent] = []
+        append_event = events.append
 
         # Send REQ command
         await self._send(["REQ", sub_id, *filters])
@@ -854,14 +1052,16 @@ class Relay:
             async with asyncio.timeout(timeout):
                 while True:
                     msg = await self._recv()
+                    # EVENT is by far the most frequent message; test it first
+                    kind = msg[0]
 
-                    if msg[0] == "EVENT":
+                    if kind == "EVENT":
                         # Always append events for this short-lived, dedicated subscription.
                         # Tests may feed a fixed subscription id (e.g. "sub_id") that differs
                         # from the locally generated one, so we avoid strict id matching to
                         # prevent an unnecessary wait inside the timeout context.
-                        events.append(msg[2])
-                    elif msg[0] == "EOSE":
+                        append_event(msg[2])
+                    elif kind == "EOSE":
                         # End-of-stored-events – irrespective of the subscription identifier
                         # because this instance only keeps one outstanding REQ at a time
                         # within this helper method.
@@ -881,12 +1081,14 @@ class Relay:
         self,
         filters: list[NostrFilter],
         callback: Callable[[NostrEvent], None],
+        sub_id: str | None = None,
     ) -> str:
         """Subscribe to events matching filters.
 
         Args:
             filters: List of filters to match events
             callback: Function to call for each matching event
+            sub_id: Subscription ID to use (generated if not given)
 
         Returns:
             Subscription ID (use to unsubscribe)
@@ -894,7 +1096,7 @@ class Relay:
         await self.connect()
 
         # Generate subscription ID
-        sub_id = str(uuid4())
+        sub_id = sub_id or str(uuid4())
         self.subscriptions[sub_id] = callback
 
         # Send REQ command
@@ -993,6 +1195,7 @@ class QueuedRelay(Relay):
         batch_size: int = 10,
         batch_interval: float = 1.0,
         enable_batching: bool = True,
+        max_batch_bytes: int = 64 * 1024,
     ) -> None:
         """Initialize queued relay client.
 
@@ -1001,12 +1204,16 @@ class QueuedRelay(Relay):
             batch_size: Maximum events to send in one batch
             batch_interval: Seconds between batch processing
             enable_batching: Whether to batch events or send one by one
+            max_batch_bytes: Maximum serialized size of events pipelined together
         """
         super().__init__(url)
         self.queue = EventQueue()
         self.batch_size = batch_size
         self.batch_interval = batch_interval
         self.enable_batching = enable_batching
+        self.max_batch_bytes = max_batch_bytes
+        # Other relays that queued events are fanned out to (set by RelayPool)
+        self.peers: list[Relay] = []
         self._processor_task: asyncio.Task[None] | None = None
         self._running = False
 
@@ -1020,7 +1227,7 @@ class QueuedRelay(Relay):
         """Stop the background queue processor."""
         self._running = False
         if self._processor_task and not self._processor_task.done():
-            self.queue._event.set()  # Wake up processor
+            self.queue.wake()  # Wake up processor
             await self._processor_task
 
     async def _process_queue(self) -> None:
@@ -1043,35 +1250,33 @@ class QueuedRelay(Relay):
                         # Process one at a time
                         batch = await self.queue.get_batch(1)
 
-                    # Process each event
-                    for queued_event in batch:
+                    # Pipeline each chunk: send all EVENTs, then collect OKs
+                    for chunk in self._chunk_batch(batch):
+                        error: str | None = None
                         try:
-                            success = await self._publish_to_relays(queued_event.event)
+                            results = await self._publish_batch_to_relays(chunk)
+                        except Exception as e:
+                            # Connection error, requeue the whole chunk
+                            results = {}
+                            error = str(e)
 
-                            if success:
+                        for queued_event in chunk:
+                            event_id = queued_event.event["id"]
+                            if results.get(event_id, False):
                                 # Remove from pending caches
-                                await self.queue.remove(queued_event.event["id"])
+                                await self.queue.remove(event_id)
 
                                 # Call success callback if provided
                                 if queued_event.callback:
                                     queued_event.callback(True, None)
-                            else:
-                                # Event rejected, try to requeue
-                                if not await self.queue.requeue(queued_event):
-                                    # Max retries exceeded
-                                    if queued_event.callback:
-                                        queued_event.callback(
-                                            False, "Max retries exceeded"
-                                        )
-
-                        except Exception as e:
-                            # Connection error, requeue
-                            if not await self.queue.requeue(queued_event):
+                            elif not await self.queue.requeue(queued_event):
                                 # Max retries exceeded
                                 if queued_event.callback:
-                                    queued_event.callback(False, str(e))
+                                    queued_event.callback(
+                                        False, error or "Max retries exceeded"
+                                    )
 
-                        # Small delay between events to avoid rate limiting
+                        # Small delay between chunks to avoid rate limiting
                         if not self.enable_batching and len(batch) > 1:
                             await asyncio.sleep(0.1)
 
@@ -1079,9 +1284,66 @@ class QueuedRelay(Relay):
                 print(f"Queue processor error: {e}")
                 await asyncio.sleep(1)  # Avoid tight error loop
 
+    def _chunk_batch(self, batch: list[QueuedEvent]) -> list[list[QueuedEvent]]:
+        """Split a batch into chunks that stay under ``max_batch_bytes``."""
+        chunks: list[list[QueuedEvent]] = []
+        current: list[QueuedEvent] = []
+        current_size = 0
+
+        for queued_event in batch:
+            size = len(queued_event.encode())
+            if current and current_size + size > self.max_batch_bytes:
+                chunks.append(current)
+                current = []
+                current_size = 0
+            current.append(queued_event)
+            current_size += size
+
+        if current:
+            chunks.append(current)
+        return chunks
+
     async def _publish_to_relays(self, event: NostrEvent) -> bool:
-        """Publish event to this relay."""
-        return await super().publish_event(event)
+        """Publish event to this relay and its peers concurrently.
+
+        Returns True if at least one relay accepted the event.
+        """
+        # Serialize once and send the same frame everywhere
+        frame = _encode_event(event)
+        results = await asyncio.gather(
+            *(
+                relay._publish_frame(event["id"], frame)
+                for relay in (self, *self.peers)
+            ),
+            return_exceptions=True,
+        )
+        return any(result is True for result in results)
+
+    async def _publish_batch_to_relays(
+        self, batch: list[QueuedEvent]
+    ) -> dict[str, bool]:
+        """Publish a batch of events to this relay and its peers concurrently.
+
+        Each relay gets one pipelined round-trip; an event counts as published
+        if at least one relay accepted it.
+        """
+        event_ids = [queued_event.event["id"] for queued_event in batch]
+        frames = [queued_event.encode() for queued_event in batch]
+        if not self.peers:
+            return await self._publish_frames(event_ids, frames)
+
+        results = await asyncio.gather(
+            self._publish_frames(event_ids, frames),
+            *(peer._publish_frames(event_ids, frames) for peer in self.peers),
+            return_exceptions=True,
+        )
+        merged = dict.fromkeys(event_ids, False)
+        for result in results:
+            if isinstance(result, dict):
+                for event_id, accepted in result.items():
+                    if accepted:
+                        merged[event_id] = True
+        return merged
 
     async def publish_event(
         self,
@@ -1106,7 +1368,7 @@ class QueuedRelay(Relay):
         """
         if immediate:
             # Bypass queue for urgent events
-            return await super().publish_event(event)
+            return await self._publish_to_relays(event)
 
         # Add to queue
         await self.queue.add(
@@ -1139,15 +1401,22 @@ class QueuedRelay(Relay):
 class RelayPool:
     """Pool of QueuedRelay instances with shared queue."""
 
-    def __init__(self, urls: list[str], **relay_kwargs: Any) -> None:
+    def __init__(
+        self, urls: list[str], max_seen_messages: int = 4096, **relay_kwargs: Any
+    ) -> None:
         """Initialize relay pool with shared queue.
 
         Args:
             urls: List of relay URLs
+            max_seen_messages: Bound on seen event IDs kept per subscription
             **relay_kwargs: Arguments passed to QueuedRelay
         """
         self.relays: list[QueuedRelay] = []
         self.shared_queue = EventQueue()
+        self.max_seen_messages = max_seen_messages
+        # Event IDs already delivered to each pool subscription, keyed by
+        # subscription ID (insertion-ordered for eviction)
+        self._seen_event_ids: dict[str, dict[str, None]] = {}
 
         # Create relays with shared queue
         for url in urls:
@@ -1156,9 +1425,13 @@ class RelayPool:
             relay.queue = self.shared_queue
             self.relays.append(relay)
 
+        # The first relay processes the shared queue and fans out to the rest
+        if self.relays:
+            self.relays[0].peers = list(self.relays[1:])
+
     async def publish_event(self, event: NostrEvent, **kwargs: Any) -> bool:
         """Publish event to all relays in pool."""
-        # Add to shared queue once
+        # Add to shared queue once; the first relay fans out to its peers
         if self.relays:
             return await self.relays[0].publish_event(event, **kwargs)
         return False
@@ -1167,21 +1440,88 @@ class RelayPool:
         """Get pending proofs from shared queue."""
         return self.shared_queue.get_pending_token_data()
 
-    async def connect_all(self) -> None:
-        """Connect and start all relays."""
-        for i, relay in enumerate(self.relays):
+    async def subscribe(
+        self,
+        filters: list[NostrFilter],
+        callback: Callable[[NostrEvent], None],
+    ) -> str:
+        """Subscribe on every relay in the pool under one subscription ID.
+
+        An event returned by several relays is passed to the callback only
+        once per subscription.
+        """
+        sub_id = str(uuid4())
+        seen: dict[str, None] = {}
+        self._seen_event_ids[sub_id] = seen
+
+        def deliver(event: NostrEvent) -> None:
+            # Only called by a relay that still has sub_id registered
+            event_id = event.get("id")
+            if event_id in seen:
+                return
+            self._remember(seen, event_id, None)
+            callback(event)
+
+        for relay in self.relays:
             try:
-                await relay.connect()
-                # Only start queue processor for the first relay to avoid concurrent processing
-                if i == 0:
-                    await relay.start_queue_processor()
+                await relay.subscribe(filters, deliver, sub_id=sub_id)
             except Exception as e:
-                print(f"Failed to connect relay {relay.url}: {e}")
+                print(f"Failed to subscribe on relay {relay.url}: {e}")
+        return sub_id
+
+    async def unsubscribe(self, sub_id: str) -> None:
+        """Close a subscription on every relay in the pool."""
+        self._seen_event_ids.pop(sub_id, None)
+        for relay in self.relays:
+            try:
+                await relay.unsubscribe(sub_id)
+            except Exception as e:
+                print(f"Failed to unsubscribe on relay {relay.url}: {e}")
+
+    async def process_messages(self) -> None:
+        """Process incoming messages from all relays.
+
+        Run this in a background task to handle pool subscriptions.
+        """
+        await asyncio.gather(*(relay.process_messages() for relay in self.relays))
+
+    def _remember(self, cache: dict[Any, Any], key: Any, value: Any) -> None:
+        """Insert into a bounded cache, evicting the oldest entry when full."""
+        if len(cache) >= self.max_seen_messages:
+            del cache[next(iter(cache))]
+        cache[key] = value
+
+    async def connect_all(self) -> None:
+        """Connect and start all relays."""
+        results = await asyncio.gather(
+            *(relay.connect() for relay in self.relays), return_exceptions=True
+        )
+        for relay, result in zip(self.relays, results):
+            if isinstance(result, Exception):
+                print(f"Failed to connect relay {relay.url}: {result}")
+
+        # Only start queue processor for the first relay to avoid concurrent
+        # processing; it publishes to every relay in the pool
+        if self.relays:
+            await self.relays[0].start_queue_processor()
 
     async def disconnect_all(self) -> None:
         """Disconnect all relays."""
-        for relay in self.relays:
-            await relay.disconnect()
+        results = await asyncio.gather(
+            *(relay.disconnect() for relay in self.relays), return_exceptions=True
+        )
+        for relay, result in zip(self.relays, results):
+            if isinstance(result, Exception):
+                print(f"Failed to disconnect relay {relay.url}: {result}")
+
+
+def _queue_priority(kind: int, priority: int = 0) -> int:
+    """Queue priority for an event: token events first, then history."""
+    if kind == EventKind.Token:
+        return 10  # High priority for token events
+    if kind == EventKind.History:
+        return 5  # Medium priority for history
+    return priority
 
 
 def create_event(
@@ -1201,6 +1541,11 @@ def create_event(
 class RelayClient:
     """Manages relay connections, discovery, and publishing for NIP-60 wallets."""
 
+    # Clients shared by wallets with the same key, relays and options, per loop
+    _shared: ClassVar[
+        weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple, RelayClient]]
+    ] = weakref.WeakKeyDictionary()
+
     def __init__(
         self,
         relay_urls: list[str],
@@ -1229,6 +1574,53 @@ class RelayClient:
         # Rate limiting
         self._last_relay_operation = 0.0
 
+        # Users of a shared client (see acquire/release)
+        self._users = 1
+        self._shared_key: tuple | None = None
+
+    @classmethod
+    def acquire(
+        cls, relay_urls: list[str], privkey: PrivateKey, **kwargs: Any
+    ) -> RelayClient:
+        """Get a relay client, reusing one already open for the same key and relays.
+
+        Sharing only happens inside a running event loop, since websockets are
+        bound to the loop that opened them. Each acquire must be paired with a
+        release().
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return cls(relay_urls, privkey, **kwargs)
+
+        from .crypto import get_pubkey
+
+        key = (
+            get_pubkey(privkey),
+            frozenset(relay_urls),
+            tuple(sorted(kwargs.items())),
+        )
+        clients = cls._shared.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = clients[key] = cls(relay_urls, privkey, **kwargs)
+            client._shared_key = key
+        else:
+            client._users += 1
+        return client
+
+    async def release(self) -> None:
+        """Drop one user of this client, disconnecting once none remain."""
+        self._users -= 1
+        if self._users > 0:
+            return
+        if self._shared_key is not None:
+            clients = self._shared.get(asyncio.get_running_loop(), {})
+            if clients.get(self._shared_key) is self:
+                del clients[self._shared_key]
+            self._shared_key = None
+        await self.disconnect_all()
+
     async def get_relay_connections(self) -> list[Relay]:
         """Get relay connections, discovering if needed."""
         # If no relay URLs are configured, try to discover them
@@ -1307,12 +1699,16 @@ class RelayClient:
             return []
 
     async def rate_limit_relay_operations(self) -> None:
-        """Apply rate limiting to relay operations."""
+        """Apply rate limiting to relay operations.
+
+        Each caller reserves the next free slot before sleeping, so concurrent
+        publishers are spaced out instead of all waking at the same time.
+        """
         now = time.time()
-        time_since_last = now - self._last_relay_operation
-        if time_since_last < self.min_relay_interval:
-            await asyncio.sleep(self.min_relay_interval - time_since_last)
-        self._last_relay_operation = time.time()
+        slot = max(now, self._last_relay_operation + self.min_relay_interval)
+        self._last_relay_operation = slot
+        if slot > now:
+            await asyncio.sleep(slot - now)
 
     def estimate_event_size(self, event: dict) -> int:
         """Estimate the size of an event in bytes."""
@@ -1338,18 +1734,10 @@ class RelayClient:
         if self.use_queued_relays and self.relay_pool:
             event_dict = NostrEvent(**signed_event)  # type: ignore
 
-            # Determine priority based on event kind
-            if signed_event["kind"] == EventKind.Token:
-                priority = 10  # High priority for token events
-            elif signed_event["kind"] == EventKind.History:
-                priority = 5  # Medium priority for history
-            else:
-                priority = priority or 0
-
             # Add to queue with token data if provided
             success = await self.relay_pool.publish_event(
                 event_dict,
-                priority=priority,
+                priority=_queue_priority(signed_event["kind"], priority),
                 token_data=token_data,
                 immediate=False,  # Use queue
             )
@@ -1366,10 +1754,11 @@ class RelayClient:
         # Try to publish to at least one relay
         published = False
         errors = []
+        frame = _encode_event(event_dict)  # Serialize once for all relays
 
         for relay in relays:
             try:
-                if await relay.publish_event(event_dict):
+                if await relay._publish_frame(event_dict["id"], frame):
                     published = True
                 else:
                     errors.append(f"{relay.url}: Event rejected")
@@ -1386,6 +1775,70 @@ class RelayClient:
 
         return signed_event["id"]
 
+    async def publish_batch_to_relays(
+        self,
+        unsigned_events: list[dict],
+        *,
+        token_data: list[dict[str, object] | None] | None = None,
+    ) -> list[str]:
+        """Sign and publish several events together and return their IDs.
+
+        Rate limiting applies once to the whole batch, and in legacy mode every
+        relay receives all EVENT frames before any OK is awaited.
+
+        Args:
+            unsigned_events: Events to sign and publish, in order
+            token_data: Optional token data per event (for queued token events)
+        """
+        from .crypto import sign_event
+
+        signed_events = [
+            NostrEvent(**sign_event(event, self.privkey))  # type: ignore
+            for event in unsigned_events
+        ]
+        event_ids = [event["id"] for event in signed_events]
+        per_event_data = token_data or [None] * len(signed_events)
+
+        await self.rate_limit_relay_operations()
+
+        if self.use_queued_relays and self.relay_pool:
+            for event, data in zip(signed_events, per_event_data):
+                success = await self.relay_pool.publish_event(
+                    event,
+                    priority=_queue_priority(event["kind"]),
+                    token_data=data,
+                    immediate=False,  # Use queue
+                )
+                if not success:
+                    raise RelayError("Failed to queue event for publishing")
+            return event_ids
+
+        # Legacy mode: pipeline the whole batch to each relay
+        relays = await self.get_relay_connections()
+        frames = [_encode_event(event) for event in signed_events]
+        published: set[str] = set()
+        errors = []
+
+        for relay in relays:
+            try:
+                results = await relay._publish_frames(event_ids, frames)
+            except Exception as e:
+                errors.append(f"{relay.url}: {str(e)}")
+                continue
+            published.update(event_id for event_id, ok in results.items() if ok)
+            if not all(results.values()):
+                errors.append(f"{relay.url}: Event rejected")
+
+        if len(published) < len(event_ids):
+            # Don't raise exception - allow operations to continue
+            print(
+                f"Warning: Failed to publish {len(event_ids) - len(published)} of "
+                f"{len(event_ids)} events to any relay. "
+                f"Last error: {errors[-1] if errors else 'Unknown'}"
+            )
+
+        return event_ids
+
     def get_pending_proofs(self) -> list[dict[str, object]]:
         """Get pending proofs from queued token events."""
         if self.use_queued_relays and self.relay_pool:
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Any, Literal, TypedDict
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Any, Literal, Mapping, TypedDict
 
 
 class Proof(TypedDict):
@@ -120,35 +123,125 @@ class EventKind:
 EventDict = dict[str, Any]  # Generic Nostr event dictionary
 
 
+_amount_of = itemgetter("amount")
+_unit_of = itemgetter("unit")
+
+
+@dataclass
+class _ProofIndex:
+    """Balances and proof groupings of a proof list, built in a single pass."""
+
+    balance_by_mint: dict[str, int]
+    balance_by_unit: dict[CurrencyUnit, int]
+    balance_by_mint_unit: dict[tuple[str, CurrencyUnit], int]
+    # Balance in BTC-based units, in sats (msat rounded down per proof)
+    total_sat: int
+    proofs_by_mint: dict[str, list[Proof]]
+    proofs_by_keyset: dict[str, list[Proof]]
+
+    @classmethod
+    def build(cls, proofs: list[Proof]) -> _ProofIndex:
+        by_mint: defaultdict[str, list[Proof]] = defaultdict(list)
+        by_keyset: defaultdict[str, list[Proof]] = defaultdict(list)
+        for proof in proofs:
+            by_mint[proof["mint"]].append(proof)
+            by_keyset[proof["id"]].append(proof)
+
+        # Sum each mint's group; a mint usually holds a single unit, which
+        # lets sum() run over the amounts without a Python-level loop
+        by_mint_unit: dict[tuple[str, CurrencyUnit], int] = {}
+        msat_as_sat = 0
+        for mint_url, group in by_mint.items():
+            units = set(map(_unit_of, group))
+            if len(units) == 1:
+                (unit,) = units
+                by_mint_unit[mint_url, unit] = sum(map(_amount_of, group))
+            else:
+                for proof in group:
+                    key = (mint_url, proof["unit"])
+                    by_mint_unit[key] = by_mint_unit.get(key, 0) + proof["amount"]
+            if "msat" in units:
+                msat_as_sat += sum(
+                    proof["amount"] // 1000
+                    for proof in group
+                    if proof["unit"] == "msat"
+                )
+
+        # Roll the (mint, unit) sums up; there are only a handful of pairs
+        by_mint_total: defaultdict[str, int] = defaultdict(int)
+        by_unit_total: defaultdict[CurrencyUnit, int] = defaultdict(int)
+        for (mint_url, unit), total in by_mint_unit.items():
+            by_mint_total[mint_url] += total
+            by_unit_total[unit] += total
+
+        return cls(
+            balance_by_mint=dict(by_mint_total),
+            balance_by_unit=dict(by_unit_total),
+            balance_by_mint_unit=by_mint_unit,
+            total_sat=by_unit_total.get("sat", 0) + msat_as_sat,
+            proofs_by_mint=dict(by_mint),
+            proofs_by_keyset=dict(by_keyset),
+        )
+
+
 @dataclass
 class WalletState:
     """Wallet state with balance tracking."""
 
     proofs: list[Proof]
     proof_to_event_id: dict[str, str] | None = None
+    # Proofs carried by each token event, as published (before validation)
+    proofs_by_event: dict[str, list[Proof]] | None = None
+    _index: _ProofIndex | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Reassigning proofs invalidates the cached groupings
+        if name == "proofs":
+            object.__setattr__(self, "_index", None)
+        object.__setattr__(self, name, value)
+
+    def invalidate(self) -> None:
+        """Drop the cached balances and groupings.
+
+        Reassigning ``proofs`` does this automatically; call it after changing
+        the ``proofs`` list or one of its proofs in place.
+        """
+        self._index = None
+
+    def _grouped(self) -> _ProofIndex:
+        """Get the cached proof groupings, building them on first use."""
+        index = self._index
+        if index is None:
+            index = self._index = _ProofIndex.build(self.proofs)
+        return index
+
+    # The groupings below are read-only views of the cache, shared between
+    # calls; copy them before modifying.
 
     @property
-    def balance_by_mint(self) -> dict[str, int]:
-        return {p["mint"]: p["amount"] for p in self.proofs}
+    def balance_by_mint(self) -> Mapping[str, int]:
+        """Get total balance grouped by mint URL."""
+        return MappingProxyType(self._grouped().balance_by_mint)
 
     @property
-    def balance_by_unit(self) -> dict[CurrencyUnit, int]:
+    def balance_by_unit(self) -> Mapping[CurrencyUnit, int]:
         """Get total balance grouped by currency unit."""
-        balances: dict[CurrencyUnit, int] = {}
-        for proof in self.proofs:
-            unit = proof["unit"]
-            balances[unit] = balances.get(unit, 0) + proof["amount"]
-        return balances
+        return MappingProxyType(self._grouped().balance_by_unit)
+
+    @property
+    def balance_by_mint_unit(self) -> Mapping[tuple[str, CurrencyUnit], int]:
+        """Get total balance grouped by (mint URL, currency unit)."""
+        return MappingProxyType(self._grouped().balance_by_mint_unit)
 
     async def total_balance_sat(self, include_shitnuts: bool = False) -> int:
         """Get total balance in satoshis (only BTC-based currencies)."""
-        total_sats = 0
+        total_sats = self._grouped().total_sat
+        if not include_shitnuts:
+            return total_sats
         for proof in self.proofs:
-            if proof["unit"] == "sat":
-                total_sats += proof["amount"]
-            elif proof["unit"] == "msat":
-                total_sats += proof["amount"] // 1000
-            elif include_shitnuts:
+            if proof["unit"] not in ("sat", "msat"):
                 from .mint import Mint
 
                 mint = Mint(proof["mint"])
@@ -158,26 +251,14 @@ class WalletState:
         return total_sats
 
     @property
-    def proofs_by_keyset(self) -> dict[str, list[Proof]]:
+    def proofs_by_keyset(self) -> Mapping[str, list[Proof]]:
         """Group proofs by keyset ID."""
-        grouped: dict[str, list[Proof]] = {}
-        for proof in self.proofs:
-            keyset_id = proof["id"]
-            if keyset_id not in grouped:
-                grouped[keyset_id] = []
-            grouped[keyset_id].append(proof)
-        return grouped
+        return MappingProxyType(self._grouped().proofs_by_keyset)
 
     @property
-    def proofs_by_mint(self) -> dict[str, list[Proof]]:
+    def proofs_by_mint(self) -> Mapping[str, list[Proof]]:
         """Group proofs by mint URL."""
-        grouped: dict[str, list[Proof]] = {}
-        for proof in self.proofs:
-            mint_url = proof["mint"]
-            if mint_url not in grouped:
-                grouped[mint_url] = []
-            grouped[mint_url].append(proof)
-        return grouped
+        return MappingProxyType(self._grouped().proofs_by_mint)
 
     @property
     def mint_balances(self) -> dict[str, int]:
@@ -186,7 +267,7 @@ class WalletState:
         TODO: add support for non-BTC currencies.
         """
         balances: dict[str, int] = {}
-        for mint_url, proofs in self.proofs_by_mint.items():
+        for mint_url, proofs in self._grouped().proofs_by_mint.items():
             for proof in proofs:
                 if proof["unit"] == "sat":
                     balances[mint_url] = balances.get(mint_url, 0) + proof["amount"]
@@ -203,7 +284,7 @@ class WalletState:
     def mint_balances_by_unit(self) -> dict[str, dict[str, int]]:
         """Get balances for all mints organized by currency unit."""
         balances: dict[str, dict[str, int]] = {}
-        for mint_url, proofs in self.proofs_by_mint.items():
+        for mint_url, proofs in self._grouped().proofs_by_mint.items():
             if mint_url not in balances:
                 balances[mint_url] = {}
             for proof in proofs:
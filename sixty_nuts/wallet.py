@@ -1,23 +1,35 @@
 from __future__ import annotations
 
 
-from typing import Literal, cast
+from typing import Any, Callable, Iterable, Literal, cast
 import base64
-import json
+import binascii
+import logging
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from itertools import compress
+from operator import itemgetter
+import random
 import secrets
+import sys
 import time
 import asyncio
 from pathlib import Path
 
-import httpx
 from coincurve import PublicKey
 
-from .mint import Mint, ProofComplete, get_mints_from_env
-from .relay import RelayClient, EventKind, get_relays_from_env
+from .mint import Mint, ProofComplete, create_mint_client, get_mints_from_env
+from .relay import (
+    RelayClient,
+    EventKind,
+    NostrEvent,
+    get_relays_from_env,
+)
+from .codec import decode_json, encode_json
 from .crypto import (
     unblind_signature,
-    hash_to_curve,
-    create_blinded_message_with_secret,
+    hash_to_curve_bytes,
+    create_blinded_messages_with_secrets,
     get_mint_pubkey_for_amount,
     decode_nsec,
     get_pubkey,
@@ -35,14 +47,133 @@ from .types import (
     WalletError,
     WalletState,
     CurrencyUnit,
-    BlindedMessage,
 )
 from .events import EventManager
 
 try:
-    import cbor2
+    # cbor2 re-exports these from its _cbor2 C extension when the wheel has it
+    from cbor2 import dumps as cbor_dumps, loads as cbor_loads
 except ModuleNotFoundError:  # pragma: no cover – allow runtime miss
-    cbor2 = None  # type: ignore
+    cbor_dumps = cbor_loads = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Unit groups used when converting amounts: fiat and stablecoins are counted
+# in cents, sat/msat are already base units
+_FIAT_UNITS = frozenset({"usd", "eur", "gbp", "cad", "chf", "aud", "jpy", "cny", "inr"})
+_STABLECOIN_UNITS = frozenset({"usdt", "usdc", "dai"})
+_SAT_UNITS = frozenset({"sat", "msat"})
+# Currency units supported per NUT-01
+_VALID_UNITS = frozenset(
+    {"btc", "sat", "msat", "usd", "eur", "gbp", "jpy", "auth", "usdt", "usdc", "dai"}
+)
+
+
+def _stored_sidecar(backup_file: Path) -> Path:
+    """Append-only log of proof ids from a backup that made it to Nostr."""
+    return backup_file.with_suffix(".stored")
+
+
+def _delete_backup(backup_file: Path) -> None:
+    """Delete a proof backup together with its stored-ids sidecar."""
+    backup_file.unlink()
+    _stored_sidecar(backup_file).unlink(missing_ok=True)
+
+
+def _read_backup(backup_file: Path) -> dict:
+    """Load one proof backup file."""
+    return decode_json(backup_file.read_bytes())
+
+
+async def _load_backups(backup_files: list[Path]) -> list[dict | BaseException]:
+    """Read backup files concurrently in worker threads.
+
+    A file that fails to load yields its exception in place of the data.
+    """
+    return await asyncio.gather(
+        *(asyncio.to_thread(_read_backup, backup_file) for backup_file in backup_files),
+        return_exceptions=True,
+    )
+
+
+async def _backups_have_missing(
+    backup_files: list[Path], existing_proof_ids: set[str] | dict[str, str]
+) -> bool:
+    """Check whether any backup holds a proof id not in ``existing_proof_ids``.
+
+    Files are read concurrently and checked as each one finishes loading, so
+    the scan stops at the first backup with a missing proof instead of
+    waiting for (and holding) every file. Unreadable files are skipped.
+    """
+    reads = [
+        asyncio.ensure_future(asyncio.to_thread(_read_backup, backup_file))
+        for backup_file in backup_files
+    ]
+    try:
+        for next_read in asyncio.as_completed(reads):
+            try:
+                backup_data = await next_read
+                backup_ids = {
+                    f"{proof['secret']}:{proof['C']}"
+                    for proof in backup_data.get("proofs", [])
+                }
+            except Exception:
+                continue
+
+            if backup_ids.difference(existing_proof_ids):
+                return True
+        return False
+    finally:
+        # Reads still in flight are no longer needed
+        for read in reads:
+            read.cancel()
+        await asyncio.gather(*reads, return_exceptions=True)
+
+
+async def _delete_backups(backup_files: list[Path]) -> list[BaseException | None]:
+    """Delete backup files (and sidecars) concurrently in worker threads.
+
+    Returns None for each deleted file, or the exception that prevented it.
+    """
+    return await asyncio.gather(
+        *(
+            asyncio.to_thread(_delete_backup, backup_file)
+            for backup_file in backup_files
+        ),
+        return_exceptions=True,
+    )
+
+
+def _unchecked_proof_ids(state: WalletState) -> set[str] | dict[str, str]:
+    """Proof ids (``secret:C``) of a state fetched with ``check_proofs=False``.
+
+    Nothing is dropped from such a state, so its ``proof_to_event_id`` index
+    already holds exactly these ids and is returned as is.
+    """
+    if state.proof_to_event_id:
+        return state.proof_to_event_id
+    return {f"{p['secret']}:{p['C']}" for p in state.proofs}
+
+
+@lru_cache(maxsize=16384)
+def _nip60_secret_to_hex(secret: str) -> str:
+    """Convert a NIP-60 (base64) proof secret to the internal hex form.
+
+    Secrets that don't decode are assumed to be hex already (backwards
+    compatibility). Decoding matches base64.b64decode; results are memoized
+    since every state fetch sees the same secrets again.
+    """
+    try:
+        return binascii.a2b_base64(secret).hex()
+    except ValueError:
+        return secret
+
+
+@lru_cache(maxsize=16384)
+def _y_for_secret(secret: str) -> str:
+    """Return hash_to_curve(secret) as compressed hex; secrets never change."""
+    # Hash to curve using UTF-8 bytes of the hex secret (Cashu standard)
+    return hash_to_curve_bytes(secret.encode("utf-8")).hex()
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -70,12 +201,8 @@ class Wallet:
         self.mints: dict[str, Mint] = {}
 
         # Relay manager - will be initialized with proper relays later
-        self.relay_manager = RelayClient(
-            relay_urls=self.relay_urls,  # May be empty initially
-            privkey=self._privkey,  # Already a PrivateKey object
-            use_queued_relays=True,
-            min_relay_interval=1.0,
-        )
+        # Shared with other wallets for the same key and relays in this loop
+        self.relay_manager = self._acquire_relay_manager()
 
         self.event_manager: EventManager = EventManager(
             relay_manager=self.relay_manager,
@@ -83,19 +210,48 @@ class Wallet:
             mint_urls=self.mint_urls,
         )
         self._minted_quotes: set[str] = set()
-        self.mint_client = httpx.AsyncClient()
+        # Shared by every Mint this wallet talks to, so connections are pooled
+        self.mint_client = create_mint_client()
 
         self.wallet_privkey: str | None = None
 
-        # Cache for proof validation results to prevent re-checking spent proofs
+        # Cache for proof validation results to prevent re-checking spent proofs.
+        # Keyed by the proof's C, which alone identifies it (C = k·hash(secret))
         self._proof_state_cache: dict[
-            str, dict[str, str]
-        ] = {}  # proof_id -> {state, timestamp}
+            str, tuple[str, float]
+        ] = {}  # C -> (state, monotonic timestamp)
         self._cache_expiry = 300  # 5 minutes
 
-        # Track known spent proofs to avoid re-validation
+        # Track known spent proofs (by C) to avoid re-validation
         self._known_spent_proofs: set[str] = set()
 
+        # Last validation result: (monotonic timestamp, Cs checked, Cs valid).
+        # Reused while the same proof set is fetched again shortly after.
+        self._validated_proofs_cache: (
+            tuple[float, frozenset[str], frozenset[str]] | None
+        ) = None
+        self._validated_proofs_ttl = 5.0
+
+        # Parsed content of our own events by id. Event ids hash the content,
+        # so an entry never goes stale; bounded to the most recent ones.
+        self._event_content_cache: OrderedDict[str, Any] = OrderedDict()
+        self._event_content_cache_size = 1024
+
+        # Local proof backups, resolved once; created on the first store_proofs
+        self._backup_dir = Path.cwd() / "proof_backups"
+        self._backup_dir_ready = False
+        self._last_backup_check: float | None = None  # Loaded from .last_check
+        # Backup file listing keyed by the directory's mtime
+        self._backup_files_cache: tuple[int, list[Path]] | None = None
+
+        # Keyset id -> input fee per mint URL, alongside the keyset list it was
+        # built from; rebuilt whenever the mint client refetches its keysets
+        self._keyset_fees_cache: dict[str, tuple[list[Any], dict[str, int]]] = {}
+
+        # Last unchecked wallet state, reused by back-to-back store_proofs calls
+        self._state_cache: tuple[float, WalletState] | None = None
+        self._state_cache_ttl = 5.0
+
     @classmethod
     async def create(
         cls,
@@ -202,15 +358,13 @@ class Wallet:
             proofs, optimal_denoms, mint_url, unit
         )
 
-        # Publish new token event
-        token_event_id = await self.event_manager.publish_token_event(new_proofs)  # type: ignore
-
-        # Publish spending history
-        await self.event_manager.publish_spending_history(
+        # Publish new token event and its spending history in one round-trip
+        self._state_cache = None
+        await self.event_manager.publish_token_event_with_history(
+            new_proofs,
             direction="in",
             amount=output_amount,  # Use actual amount added after fees
             unit=unit,
-            created_token_ids=[token_event_id],
         )
 
         return output_amount, unit  # Return actual amount added to wallet after fees
@@ -249,57 +403,74 @@ class Wallet:
         quote_resp = await mint.create_mint_quote(amount=base_amount, unit=unit)
         quote_id, invoice = quote_resp["quote"], quote_resp["request"]
 
-        async def poll_payment() -> bool:
-            start_time = time.time()
-            poll_interval = 1.0
-
-            while (time.time() - start_time) < timeout:
-                # Check quote status and mint if paid
-                quote_status, new_proofs = await mint.check_quote_status_and_mint(
-                    quote_id, base_amount, minted_quotes=self._minted_quotes
-                )
-
-                # If new proofs were minted, publish wallet events
-                if new_proofs:
-                    # Convert dict proofs to Proof
-                    proof_dicts: list[Proof] = []
-                    for proof in new_proofs:
-                        proof_dicts.append(
-                            Proof(
-                                id=proof["id"],
-                                amount=proof["amount"],
-                                secret=proof["secret"],
-                                C=proof["C"],
-                                mint=mint.url,
-                                unit=proof["unit"],
-                            )
-                        )
+        async def check_and_mint() -> bool:
+            """Check the quote once, publishing any newly minted proofs."""
+            # Check quote status and mint if paid
+            quote_status, new_proofs = await mint.check_quote_status_and_mint(
+                quote_id, base_amount, minted_quotes=self._minted_quotes
+            )
 
-                    # Publish token event
-                    token_event_id = await self.event_manager.publish_token_event(
-                        proof_dicts
+            # If new proofs were minted, publish wallet events
+            if new_proofs:
+                # Convert dict proofs to Proof
+                proof_dicts: list[Proof] = [
+                    Proof(
+                        id=proof["id"],
+                        amount=proof["amount"],
+                        secret=proof["secret"],
+                        C=proof["C"],
+                        mint=mint.url,
+                        unit=proof["unit"],
                     )
+                    for proof in new_proofs
+                ]
 
-                    # Publish spending history
-                    mint_amount = sum(p["amount"] for p in new_proofs)
-                    # Get unit from first proof (all proofs should have same unit from single mint operation)
-                    mint_unit = (
-                        new_proofs[0].get("unit", "sat") if new_proofs else "sat"
-                    )
-                    await self.event_manager.publish_spending_history(
-                        direction="in",
-                        amount=mint_amount,
-                        unit=mint_unit,
-                        created_token_ids=[token_event_id],
-                    )
+                # Publish token event and spending history together
+                mint_amount = sum(p["amount"] for p in new_proofs)
+                # Get unit from first proof (all proofs should have same unit from single mint operation)
+                mint_unit = new_proofs[0].get("unit", "sat") if new_proofs else "sat"
+                self._state_cache = None
+                await self.event_manager.publish_token_event_with_history(
+                    proof_dicts,
+                    direction="in",
+                    amount=mint_amount,
+                    unit=mint_unit,
+                )
+
+            return bool(quote_status.get("paid"))
 
-                if quote_status.get("paid"):
-                    return True
+        async def poll_payment() -> bool:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            poll_interval = 1.0
 
-                await asyncio.sleep(poll_interval)
-                poll_interval = min(poll_interval * 1.2, 5.0)
+            # Mints supporting NUT-17 push quote updates; wake up on those
+            status_changed = asyncio.Event()
+            watcher = asyncio.create_task(
+                mint.watch_mint_quote(quote_id, status_changed.set)
+            )
+            try:
+                while loop.time() < deadline:
+                    status_changed.clear()
+                    if await check_and_mint():
+                        return True
+
+                    # Sleep until a push notification or the backoff expires.
+                    # With a live subscription polling is only a safety net.
+                    delay = poll_interval * random.uniform(0.8, 1.2)
+                    try:
+                        await asyncio.wait_for(
+                            status_changed.wait(),
+                            timeout=max(0.0, min(delay, deadline - loop.time())),
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    max_interval = 5.0 if watcher.done() else 30.0
+                    poll_interval = min(poll_interval * 1.5, max_interval)
 
-            return False
+                return False
+            finally:
+                watcher.cancel()
 
         # Create background task
         task = asyncio.create_task(poll_payment())
@@ -312,12 +483,14 @@ class Wallet:
         invoice: str,
         *,
         target_mint: str | None = None,
+        state: WalletState | None = None,
     ) -> None:
         """Pay a Lightning invoice by melting tokens with automatic multi-mint support.
 
         Args:
             invoice: BOLT-11 Lightning invoice to pay
             target_mint: Target mint URL (defaults to primary mint)
+            state: Freshly checked wallet state to reuse instead of refetching
 
         Raises:
             WalletError: If insufficient balance or payment fails
@@ -330,7 +503,8 @@ class Wallet:
         except LNURLError as e:
             raise WalletError(f"Invalid Lightning invoice: {e}") from e
 
-        state = await self.fetch_wallet_state(check_proofs=True)
+        if state is None:
+            state = await self.fetch_wallet_state(check_proofs=True)
         total_needed = int(invoice_amount_sat * 1.01)
         total_balance = await state.total_balance_sat(include_shitnuts=True)
         self.raise_if_insufficient_balance(total_balance, total_needed)
@@ -353,8 +527,20 @@ class Wallet:
                 mint_balances.items(), key=lambda x: x[1], reverse=True
             )
 
-            for candidate_mint, balance in sorted_mints:
-                if balance < total_needed:
+            # Probe every mint that can pay on its own at once and take the
+            # best-funded one that answers
+            funded_mints = [m for m, b in sorted_mints if b >= total_needed]
+            reachable = await asyncio.gather(
+                *(self._probe_mint(m) for m in funded_mints)
+            )
+            target_mint = next(
+                (m for m, ok in zip(funded_mints, reachable) if ok), None
+            )
+
+            if target_mint is None:
+                for candidate_mint, balance in sorted_mints:
+                    if balance >= total_needed:
+                        continue
                     # This mint doesn't have enough balance, try transferring
                     try:
                         await self.transfer_balance_to_mint(
@@ -365,17 +551,6 @@ class Wallet:
                         print(f"⚠️  Failed to transfer balance to {candidate_mint}: {e}")
                         continue
 
-                # Try to use this mint
-                try:
-                    # Quick connectivity check
-                    test_mint = self._get_mint(candidate_mint)
-                    await asyncio.wait_for(test_mint.get_info(), timeout=5.0)
-                    target_mint = candidate_mint
-                    break
-                except Exception as e:
-                    print(f"⚠️  Mint {candidate_mint} is not reachable: {e}")
-                    continue
-
             if target_mint is None:
                 raise WalletError(
                     "No reachable trusted mint found with sufficient balance. "
@@ -412,19 +587,16 @@ class Wallet:
             )
 
         # Handle any change returned from the mint
-        change_proofs: list[Proof] = []
         if "change" in melt_resp and melt_resp["change"]:
-            print(
-                "recieved change TODO pls handle this: ",
-                melt_resp["change"],
-                change_proofs,
+            logger.warning(
+                "Melt returned %d change signatures that are not handled yet",
+                len(melt_resp["change"]),
             )
             # TODO: handle change
             # Convert BlindedSignatures to Proof format
             # This would require unblinding logic, but for now we'll skip change handling
             # In practice, most melts shouldn't have change if amounts are selected properly
             # await self.store_proofs(change_proofs)
-            pass
 
         # Mark the consumed input proofs as spent
         await self._mark_proofs_as_spent(consumed_proofs)
@@ -469,7 +641,7 @@ class Wallet:
             # Send from specific mint
             token = await wallet.send(100, mint_url="https://mint.example.com")
         """
-        if token_version not in [3, 4]:
+        if token_version not in (3, 4):
             raise ValueError(f"Unsupported token version: {token_version}. Use 3 or 4.")
 
         # Get wallet state once
@@ -515,17 +687,13 @@ class Wallet:
 
         mint = self._get_mint(mint_url)
 
-        # Filter proofs by the requested currency unit AND mint
-        # Note: mint.url is already normalized by _get_mint
-        unit_proofs = [p for p in state.proofs if p.get("unit") == unit]
-        mint_unit_proofs = [
-            p for p in unit_proofs if normalize_mint_url(p.get("mint", "")) == mint.url
-        ]
-        mint_unit_balance = sum(p["amount"] for p in mint_unit_proofs)
+        # Balances come from the state's cached per-(mint, unit) totals
+        # Note: mint.url is already normalized by _get_mint, as are proof mints
+        mint_unit_balance = state.balance_by_mint_unit.get((mint.url, unit), 0)
 
         if mint_unit_balance < amount:
             # Check if we have enough proofs of this unit at ANY mint
-            total_unit_balance = sum(p["amount"] for p in unit_proofs)
+            total_unit_balance = state.balance_by_unit.get(unit, 0)
             if total_unit_balance < amount:
                 raise WalletError(
                     f"Insufficient {unit.upper()} balance: need {amount}, have {total_unit_balance}"
@@ -536,6 +704,7 @@ class Wallet:
                     f"Total {unit.upper()} balance across all mints: {total_unit_balance}"
                 )
 
+        unit_proofs = [p for p in state.proofs if p.get("unit") == unit]
         selected_proofs, consumed_proofs = await self._select_proofs(
             unit_proofs, amount, mint.url, unit
         )
@@ -574,7 +743,11 @@ class Wallet:
             paid = await wallet.send_to_lnurl("user@getalby.com", 50, unit="usd")
         """
         total_needed_estimated = int(amount * 1.01)
-        total_balance = await self.get_balance()
+        # Fetched once here and handed to melt so relays are only read once
+        state = await self.fetch_wallet_state(
+            check_proofs=True, check_local_backups=True
+        )
+        total_balance = await state.total_balance_sat()
         self.raise_if_insufficient_balance(total_balance, total_needed_estimated)
 
         lnurl_data = await get_lnurl_data(lnurl)
@@ -604,7 +777,7 @@ class Wallet:
             lnurl_data["callback_url"], amount_msat
         )
 
-        await self.melt(bolt11_invoice)
+        await self.melt(bolt11_invoice, state=state)
         return amount
 
     # ───────────────────────── Proof Management ─────────────────────────────────
@@ -642,54 +815,85 @@ class Wallet:
         if not proofs:
             state = await self.fetch_wallet_state(check_proofs=True)
             proofs = state.proofs
+        else:
+            state = WalletState(proofs=proofs)
 
-        # Get currency unit from the first proof
-        unit = proofs[0].get("unit") or "sat"
-
-        # Process each mint
+        # Check units up front (no I/O), then consolidate every mint concurrently
+        mint_urls = []
+        jobs = []
         for mint_url, mint_proofs in state.proofs_by_mint.items():
             if not mint_proofs:
                 continue
-
-            # Calculate current balance for this mint
-            current_balance = sum(p["amount"] for p in mint_proofs)
-
-            # Check if already optimally denominated
-            current_denoms: dict[int, int] = {}
+            if target_mint and mint_url != normalize_mint_url(target_mint):
+                continue
+            # Get currency unit from the mint's first proof
+            unit = mint_proofs[0].get("unit") or "sat"
             for proof in mint_proofs:
                 if proof.get("unit") != unit:
                     raise WalletError(
                         f"All proofs must have the same unit. Mint {mint_url} has proofs with different units: {unit} != {proof.get('unit', 'sat')}"
                     )
-                amount = proof["amount"]
-                current_denoms[amount] = current_denoms.get(amount, 0) + 1
+            mint_urls.append(mint_url)
+            jobs.append(self._consolidate_mint_proofs(mint_url, mint_proofs, unit))
+
+        # Let every mint finish before reporting, so one failed store does not
+        # abandon swaps still in flight at other mints
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+        failures = [
+            (mint_url, result)
+            for mint_url, result in zip(mint_urls, results)
+            if isinstance(result, BaseException)
+        ]
+        if failures:
+            details = "; ".join(f"{mint_url}: {e}" for mint_url, e in failures)
+            raise WalletError(
+                f"Failed to store consolidated proofs ({details})"
+            ) from failures[0][1]
 
+    async def _consolidate_mint_proofs(
+        self, mint_url: str, mint_proofs: list[Proof], unit: CurrencyUnit
+    ) -> None:
+        """Swap one mint's proofs into optimal denominations if they aren't already.
+
+        Failures before the swap are logged rather than raised, since the old
+        proofs are still valid. Once the swap succeeds the old proofs are
+        spent, so failing to store the new ones is raised.
+        """
+        # Calculate current balance for this mint
+        current_balance = sum(p["amount"] for p in mint_proofs)
+
+        # Check if already optimally denominated
+        current_denoms = Counter(p["amount"] for p in mint_proofs)
+
+        try:
             # Calculate optimal denominations for the balance
             optimal_denoms = await self._calculate_optimal_denominations(
                 current_balance, mint_url, unit
             )
 
-            # Check if current denominations match optimal
-            needs_consolidation = False
-            for denom, count in optimal_denoms.items():
-                if current_denoms.get(denom, 0) != count:
-                    needs_consolidation = True
-                    break
+            # Both split the same balance, so equal counts mean nothing to do
+            if current_denoms == Counter(optimal_denoms):
+                return  # Already optimal
 
-            if not needs_consolidation:
-                continue  # Already optimal
+            # Use the new abstracted swap method
+            new_proofs = await self._swap_proof_denominations(
+                mint_proofs, optimal_denoms, mint_url, unit
+            )
+        except Exception as e:
+            print(f"Warning: Failed to consolidate proofs for {mint_url}: {e}")
+            return
 
-            try:
-                # Use the new abstracted swap method
-                new_proofs = await self._swap_proof_denominations(
-                    mint_proofs, optimal_denoms, mint_url, unit
-                )
+        # Store new proofs on Nostr
+        await self.store_proofs(new_proofs)
 
-                # Store new proofs on Nostr
-                await self.store_proofs(new_proofs)
-            except Exception as e:
-                print(f"Warning: Failed to consolidate proofs for {mint_url}: {e}")
-                continue
+    async def _probe_mint(self, mint_url: str) -> bool:
+        """Quick connectivity check against a mint's info endpoint."""
+        try:
+            await asyncio.wait_for(self._get_mint(mint_url).get_info(), timeout=5.0)
+            return True
+        except Exception as e:
+            print(f"⚠️  Mint {mint_url} is not reachable: {e}")
+            return False
 
     async def _calculate_optimal_denominations(
         self, amount: int, mint_url: str, currency: CurrencyUnit
@@ -726,7 +930,10 @@ class Wallet:
         """
         # Validate proofs first
         valid_proofs = await self._validate_proofs_with_cache(proofs)
-        valid_available = sum(p["amount"] for p in valid_proofs)
+        # Pull the amounts out once; sums, filters and the sort below then
+        # run over this column instead of re-reading every proof dict
+        amounts = [p["amount"] for p in valid_proofs]
+        valid_available = sum(amounts)
 
         if valid_available < amount:
             raise WalletError(
@@ -736,27 +943,43 @@ class Wallet:
         # check if enough balance in proofs from target mint
         # Normalize both the target mint and proof mints for comparison
         normalized_target = normalize_mint_url(target_mint)
-        target_mint_proofs = [
-            p
+        at_target = [
+            normalize_mint_url(p.get("mint", "")) == normalized_target
             for p in valid_proofs
-            if normalize_mint_url(p.get("mint", "")) == normalized_target
         ]
-        target_mint_balance = sum(p["amount"] for p in target_mint_proofs)
+        target_mint_proofs = list(compress(valid_proofs, at_target))
+        target_amounts = list(compress(amounts, at_target))
+        target_mint_balance = sum(target_amounts)
         if target_mint_balance < amount:
             raise WalletError(
                 f"Insufficient balance at mint {target_mint}: need {amount}, have {target_mint_balance}"
             )
 
+        order = sorted(
+            range(len(target_amounts)), key=target_amounts.__getitem__, reverse=True
+        )
+
+        # Try an exact match first so no swap (or fee lookup) is needed. Taking
+        # the largest proof that still fits finds an exact subset whenever one
+        # exists for power-of-two denominations.
+        exact_proofs: list[Proof] = []
+        remaining = amount
+        for i in order:
+            if target_amounts[i] <= remaining:
+                exact_proofs.append(target_mint_proofs[i])
+                remaining -= target_amounts[i]
+                if remaining == 0:
+                    return exact_proofs, exact_proofs
+
         # Use greedy algorithm to select minimum proofs needed
-        target_mint_proofs.sort(key=lambda p: p["amount"], reverse=True)
         selected_input_proofs: list[Proof] = []
         selected_total = 0
 
-        for proof in target_mint_proofs:
+        for i in order:
             if selected_total >= amount:
                 break
-            selected_input_proofs.append(proof)
-            selected_total += int(proof["amount"])  # Ensure integer arithmetic
+            selected_input_proofs.append(target_mint_proofs[i])
+            selected_total += int(target_amounts[i])  # Ensure integer arithmetic
 
         if selected_total < amount:
             raise WalletError(
@@ -780,7 +1003,7 @@ class Wallet:
         if unit is None:
             # TODO: this is a hack to get the default unit for the mint
             # TODO: this should be handled in more complex way where it denominates proofs per unit
-            print("No unit provided, using default 'sat'")
+            logger.debug("No unit provided, using default 'sat'")
             unit = "sat"
 
         # Recalculate denominations for the actual output amount
@@ -799,39 +1022,16 @@ class Wallet:
             change_amount, target_mint, unit
         )
 
-        # Combine send and change denominations
-        target_denoms = send_denoms.copy()
-        for denom, count in change_denoms.items():
-            target_denoms[denom] = target_denoms.get(denom, 0) + count
-
-        # Swap the selected proofs for the target denominations
-        new_proofs = await self._swap_proof_denominations(
-            selected_input_proofs, target_denoms, target_mint, unit
+        # Swap the selected proofs for send and change denominations; the
+        # swap already knows which outputs are which, so no re-selection
+        selected_proofs, change_proofs = await self._swap_proof_denominations_split(
+            selected_input_proofs, send_denoms, change_denoms, target_mint, unit
         )
 
-        # Select exactly the amount needed for sending
-        selected_proofs: list[Proof] = []
-        change_proofs: list[Proof] = []
-        used_proofs: set[str] = set()
-        remaining_amount = amount
-
-        # Select proofs to meet the exact amount
-        for proof in sorted(new_proofs, key=lambda p: p["amount"], reverse=True):
-            proof_id = f"{proof['secret']}:{proof['C']}"
-            if proof_id in used_proofs:
-                continue
-
-            if remaining_amount > 0 and proof["amount"] <= remaining_amount:
-                selected_proofs.append(proof)
-                used_proofs.add(proof_id)
-                remaining_amount -= proof["amount"]
-            else:
-                # This is change
-                change_proofs.append(proof)
-
-        if remaining_amount > 0:
+        selected_amount = sum(p["amount"] for p in selected_proofs)
+        if selected_amount < amount:
             raise WalletError(
-                f"Could not select exact amount: {remaining_amount} sats short"
+                f"Could not select exact amount: {amount - selected_amount} sats short"
             )
 
         # Store only the change proofs (not the ones we're sending!)
@@ -848,6 +1048,23 @@ class Wallet:
     ) -> list[Proof]:
         """Swap proofs to specific target denominations.
 
+        See _swap_proof_denominations_split for details.
+        """
+        new_proofs, _ = await self._swap_proof_denominations_split(
+            proofs, target_denominations, {}, mint_url, currency
+        )
+        return new_proofs
+
+    async def _swap_proof_denominations_split(
+        self,
+        proofs: list[Proof],
+        target_denominations: dict[int, int],
+        change_denominations: dict[int, int],
+        mint_url: str,
+        currency: CurrencyUnit,
+    ) -> tuple[list[Proof], list[Proof]]:
+        """Swap proofs to specific target denominations plus change.
+
         This method abstracts the process of swapping proofs for new ones with
         specific denominations. It handles keysets, blinding, swapping, and unblinding.
 
@@ -855,16 +1072,18 @@ class Wallet:
             proofs: List of proofs to swap
             target_denominations: Dict of denomination -> count
                                  e.g., {1: 5, 2: 3, 4: 1} = 5x1sat, 3x2sat, 1x4sat
+            change_denominations: Dict of denomination -> count for change outputs
             mint_url: Mint URL (defaults to first proof's mint or wallet's primary)
 
         Returns:
-            List of new proofs with target denominations
+            Tuple of (target_proofs, change_proofs). Outputs are requested in
+            ascending amount order, so the mint cannot tell the two apart.
 
         Raises:
             WalletError: If swap fails or amounts don't match
         """
         if not proofs:
-            return []
+            return [], []
 
         if not mint_url:
             raise WalletError("No mint URL available")
@@ -877,9 +1096,9 @@ class Wallet:
 
         # Calculate total amounts
         input_amount = sum(p["amount"] for p in proofs)
-        target_amount = sum(
-            denom * count for denom, count in target_denominations.items()
-        )
+        all_denominations = Counter(target_denominations)
+        all_denominations.update(change_denominations)
+        target_amount = sum(denom * count for denom, count in all_denominations.items())
 
         # The correct balance equation is: inputs - fees = outputs
         expected_output_amount = input_amount - input_fees
@@ -904,19 +1123,20 @@ class Wallet:
                 f"No keyset found for currency {currency} on mint {mint.url}"
             )
 
-        # Create blinded messages for target denominations
-        outputs: list[BlindedMessage] = []
-        secrets: list[str] = []
-        blinding_factors: list[str] = []
+        # Create blinded messages for target denominations; is_target tags
+        # each output so the result can be partitioned without searching
+        output_amounts: list[int] = []
+        is_target: list[bool] = []
 
-        for denomination, count in sorted(target_denominations.items()):
-            for _ in range(count):
-                secret, r_hex, blinded_msg = create_blinded_message_with_secret(
-                    denomination, keyset["id"]
-                )
-                outputs.append(blinded_msg)
-                secrets.append(secret)
-                blinding_factors.append(r_hex)
+        for denomination, count in sorted(all_denominations.items()):
+            target_count = target_denominations.get(denomination, 0)
+            is_target.extend([True] * target_count)
+            is_target.extend([False] * (count - target_count))
+            output_amounts.extend([denomination] * count)
+
+        outputs, secrets, blinding_factors = create_blinded_messages_with_secrets(
+            output_amounts, keyset["id"]
+        )
 
         # Perform swap
         # Cast to ProofComplete since swap expects it (ProofComplete extends Proof with optional fields)
@@ -927,20 +1147,25 @@ class Wallet:
         mint_keys = keyset["keys"]
 
         # Unblind signatures to create new proofs
-        new_proofs: list[Proof] = []
+        target_proofs: list[Proof] = []
+        change_proofs: list[Proof] = []
+        # Outputs repeat denominations, so parse each mint key only once
+        mint_pubkeys: dict[int, PublicKey | None] = {}
+        fromhex = bytes.fromhex
         for i, sig in enumerate(swap_resp["signatures"]):
             # Get the public key for this amount
             amount = sig["amount"]
-            mint_pubkey = get_mint_pubkey_for_amount(mint_keys, amount)
+            if amount not in mint_pubkeys:
+                mint_pubkeys[amount] = get_mint_pubkey_for_amount(mint_keys, amount)
+            mint_pubkey = mint_pubkeys[amount]
             if not mint_pubkey:
                 raise WalletError(f"Could not find mint public key for amount {amount}")
 
             # Unblind the signature
-            C_ = PublicKey(bytes.fromhex(sig["C_"]))
-            r = bytes.fromhex(blinding_factors[i])
-            C = unblind_signature(C_, r, mint_pubkey)
+            C_ = PublicKey(fromhex(sig["C_"]))
+            C = unblind_signature(C_, fromhex(blinding_factors[i]), mint_pubkey)
 
-            new_proofs.append(
+            (target_proofs if is_target[i] else change_proofs).append(
                 Proof(
                     id=sig["id"],
                     amount=sig["amount"],
@@ -953,7 +1178,7 @@ class Wallet:
                 )
             )
 
-        return new_proofs
+        return target_proofs, change_proofs
 
     async def _mark_proofs_as_spent(self, spent_proofs: list[Proof]) -> None:
         """Mark proofs as spent following NIP-60 state transitions.
@@ -977,40 +1202,43 @@ class Wallet:
             # No mapping available, nothing to rollover
             return
 
-        # 2. Find which events need updating (contain spent proofs)
+        # 2. Only events holding a spent proof need a rollover; split just those
         spent_proof_ids = {f"{p['secret']}:{p['C']}" for p in spent_proofs}
-        events_with_spent_proofs: dict[str, list[Proof]] = {}
-
-        # Group all proofs by their event IDs
-        for proof in state.proofs:
-            proof_id = f"{proof['secret']}:{proof['C']}"
-            event_id = state.proof_to_event_id.get(proof_id)
+        affected_event_ids = dict.fromkeys(
+            event_id
+            for p in spent_proofs
+            if (event_id := state.proof_to_event_id.get(f"{p['secret']}:{p['C']}"))
+            and event_id != "__pending__"
+        )
 
-            if event_id and event_id != "__pending__":
-                if event_id not in events_with_spent_proofs:
-                    events_with_spent_proofs[event_id] = []
-                events_with_spent_proofs[event_id].append(proof)
+        proofs_by_event = state.proofs_by_event
+        if proofs_by_event is None:
+            # State built without the event index: derive it from the proofs
+            proofs_by_event = {}
+            for proof in state.proofs:
+                event_id = state.proof_to_event_id.get(
+                    f"{proof['secret']}:{proof['C']}"
+                )
+                if event_id in affected_event_ids:
+                    proofs_by_event.setdefault(event_id, []).append(proof)
+
+        # event_id -> (spent proofs, unspent proofs)
+        event_buckets: dict[str, tuple[list[Proof], list[Proof]]] = {}
+        for event_id in affected_event_ids:
+            spent, unspent = event_buckets[event_id] = ([], [])
+            for proof in proofs_by_event.get(event_id, []):
+                proof_id = f"{proof['secret']}:{proof['C']}"
+                (spent if proof_id in spent_proof_ids else unspent).append(proof)
 
         # 3. Process each affected event
         events_to_delete = []
         new_event_ids = []
 
-        for event_id, event_proofs in events_with_spent_proofs.items():
-            # Check if this event contains any spent proofs
-            has_spent_proofs = any(
-                f"{p['secret']}:{p['C']}" in spent_proof_ids for p in event_proofs
-            )
-
-            if not has_spent_proofs:
+        for event_id, (spent, unspent_proofs) in event_buckets.items():
+            # Events without spent proofs stay as they are
+            if not spent:
                 continue
 
-            # Find unspent proofs from this event
-            unspent_proofs = [
-                p
-                for p in event_proofs
-                if f"{p['secret']}:{p['C']}" not in spent_proof_ids
-            ]
-
             events_to_delete.append(event_id)
 
             if unspent_proofs:
@@ -1027,13 +1255,15 @@ class Wallet:
                     # Continue processing other events
 
         # 4. Try to delete old events (best effort - don't fail if relay doesn't support it)
-        for event_id in events_to_delete:
+        if events_to_delete:
             try:
-                await self.event_manager.delete_token_event(event_id)
+                # One NIP-09 event can reference every superseded token event
+                await self.event_manager.delete_token_events(events_to_delete)
             except Exception as e:
                 # Deletion failed - that's okay, the 'del' field handles supersession
                 print(
-                    f"Note: Could not delete event {event_id} (relay may not support deletions): {e}"
+                    f"Note: Could not delete events {', '.join(events_to_delete)} "
+                    f"(relay may not support deletions): {e}"
                 )
 
         # 5. Create spending history (optional but recommended)
@@ -1047,26 +1277,65 @@ class Wallet:
                         spent_by_unit.get(unit_str, 0) + proof["amount"]
                     )
 
-                # Create spending history for each unit
-                for unit, amount in spent_by_unit.items():
-                    await self.event_manager.publish_spending_history(
-                        direction="out",
-                        amount=amount,
-                        unit=unit,
-                        created_token_ids=new_event_ids
-                        if unit == list(spent_by_unit.keys())[0]
-                        else None,
-                        destroyed_token_ids=events_to_delete
-                        if unit == list(spent_by_unit.keys())[0]
-                        else None,
-                    )
+                # Create spending history for each unit, published as one batch.
+                # Token references go on the first unit's entry only.
+                await self.event_manager.publish_spending_histories(
+                    [
+                        {
+                            "direction": "out",
+                            "amount": amount,
+                            "unit": unit,
+                            "created_token_ids": new_event_ids if i == 0 else None,
+                            "destroyed_token_ids": events_to_delete if i == 0 else None,
+                        }
+                        for i, (unit, amount) in enumerate(spent_by_unit.items())
+                    ]
+                )
             except Exception as e:
                 print(f"Warning: Failed to create spending history: {e}")
 
-        # 6. Update local cache for spent proofs
+        # 6. Update local caches for spent proofs
+        self._state_cache = None
+        self._validated_proofs_cache = None
         for proof in spent_proofs:
-            proof_id = f"{proof['secret']}:{proof['C']}"
-            self._cache_proof_state(proof_id, "SPENT")
+            self._cache_proof_state(proof, "SPENT")
+
+    async def _fetch_wallet_state_cached(self) -> WalletState:
+        """Fetch unchecked wallet state, reusing it for a few seconds.
+
+        Every token event publish from this wallet drops the cached state.
+        """
+        cached = self._state_cache
+        if cached is not None and time.monotonic() - cached[0] < self._state_cache_ttl:
+            return cached[1]
+        state = await self.fetch_wallet_state(
+            check_proofs=False, check_local_backups=False
+        )
+        self._state_cache = (time.monotonic(), state)
+        return state
+
+    async def _wait_for_stored_proofs(
+        self, proof_ids: list[str], *, timeout: float = 5.0
+    ) -> set[str] | dict[str, str]:
+        """Refetch wallet state until relays serve all ``proof_ids``.
+
+        Polls with a short, growing delay instead of sleeping a fixed time for
+        relays to propagate; gives up after ``timeout`` seconds. Returns the
+        ids of the proofs stored on relays at the last fetch.
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.25
+        while True:
+            state = await self.fetch_wallet_state(
+                check_proofs=False, check_local_backups=False
+            )
+            stored_proof_ids = _unchecked_proof_ids(state)
+            if all(proof_id in stored_proof_ids for proof_id in proof_ids):
+                return stored_proof_ids
+            if time.monotonic() + delay > deadline:
+                return stored_proof_ids
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
 
     async def store_proofs(self, proofs: list[Proof]) -> None:
         """Make sure proofs are stored on Nostr.
@@ -1083,8 +1352,10 @@ class Wallet:
         if not proofs:
             return  # Nothing to store
 
-        backup_dir = Path.cwd() / "proof_backups"
-        backup_dir.mkdir(parents=True, exist_ok=True)
+        backup_dir = self._backup_dir
+        if not self._backup_dir_ready:
+            backup_dir.mkdir(parents=True, exist_ok=True)
+            self._backup_dir_ready = True
 
         timestamp = int(time.time())
         backup_file = backup_dir / f"proofs_{timestamp}_{secrets.token_hex(8)}.json"
@@ -1096,27 +1367,21 @@ class Wallet:
         }
 
         try:
-            with open(backup_file, "w") as f:
-                json.dump(backup_data, f, indent=2)
+            # Compact bytes: the backup is only ever read back by the wallet
+            backup_file.write_bytes(encode_json(backup_data))
+            self._backup_files_cache = None  # Don't rely on mtime granularity
         except Exception as e:
+            self._backup_dir_ready = False  # Recreate the directory next time
             print(f"Warning: Failed to create local backup: {e}")
 
         # Check which proofs are already stored
-        state = await self.fetch_wallet_state(
-            check_proofs=False, check_local_backups=False
-        )
-        existing_proofs = set()
-
-        for proof in state.proofs:
-            proof_id = f"{proof['secret']}:{proof['C']}"
-            existing_proofs.add(proof_id)
+        state = await self._fetch_wallet_state_cached()
+        existing_proofs = _unchecked_proof_ids(state)
 
         # Filter out already stored proofs
-        new_proofs = []
-        for proof in proofs:
-            proof_id = f"{proof['secret']}:{proof['C']}"
-            if proof_id not in existing_proofs:
-                new_proofs.append(proof)
+        new_proofs = [
+            p for p in proofs if f"{p['secret']}:{p['C']}" not in existing_proofs
+        ]
 
         if not new_proofs:
             return
@@ -1126,9 +1391,7 @@ class Wallet:
         for proof in new_proofs:
             mint_url = proof.get("mint", "")
             if mint_url:
-                if mint_url not in new_proofs_by_mint:
-                    new_proofs_by_mint[mint_url] = []
-                new_proofs_by_mint[mint_url].append(proof)
+                new_proofs_by_mint.setdefault(mint_url, []).append(proof)
 
         # Publish token events for each mint
         published_count = 0
@@ -1136,34 +1399,11 @@ class Wallet:
 
         for mint_url, mint_proofs in new_proofs_by_mint.items():
             try:
-                # Publish token event
-                event_id = await self.event_manager.publish_token_event(mint_proofs)
+                # Publish token event; relays that fail to store it are
+                # covered by the local backup and the recovery scan
+                await self.event_manager.publish_token_event(mint_proofs)
+                self._state_cache = None
                 published_count += len(mint_proofs)
-
-                # Verify event was published by fetching it
-                max_retries = 3
-                retry_delay = 1.0
-
-                for retry in range(max_retries):
-                    await asyncio.sleep(retry_delay)
-
-                    # Try to fetch the event we just published
-                    # Note: fetch_wallet_events doesn't support filtering by ID,
-                    # so we just trust the publish succeeded
-                    # In production, could implement a specific fetch by ID method
-                    await asyncio.sleep(retry_delay)
-
-                    # For now, assume successful after a delay
-                    if retry > 0:  # Give it at least one retry
-                        break
-
-                    retry_delay *= 2  # Exponential backoff
-                else:
-                    # Failed to verify after retries
-                    print(
-                        f"Warning: Could not verify token event {event_id} was published"
-                    )
-
             except Exception as e:
                 print(f"Error publishing proofs for mint {mint_url}: {e}")
                 failed_mints.append(mint_url)
@@ -1186,12 +1426,14 @@ class Wallet:
         """Background task to retry storing proofs."""
         max_retries = 5
         base_delay = 10.0  # Start with 10 second delay
+        stored_ids = {f"{p['secret']}:{p['C']}" for p in proofs}
 
         for retry in range(max_retries):
             await asyncio.sleep(base_delay * (2**retry))  # Exponential backoff
 
             try:
                 event_id = await self.event_manager.publish_token_event(proofs)
+                self._state_cache = None
                 print(event_id)
                 print(
                     f"✅ Successfully published proofs for {mint_url} on retry {retry + 1}"
@@ -1200,41 +1442,32 @@ class Wallet:
                 # Try to clean up backup file
                 try:
                     if backup_file.exists():
+                        # Log what is stored instead of rewriting the backup
+                        sidecar = _stored_sidecar(backup_file)
+                        with open(sidecar, "a") as f:
+                            f.write("".join(f"{pid}\n" for pid in stored_ids))
+                        stored_id_set = set(sidecar.read_text().split())
+
                         # Check if this was the last mint
-                        with open(backup_file, "r") as f:
-                            backup_data = json.load(f)
-
-                        # Remove successfully stored proofs from backup
-                        remaining_proofs = []
-                        stored_ids = set(f"{p['secret']}:{p['C']}" for p in proofs)
-
-                        for p in backup_data["proofs"]:
-                            if f"{p['secret']}:{p['C']}" not in stored_ids:
-                                remaining_proofs.append(p)
-
-                        if remaining_proofs:
-                            # Update backup with remaining proofs
-                            backup_data["proofs"] = remaining_proofs
-                            with open(backup_file, "w") as f:
-                                json.dump(backup_data, f, indent=2)
-                        else:
+                        backup_data = _read_backup(backup_file)
+                        all_in_log = all(
+                            f"{p['secret']}:{p['C']}" in stored_id_set
+                            for p in backup_data["proofs"]
+                        )
+
+                        if all_in_log:
                             # All proofs stored - verify one more time before deletion
                             # Fetch state to ensure proofs are really on relays
                             await asyncio.sleep(2.0)  # Give relays time to propagate
                             try:
-                                state = await self.fetch_wallet_state(
-                                    check_proofs=False, check_local_backups=False
-                                )
-                                stored_proof_ids = set(
+                                state = await self._fetch_wallet_state_cached()
+                                stored_proof_ids = {
                                     f"{p['secret']}:{p['C']}" for p in state.proofs
-                                )
-                                all_stored = all(
-                                    f"{p['secret']}:{p['C']}" in stored_proof_ids
-                                    for p in proofs
-                                )
+                                }
+                                all_stored = stored_proof_ids.issuperset(stored_ids)
 
                                 if all_stored:
-                                    backup_file.unlink()
+                                    _delete_backup(backup_file)
                                     print(
                                         f"    🗑️  Verified and deleted backup: {backup_file.name}"
                                     )
@@ -1274,14 +1507,14 @@ class Wallet:
         ):
             raise WalletError("Proofs must be from the same mint for transfer")
 
-        source_mint = Mint(source_mint_url)
+        source_mint = self._get_mint(source_mint_url)
 
         # Get the total amount in the source mint's native unit
         total_amount_source_unit = sum(p["amount"] for p in proofs)
         source_unit = proofs[0].get("unit", "sat")
 
         # Convert to sats for estimation
-        total_amount_sats = await sats_value_of_proofs(proofs)
+        total_amount_sats = await sats_value_of_proofs(proofs, self._get_mint)
         if total_amount_sats == 0:
             return 0, "sat"
 
@@ -1389,66 +1622,78 @@ class Wallet:
         to_mint: str,
         from_mint: str | None = None,
         target_unit: CurrencyUnit | None = None,
-        exclude_mints: list[str] = [],
+        exclude_mints: Iterable[str] = (),
     ) -> tuple[int, CurrencyUnit]:
+        # One checked state serves every hop; drained mints are dropped from it
         state = await self.fetch_wallet_state(check_proofs=True)
-
-        if not from_mint:
-            mint_sats_balances: dict[str, int] = {}
-            normalized_to_mint = normalize_mint_url(to_mint)
-            normalized_excludes = [normalize_mint_url(m) for m in exclude_mints]
-
-            for mint in set(
-                normalize_mint_url(p.get("mint", ""))
-                for p in state.proofs
-                if p.get("mint")
-            ):
-                if mint in normalized_excludes or mint == normalized_to_mint:
-                    continue
-                mint_proofs = [
-                    p
-                    for p in state.proofs
-                    if normalize_mint_url(p.get("mint", "")) == mint
-                ]
-                mint_sats = await sats_value_of_proofs(mint_proofs)
-                if mint_sats > 0:
-                    mint_sats_balances[mint] = mint_sats
-            if not mint_sats_balances:
-                raise WalletError("No source mints with balance available")
-            from_mint = max(mint_sats_balances, key=lambda k: mint_sats_balances[k])
-
-        proofs_from_mint = [
-            p
-            for p in state.proofs
-            if normalize_mint_url(p.get("mint", "")) == normalize_mint_url(from_mint)
-        ]
-        total_sats_from_mint = await sats_value_of_proofs(proofs_from_mint)
-        transfer_sats = min(amount_sats, total_sats_from_mint)
-        if transfer_sats <= 0:
-            raise WalletError(
-                f"Insufficient balance. Need at least {amount_sats}, but have 0 in available mints"
-            )
+        # Mints never used as a source: the caller's excludes and the target
+        excluded = {normalize_mint_url(m) for m in exclude_mints}
+        excluded.add(normalize_mint_url(to_mint))
         if not target_unit:
             target_unit = "sat"
 
-        invoice, async_task = await self.mint_async(
-            transfer_sats, mint_url=to_mint, unit=target_unit
-        )
-
-        await self.melt(invoice, target_mint=from_mint)
+        proofs_by_mint: dict[str, list[Proof]] = {}
+        for p in state.proofs:
+            if p.get("mint"):
+                proofs_by_mint.setdefault(normalize_mint_url(p["mint"]), []).append(p)
+        mint_sats_balances: dict[str, int] | None = None
+
+        remaining = amount_sats
+        while remaining > 0:
+            if not from_mint:
+                if mint_sats_balances is None:
+                    candidate_mints = [
+                        mint for mint in proofs_by_mint if mint not in excluded
+                    ]
+                    # Value every candidate mint at once; non-sat units need a
+                    # rate fetch
+                    mint_sats_values = await asyncio.gather(
+                        *(
+                            sats_value_of_proofs(proofs_by_mint[mint], self._get_mint)
+                            for mint in candidate_mints
+                        )
+                    )
+                    mint_sats_balances = {
+                        mint: mint_sats
+                        for mint, mint_sats in zip(candidate_mints, mint_sats_values)
+                        if mint_sats > 0
+                    }
+                if not mint_sats_balances:
+                    raise WalletError("No source mints with balance available")
+                from_mint = max(mint_sats_balances, key=mint_sats_balances.__getitem__)
 
-        await async_task
+            source_mint = normalize_mint_url(from_mint)
+            if mint_sats_balances is not None and source_mint in mint_sats_balances:
+                total_sats_from_mint = mint_sats_balances.pop(source_mint)
+            else:
+                total_sats_from_mint = await sats_value_of_proofs(
+                    proofs_by_mint.get(source_mint, []), self._get_mint
+                )
+            transfer_sats = min(remaining, total_sats_from_mint)
+            if transfer_sats <= 0:
+                raise WalletError(
+                    f"Insufficient balance. Need at least {remaining}, but have 0 in available mints"
+                )
 
-        remaining = amount_sats - transfer_sats
-        if remaining > 0:
-            await self.transfer_balance_to_mint(
-                remaining,
-                to_mint=to_mint,
-                from_mint=None,
-                target_unit=target_unit,
-                exclude_mints=cast(list[str], exclude_mints + [from_mint]),
+            invoice, async_task = await self.mint_async(
+                transfer_sats, mint_url=to_mint, unit=target_unit
             )
 
+            await self.melt(invoice, target_mint=from_mint, state=state)
+
+            await async_task
+
+            # The source mint is drained for this transfer; never pick it again
+            remaining -= transfer_sats
+            excluded.add(source_mint)
+            proofs_by_mint.pop(source_mint, None)
+            state.proofs = [
+                p
+                for p in state.proofs
+                if normalize_mint_url(p.get("mint", "")) != source_mint
+            ]
+            from_mint = None
+
         return amount_sats, target_unit
 
     # ───────────────────────── Helper Methods ─────────────────────────────────
@@ -1458,7 +1703,7 @@ class Wallet:
         # Normalize URL to handle trailing slashes
         normalized_url = normalize_mint_url(mint_url)
         if normalized_url not in self.mints:
-            self.mints[normalized_url] = Mint(normalized_url)
+            self.mints[normalized_url] = Mint(normalized_url, client=self.mint_client)
         return self.mints[normalized_url]
 
     def _serialize_proofs_for_token(
@@ -1481,16 +1726,15 @@ class Wallet:
     ) -> str:
         """Serialize proofs into CashuA (V3) token format."""
         # Proofs are already stored with hex secrets internally
-        token_proofs = []
-        for proof in proofs:
-            token_proofs.append(
-                {
-                    "id": proof["id"],
-                    "amount": proof["amount"],
-                    "secret": proof["secret"],  # Already hex
-                    "C": proof["C"],
-                }
-            )
+        token_proofs = [
+            {
+                "id": proof["id"],
+                "amount": proof["amount"],
+                "secret": proof["secret"],  # Already hex
+                "C": proof["C"],
+            }
+            for proof in proofs
+        ]
 
         # CashuA token format: cashuA<base64url(json)>
         token_data = {
@@ -1498,49 +1742,35 @@ class Wallet:
             "unit": currency,
             "memo": "NIP-60 wallet transfer",
         }
-        json_str = json.dumps(token_data, separators=(",", ":"))
-        encoded = base64.urlsafe_b64encode(json_str.encode()).decode().rstrip("=")
-        return f"cashuA{encoded}"
+        # Strip padding while still in bytes; ASCII decode is a plain copy
+        encoded = base64.urlsafe_b64encode(encode_json(token_data)).rstrip(b"=")
+        return "cashuA" + encoded.decode("ascii")
 
     def _serialize_proofs_v4(
         self, proofs: list[Proof], mint_url: str, currency: CurrencyUnit
     ) -> str:
         """Serialize proofs into CashuB (V4) token format using CBOR."""
-        if cbor2 is None:
+        if cbor_dumps is None:
             raise ImportError("cbor2 library required for CashuB (V4) tokens")
 
-        # Group proofs by keyset ID for V4 format
-        proofs_by_keyset: dict[str, list[Proof]] = {}
+        # Group proofs by keyset ID, converting to V4 format in the same pass
+        fromhex = bytes.fromhex
+        v4_proofs_by_keyset: dict[str, list[dict]] = {}
         for proof in proofs:
-            keyset_id = proof["id"]
-            if keyset_id not in proofs_by_keyset:
-                proofs_by_keyset[keyset_id] = []
-            proofs_by_keyset[keyset_id].append(proof)
-
-        # Build V4 token structure
-        tokens = []
-        for keyset_id, keyset_proofs in proofs_by_keyset.items():
-            # Convert keyset ID from hex string to bytes
-            keyset_id_bytes = bytes.fromhex(keyset_id)
-
-            # Convert proofs to V4 format
-            v4_proofs = []
-            for proof in keyset_proofs:
-                v4_proofs.append(
-                    {
-                        "a": proof["amount"],  # amount
-                        "s": proof["secret"],  # secret (already hex string)
-                        "c": bytes.fromhex(proof["C"]),  # C as bytes
-                    }
-                )
-
-            tokens.append(
+            v4_proofs_by_keyset.setdefault(proof["id"], []).append(
                 {
-                    "i": keyset_id_bytes,  # keyset id as bytes
-                    "p": v4_proofs,  # proofs array
+                    "a": proof["amount"],  # amount
+                    "s": proof["secret"],  # secret (already hex string)
+                    "c": fromhex(proof["C"]),  # C as bytes
                 }
             )
 
+        # Build V4 token structure: keyset id as bytes plus its proofs array
+        tokens = [
+            {"i": fromhex(keyset_id), "p": v4_proofs}
+            for keyset_id, v4_proofs in v4_proofs_by_keyset.items()
+        ]
+
         # CashuB token structure
         token_data = {
             "m": mint_url,  # mint URL
@@ -1549,92 +1779,83 @@ class Wallet:
         }
 
         # Encode with CBOR and base64url
-        cbor_bytes = cbor2.dumps(token_data)
-        encoded = base64.urlsafe_b64encode(cbor_bytes).decode().rstrip("=")
-        return f"cashuB{encoded}"
+        cbor_bytes = cbor_dumps(token_data)
+        encoded = base64.urlsafe_b64encode(cbor_bytes).rstrip(b"=")
+        return "cashuB" + encoded.decode("ascii")
 
     def _parse_cashu_token(self, token: str) -> tuple[str, CurrencyUnit, list[Proof]]:
         """Parse Cashu token and return (mint_url, unit, proofs)."""
+        # Check token version once and hand the payload to its parser
+        prefix = token[:6]
+        if prefix == "cashuA":
+            return self._parse_token_v3(token[6:])
+        if prefix == "cashuB":
+            return self._parse_token_v4(token[6:])
         if not token.startswith("cashu"):
             raise ValueError("Invalid token format")
+        raise ValueError(f"Unknown token version: {token[:7]}")
+
+    def _parse_token_v3(self, encoded: str) -> tuple[str, CurrencyUnit, list[Proof]]:
+        """Parse the base64url JSON payload of a CashuA (V3) token."""
+        # Add correct padding – (-len) % 4 equals 0,1,2,3
+        encoded += "=" * ((-len(encoded)) % 4)
+
+        token_data = decode_json(base64.urlsafe_b64decode(encoded))
+
+        # Extract mint and proofs from JSON format
+        mint_info = token_data["token"][0]
+        # Safely get unit, defaulting to "sat" if not present (as per Cashu V3 common practice)
+        token_unit = cast(CurrencyUnit, token_data.get("unit", "sat"))
+
+        # Normalize mint URL
+        normalized_mint = normalize_mint_url(mint_info["mint"])
+
+        # Return proofs with hex secrets (standard Cashu format)
+        parsed_proofs = [
+            Proof(
+                id=proof["id"],
+                amount=proof["amount"],
+                secret=proof["secret"],  # Already hex in Cashu tokens
+                C=proof["C"],
+                mint=normalized_mint,
+                unit=token_unit,
+            )
+            for proof in mint_info["proofs"]
+        ]
+        return normalized_mint, token_unit, parsed_proofs
 
-        # Check token version
-        if token.startswith("cashuA"):
-            # Version 3 - JSON format
-            encoded = token[6:]  # Remove "cashuA"
-            # Add correct padding – (-len) % 4 equals 0,1,2,3
-            encoded += "=" * ((-len(encoded)) % 4)
+    def _parse_token_v4(self, encoded: str) -> tuple[str, CurrencyUnit, list[Proof]]:
+        """Parse the base64url CBOR payload of a CashuB (V4) token."""
+        if cbor_loads is None:
+            raise ImportError("cbor2 library required for cashuB tokens")
 
-            decoded = base64.urlsafe_b64decode(encoded).decode()
-            token_data = json.loads(decoded)
+        # Add padding for base64
+        encoded += "=" * ((-len(encoded)) % 4)
 
-            # Extract mint and proofs from JSON format
-            mint_info = token_data["token"][0]
-            # Safely get unit, defaulting to "sat" if not present (as per Cashu V3 common practice)
-            unit_str = token_data.get("unit", "sat")
-            # Cast to CurrencyUnit - validate it's a known unit
-            token_unit: CurrencyUnit = cast(CurrencyUnit, unit_str)
-            token_proofs = mint_info["proofs"]
+        token_data = cbor_loads(base64.urlsafe_b64decode(encoded))
 
-            # Normalize mint URL
-            normalized_mint = normalize_mint_url(mint_info["mint"])
+        # Extract from CBOR format - different structure
+        # 'm' = mint URL, 'u' = unit, 't' = tokens array
+        mint_url = normalize_mint_url(token_data["m"])
+        cbor_unit = cast(CurrencyUnit, token_data["u"])
 
-            # Return proofs with hex secrets (standard Cashu format)
-            parsed_proofs: list[Proof] = []
-            for proof in token_proofs:
-                parsed_proofs.append(
-                    Proof(
-                        id=proof["id"],
-                        amount=proof["amount"],
-                        secret=proof["secret"],  # Already hex in Cashu tokens
-                        C=proof["C"],
-                        mint=normalized_mint,
-                        unit=token_unit,
-                    )
+        # Each token in 't' has 'i' (keyset id) and 'p' (proofs); CBOR proofs
+        # carry a hex secret and C as raw bytes
+        proofs: list[Proof] = []
+        for token_entry in token_data["t"]:
+            keyset_id = token_entry["i"].hex()
+            proofs.extend(
+                Proof(
+                    id=keyset_id,
+                    amount=proof["a"],
+                    secret=proof["s"],
+                    C=proof["c"].hex(),
+                    mint=mint_url,
+                    unit=cbor_unit,
                 )
-
-            return normalized_mint, token_unit, parsed_proofs
-
-        elif token.startswith("cashuB"):
-            # Version 4 - CBOR format
-            if cbor2 is None:
-                raise ImportError("cbor2 library required for cashuB tokens")
-
-            encoded = token[6:]  # Remove "cashuB"
-            # Add padding for base64
-            encoded += "=" * ((-len(encoded)) % 4)
-
-            decoded_bytes = base64.urlsafe_b64decode(encoded)
-            token_data = cbor2.loads(decoded_bytes)
-
-            # Extract from CBOR format - different structure
-            # 'm' = mint URL, 'u' = unit, 't' = tokens array
-            mint_url = normalize_mint_url(token_data["m"])
-            unit_str = token_data["u"]
-            # Cast to CurrencyUnit
-            cbor_unit: CurrencyUnit = cast(CurrencyUnit, unit_str)
-            proofs = []
-
-            # Each token in 't' has 'i' (keyset id) and 'p' (proofs)
-            for token_entry in token_data["t"]:
-                keyset_id = token_entry["i"].hex()  # Convert bytes to hex
-                for proof in token_entry["p"]:
-                    # CBOR format already has hex secret
-                    # Convert CBOR proof format to our Proof format
-                    proofs.append(
-                        Proof(
-                            id=keyset_id,
-                            amount=proof["a"],
-                            secret=proof["s"],  # Already hex in CBOR format
-                            C=proof["c"].hex(),  # Convert bytes to hex
-                            mint=mint_url,
-                            unit=cbor_unit,
-                        )
-                    )
-
-            return mint_url, cbor_unit, proofs
-        else:
-            raise ValueError(f"Unknown token version: {token[:7]}")
+                for proof in token_entry["p"]
+            )
+        return mint_url, cbor_unit, proofs
 
     def raise_if_insufficient_balance(self, balance: int, amount: int) -> None:
         if balance < amount:
@@ -1653,62 +1874,60 @@ class Wallet:
         Returns:
             List of Y values (hex encoded compressed public keys)
         """
-        y_values = []
-        for proof in proofs:
-            secret_hex = proof["secret"]  # Already hex internally
+        return [_y_for_secret(p["secret"]) for p in proofs]
 
-            # Hash to curve point using UTF-8 bytes of hex string (Cashu standard)
-            secret_utf8_bytes = secret_hex.encode("utf-8")
-            Y = hash_to_curve(secret_utf8_bytes)
-            # Convert to compressed hex format
-            y_hex = Y.format(compressed=True).hex()
-            y_values.append(y_hex)
-        return y_values
-
-    def _is_proof_state_cached(self, proof_id: str) -> tuple[bool, str | None]:
+    def _is_proof_state_cached(self, proof: Proof) -> tuple[bool, str | None]:
         """Check if proof state is cached and still valid."""
-        if proof_id in self._proof_state_cache:
-            cache_entry = self._proof_state_cache[proof_id]
-            timestamp = float(cache_entry.get("timestamp", 0))
-            if time.time() - timestamp < self._cache_expiry:
-                return True, cache_entry.get("state")
+        cache_entry = self._proof_state_cache.get(proof["C"])
+        if (
+            cache_entry is not None
+            and time.monotonic() - cache_entry[1] < self._cache_expiry
+        ):
+            return True, cache_entry[0]
         return False, None
 
-    def _cache_proof_state(self, proof_id: str, state: str) -> None:
+    def _cache_proof_state(self, proof: Proof, state: str) -> None:
         """Cache proof state with timestamp."""
-        self._proof_state_cache[proof_id] = {
-            "state": state,
-            "timestamp": str(time.time()),
-        }
+        self._proof_state_cache[proof["C"]] = (state, time.monotonic())
 
         # Track spent proofs separately for faster lookup
         if state == "SPENT":
-            self._known_spent_proofs.add(proof_id)
+            self._known_spent_proofs.add(proof["C"])
 
     def clear_spent_proof_cache(self) -> None:
         """Clear the spent proof cache to prevent memory growth."""
         self._proof_state_cache.clear()
         self._known_spent_proofs.clear()
+        _y_for_secret.cache_clear()
 
     async def _validate_proofs_with_cache(self, proofs: list[Proof]) -> list[Proof]:
-        """Validate proofs using cache to avoid re-checking spent proofs."""
+        """Validate proofs using cache to avoid re-checking spent proofs.
+
+        Cache misses are checked with a single batched check_state request per
+        mint, with all mints queried concurrently.
+        """
         valid_proofs = []
         proofs_to_check: list[Proof] = []
+        # Repeats of a proof already queued follow that proof's result
+        queued_cs: set[str] = set()
+        repeated_proofs: list[Proof] = []
 
         # First pass: check cache and filter out known spent proofs
+        known_spent = self._known_spent_proofs
         for proof in proofs:
-            proof_id = f"{proof['secret']}:{proof['C']}"
-
             # Skip known spent proofs immediately
-            if proof_id in self._known_spent_proofs:
+            if proof["C"] in known_spent:
                 continue
 
-            is_cached, cached_state = self._is_proof_state_cached(proof_id)
+            is_cached, cached_state = self._is_proof_state_cached(proof)
             if is_cached:
                 if cached_state == "UNSPENT":
                     valid_proofs.append(proof)
                 # SPENT proofs are filtered out (don't add to valid_proofs)
+            elif proof["C"] in queued_cs:
+                repeated_proofs.append(proof)
             else:
+                queued_cs.add(proof["C"])
                 proofs_to_check.append(proof)
 
         if proofs_to_check:
@@ -1719,18 +1938,15 @@ class Wallet:
                 try:
                     mint = self._get_mint(mint_url)
                     y_values = self._compute_proof_y_values(mint_proofs)
-                    state_response = await mint.check_state(Ys=y_values)
+                    states = (await mint.check_state(Ys=y_values))["states"]
                     result: list[Proof] = []
-                    for i, proof in enumerate(mint_proofs):
-                        proof_id = f"{proof['secret']}:{proof['C']}"
-                        if i < len(state_response["states"]):
-                            state_info = state_response["states"][i]
-                            state = state_info.get("state", "UNKNOWN")
-                            self._cache_proof_state(proof_id, state)
-                            if state == "UNSPENT":
-                                result.append(proof)
-                        else:
+                    for proof, state_info in zip(mint_proofs, states):
+                        state = state_info.get("state", "UNKNOWN")
+                        self._cache_proof_state(proof, state)
+                        if state == "UNSPENT":
                             result.append(proof)
+                    # Keep proofs the mint did not report a state for
+                    result.extend(mint_proofs[len(states) :])
                     return result
                 except Exception:
                     return mint_proofs
@@ -1744,8 +1960,70 @@ class Wallet:
             for valid in results:
                 valid_proofs.extend(valid)
 
+            if repeated_proofs:
+                valid_cs = {proof["C"] for valid in results for proof in valid}
+                valid_proofs.extend(p for p in repeated_proofs if p["C"] in valid_cs)
+
         return valid_proofs
 
+    def _decrypt_event_content(self, event: NostrEvent) -> Any:
+        """Decrypt and parse an event's NIP-44 JSON content, cached by event id."""
+        cache = self._event_content_cache
+        event_id = event["id"]
+        if event_id in cache:
+            cache.move_to_end(event_id)
+            return cache[event_id]
+        content = decode_json(nip44_decrypt(event["content"], self._privkey))
+        cache[event_id] = content
+        if len(cache) > self._event_content_cache_size:
+            cache.popitem(last=False)
+        return content
+
+    @staticmethod
+    def _ingest_proofs(
+        proofs: list[dict[str, Any]],
+        mint_url: str,
+        event_id: str,
+        all_proofs: list[Proof],
+        proof_to_event_id: dict[str, str],
+    ) -> list[Proof]:
+        """Convert NIP-60 proofs to internal proofs, skipping ones already seen.
+
+        ``proof_to_event_id`` holds every proof id ingested so far, so it also
+        serves as the seen set. Returns the proofs newly added to ``all_proofs``.
+        """
+        ingested: list[Proof] = []
+        all_append = all_proofs.append
+        ingested_append = ingested.append
+        intern = sys.intern
+
+        for proof in proofs:
+            # Convert from NIP-60 format (base64) to internal format (hex)
+            # NIP-60 stores secrets as base64, but internally we use hex
+            hex_secret = _nip60_secret_to_hex(proof["secret"])
+
+            proof_id = f"{hex_secret}:{proof['C']}"
+            if proof_id in proof_to_event_id:
+                continue
+
+            # Get unit from proof if available, otherwise default to "sat"
+            proof_unit = cast(
+                CurrencyUnit, intern(proof.get("unit", proof.get("u", "sat")))
+            )
+            proof_with_mint: Proof = Proof(
+                id=proof["id"],
+                amount=proof["amount"],
+                secret=hex_secret,  # Store as hex internally
+                C=proof["C"],
+                mint=mint_url,
+                unit=proof_unit,
+            )
+            all_append(proof_with_mint)
+            ingested_append(proof_with_mint)
+            proof_to_event_id[proof_id] = event_id
+
+        return ingested
+
     async def fetch_wallet_state(
         self, *, check_proofs: bool = True, check_local_backups: bool = True
     ) -> WalletState:
@@ -1764,19 +2042,31 @@ class Wallet:
             get_pubkey(self._privkey)
         )
 
-        # Find the newest wallet event (replaceable events should use latest timestamp)
-        wallet_events = [e for e in all_events if e["kind"] == EventKind.Wallet]
-        wallet_event = None
-        if wallet_events:
-            # Sort by created_at timestamp and take the newest
-            wallet_event = max(wallet_events, key=lambda e: e["created_at"])
+        # Split events by kind in a single pass, tracking deleted token events
+        # and the newest wallet event (replaceable events use latest timestamp)
+        wallet_event: NostrEvent | None = None
+        token_events: list[NostrEvent] = []
+        deleted_ids: set[str] = set()
+        for event in all_events:
+            kind = event["kind"]
+            if kind == EventKind.Token:
+                token_events.append(event)
+            elif kind == EventKind.Wallet:
+                if (
+                    wallet_event is None
+                    or event["created_at"] > wallet_event["created_at"]
+                ):
+                    wallet_event = event
+            elif kind == EventKind.Delete:
+                for tag in event["tags"]:
+                    if tag[0] == "e":
+                        deleted_ids.add(tag[1])
 
         # Parse wallet metadata
         # TODO this should not always fetch the wallet event
         if wallet_event:
             try:
-                decrypted = nip44_decrypt(wallet_event["content"], self._privkey)
-                wallet_data = json.loads(decrypted)
+                wallet_data = self._decrypt_event_content(wallet_event)
 
                 # Parse wallet event data
                 event_mint_urls = []
@@ -1800,36 +2090,24 @@ class Wallet:
                 # Skip wallet event if it can't be decrypted
                 print(f"Warning: Could not decrypt wallet event: {e}")
 
-        # Collect token events
-        token_events = [e for e in all_events if e["kind"] == EventKind.Token]
-
-        # Track deleted token events
-        deleted_ids = set()
-        for event in all_events:
-            if event["kind"] == EventKind.Delete:
-                for tag in event["tags"]:
-                    if tag[0] == "e":
-                        deleted_ids.add(tag[1])
-
         # Aggregate unspent proofs taking into account NIP-60 roll-overs and avoiding duplicates
         all_proofs: list[Proof] = []
         proof_to_event_id: dict[str, str] = {}
+        proofs_by_event: dict[str, list[Proof]] = {}
 
         # Index events newest → oldest so that when we encounter a replacement first we can ignore the ones it deletes later
-        token_events_sorted = sorted(
-            token_events, key=lambda e: e["created_at"], reverse=True
-        )
+        # (in place: token_events is our own list, and nothing else reads it)
+        token_events.sort(key=itemgetter("created_at"), reverse=True)
 
         invalid_token_ids: set[str] = set(deleted_ids)
-        proof_seen: set[str] = set()
+        dropped_proof_ids: set[str] = set()
 
-        for event in token_events_sorted:
+        for event in token_events:
             if event["id"] in invalid_token_ids:
                 continue
 
             try:
-                decrypted = nip44_decrypt(event["content"], self._privkey)
-                token_data = json.loads(decrypted)
+                token_data = self._decrypt_event_content(event)
             except Exception:
                 # Skip this event if it can't be decrypted - likely from old key or corrupted
                 continue
@@ -1851,41 +2129,13 @@ class Wallet:
 
             # Normalize mint URL
             mint_url = normalize_mint_url(mint_url)
+            proofs_by_event[event["id"]] = self._ingest_proofs(
+                proofs, mint_url, event["id"], all_proofs, proof_to_event_id
+            )
 
-            for proof in proofs:
-                # Convert from NIP-60 format (base64) to internal format (hex)
-                # NIP-60 stores secrets as base64, but internally we use hex
-                secret = proof["secret"]
-                try:
-                    # Try to decode from base64 (NIP-60 format)
-                    secret_bytes = base64.b64decode(secret)
-                    hex_secret = secret_bytes.hex()
-                except Exception:
-                    # If it fails, assume it's already hex (backwards compatibility)
-                    hex_secret = secret
-
-                proof_id = f"{hex_secret}:{proof['C']}"
-                if proof_id in proof_seen:
-                    continue
-                proof_seen.add(proof_id)
-
-                # Add mint URL to proof with hex secret
-                # Get unit from proof if available, otherwise default to "sat"
-                proof_unit = cast(
-                    CurrencyUnit, proof.get("unit", proof.get("u", "sat"))
-                )
-                proof_with_mint: Proof = Proof(
-                    id=proof["id"],
-                    amount=proof["amount"],
-                    secret=hex_secret,  # Store as hex internally
-                    C=proof["C"],
-                    mint=mint_url,
-                    unit=proof_unit,
-                )
-                all_proofs.append(proof_with_mint)
-                proof_to_event_id[proof_id] = event["id"]
-
-        # Include pending proofs from relay manager
+        # Include pending proofs from relay manager. They are appended after all
+        # token proofs, so everything from this index on is pending.
+        pending_start = len(all_proofs)
         pending_token_data = self.relay_manager.get_pending_proofs()
 
         for token_data in pending_token_data:
@@ -1900,103 +2150,92 @@ class Wallet:
             if not isinstance(proofs, list):
                 continue
 
-            for proof in proofs:
-                # Convert from NIP-60 format (base64) to internal format (hex)
-                secret = proof["secret"]
-                try:
-                    # Try to decode from base64 (NIP-60 format)
-                    secret_bytes = base64.b64decode(secret)
-                    hex_secret = secret_bytes.hex()
-                except Exception:
-                    # If it fails, assume it's already hex
-                    hex_secret = secret
-
-                proof_id = f"{hex_secret}:{proof['C']}"
-                if proof_id in proof_seen:
-                    continue
-                proof_seen.add(proof_id)
-
-                # Get unit from proof if available, otherwise default to "sat"
-                proof_unit = cast(
-                    CurrencyUnit, proof.get("unit", proof.get("u", "sat"))
-                )
-
-                # Mark pending proofs with a special event ID
-                pending_proof_with_mint: Proof = Proof(
-                    id=proof["id"],
-                    amount=proof["amount"],
-                    secret=hex_secret,  # Store as hex internally
-                    C=proof["C"],
-                    mint=mint_url,
-                    unit=proof_unit,
-                )
-                all_proofs.append(pending_proof_with_mint)
-                proof_to_event_id[proof_id] = "__pending__"  # Special marker
+            # Mark pending proofs with a special event ID
+            self._ingest_proofs(
+                proofs,
+                mint_url,
+                "__pending__",
+                all_proofs,
+                proof_to_event_id,
+            )
 
         # Validate proofs using cache system if requested
         if check_proofs and all_proofs:
             # Don't validate pending proofs (they haven't been published yet)
-            non_pending_proofs = [
-                p
-                for p in all_proofs
-                if proof_to_event_id.get(f"{p['secret']}:{p['C']}", "") != "__pending__"
-            ]
-            pending_proofs = [
-                p
-                for p in all_proofs
-                if proof_to_event_id.get(f"{p['secret']}:{p['C']}", "") == "__pending__"
-            ]
+            non_pending_proofs = all_proofs[:pending_start]
+            pending_proofs = all_proofs[pending_start:]
+
+            # Validate only non-pending proofs, unless this exact set was just
+            # validated (e.g. balance polling)
+            fingerprint = frozenset(p["C"] for p in non_pending_proofs)
+            cached = self._validated_proofs_cache
+            if (
+                cached is not None
+                and cached[1] == fingerprint
+                and time.monotonic() - cached[0] < self._validated_proofs_ttl
+            ):
+                valid_cs = cached[2]
+                validated_proofs = [p for p in non_pending_proofs if p["C"] in valid_cs]
+            else:
+                validated_proofs = await self._validate_proofs_with_cache(
+                    non_pending_proofs
+                )
+                self._validated_proofs_cache = (
+                    time.monotonic(),
+                    fingerprint,
+                    frozenset(p["C"] for p in validated_proofs),
+                )
 
-            # Validate only non-pending proofs
-            validated_proofs = await self._validate_proofs_with_cache(
-                non_pending_proofs
-            )
+            # Remember which ingested ids were dropped as spent
+            if len(validated_proofs) != len(non_pending_proofs):
+                kept = {id(p) for p in validated_proofs}
+                dropped_proof_ids = {
+                    f"{p['secret']}:{p['C']}"
+                    for p in non_pending_proofs
+                    if id(p) not in kept
+                }
 
             # Add back pending proofs (assume they're valid)
             all_proofs = validated_proofs + pending_proofs
 
         # Check local backups for missing proofs if requested
         if check_local_backups:
-            backup_dir = Path.cwd() / "proof_backups"
-            if backup_dir.exists() and any(backup_dir.glob("proofs_*.json")):
+            backup_dir = self._backup_dir
+            backup_files = self._list_backup_files()
+            if backup_files:
                 # Check if we've recently checked backups (within last 60 seconds)
-                last_check_file = backup_dir / ".last_check"
-                should_check = True
-
-                try:
-                    if last_check_file.exists():
-                        last_check_time = float(last_check_file.read_text().strip())
-                        if time.time() - last_check_time < 60:
-                            should_check = False
-                except Exception:
-                    pass
+                # The timestamp file is only read once; later checks use memory
+                if self._last_backup_check is None:
+                    self._last_backup_check = 0.0
+                    try:
+                        last_check_file = backup_dir / ".last_check"
+                        self._last_backup_check = float(
+                            last_check_file.read_text().strip()
+                        )
+                    except Exception:
+                        pass
 
-                if not should_check:
+                if time.time() - self._last_backup_check < 60:
                     # Skip backup check if we just did it
                     return WalletState(
-                        proofs=all_proofs, proof_to_event_id=proof_to_event_id
+                        proofs=all_proofs,
+                        proof_to_event_id=proof_to_event_id,
+                        proofs_by_event=proofs_by_event,
                     )
-                # Check if we have any backup files with missing proofs
-                existing_proof_ids = set(f"{p['secret']}:{p['C']}" for p in all_proofs)
+                # Check if we have any backup files with missing proofs. The id
+                # index built during ingestion covers every kept proof unless
+                # validation dropped some (passed as the dict itself so
+                # set.difference can probe it without copying).
+                existing_proof_ids: set[str] | dict[str, str] = (
+                    set(proof_to_event_id).difference(dropped_proof_ids)
+                    if dropped_proof_ids
+                    else proof_to_event_id
+                )
 
                 # Quick scan to see if there might be missing proofs
-                has_missing = False
-                for backup_file in backup_dir.glob("proofs_*.json"):
-                    try:
-                        with open(backup_file, "r") as f:
-                            backup_data = json.load(f)
-                        backup_proofs = backup_data.get("proofs", [])
-
-                        for proof in backup_proofs:
-                            proof_id = f"{proof['secret']}:{proof['C']}"
-                            if proof_id not in existing_proof_ids:
-                                has_missing = True
-                                break
-                    except Exception:
-                        continue
-
-                    if has_missing:
-                        break
+                has_missing = await _backups_have_missing(
+                    backup_files, existing_proof_ids
+                )
 
                 # If we found missing proofs, run the recovery scan
                 if has_missing:
@@ -2006,9 +2245,10 @@ class Wallet:
                     )
 
                     # Update last check timestamp
+                    self._last_backup_check = time.time()
                     try:
                         last_check_file = backup_dir / ".last_check"
-                        last_check_file.write_text(str(time.time()))
+                        last_check_file.write_text(str(self._last_backup_check))
                     except Exception:
                         pass
 
@@ -2029,7 +2269,11 @@ class Wallet:
                         )
                         await self._cleanup_spent_proof_backups()
 
-        return WalletState(proofs=all_proofs, proof_to_event_id=proof_to_event_id)
+        return WalletState(
+            proofs=all_proofs,
+            proof_to_event_id=proof_to_event_id,
+            proofs_by_event=proofs_by_event,
+        )
 
     async def get_balance(
         self,
@@ -2076,13 +2320,22 @@ class Wallet:
         """Close underlying HTTP clients."""
         await self.mint_client.aclose()
 
-        # Close relay manager connections
-        await self.relay_manager.disconnect_all()
+        # Close relay manager connections (once no other wallet shares them)
+        await self.relay_manager.release()
 
         # Close mint clients
         for mint in self.mints.values():
             await mint.aclose()
 
+    def _acquire_relay_manager(self) -> RelayClient:
+        """Get the (possibly shared) relay client for this wallet's relays."""
+        return RelayClient.acquire(
+            relay_urls=self.relay_urls,  # May be empty initially
+            privkey=self._privkey,  # Already a PrivateKey object
+            use_queued_relays=True,
+            min_relay_interval=1.0,
+        )
+
     # ───────────────────────── Async context manager ──────────────────────────
 
     async def __aenter__(self) -> Wallet:
@@ -2095,8 +2348,12 @@ class Wallet:
                 self.relay_urls = await get_relays_for_wallet(
                     self._privkey, prompt_if_needed=True
                 )
-                # Update relay manager with discovered relays
-                self.relay_manager.relay_urls = self.relay_urls
+                # Switch to a client for the discovered relays; the current one
+                # may be shared, so its relays must not be changed in place
+                previous = self.relay_manager
+                self.relay_manager = self._acquire_relay_manager()
+                self.event_manager.relay_manager = self.relay_manager
+                await previous.release()
             except Exception:
                 # If relay discovery fails, continue with empty relays
                 # This allows offline operations
@@ -2156,25 +2413,26 @@ class Wallet:
             Total input fees for all proofs
         """
         try:
-            # Get keyset information from mint
+            # Get keyset information from mint (cached by the mint client)
             keysets = await mint.get_keysets_info()
-            keyset_fees = {}
 
-            # Build mapping of keyset_id -> input_fee_ppk
-            for keyset in keysets:
-                keyset_fees[keyset["id"]] = keyset.get("input_fee_ppk", 0)
+            # Build mapping of keyset_id -> input_fee_ppk, once per keyset list
+            cached = self._keyset_fees_cache.get(mint.url)
+            if cached is not None and cached[0] is keysets:
+                keyset_fees = cached[1]
+            else:
+                keyset_fees = {}
+                for keyset in keysets:
+                    # Ensure fee_rate is an integer (could be string from API)
+                    try:
+                        fee_rate = int(keyset.get("input_fee_ppk", 0))
+                    except (ValueError, TypeError):
+                        fee_rate = 0
+                    keyset_fees[keyset["id"]] = fee_rate
+                self._keyset_fees_cache[mint.url] = (keysets, keyset_fees)
 
             # Sum fees for each proof based on its keyset
-            sum_fees = 0
-            for proof in proofs:
-                keyset_id = proof["id"]
-                fee_rate = keyset_fees.get(keyset_id, 0)
-                # Ensure fee_rate is an integer (could be string from API)
-                try:
-                    fee_rate = int(fee_rate)
-                except (ValueError, TypeError):
-                    fee_rate = 0
-                sum_fees += fee_rate
+            sum_fees = sum(keyset_fees.get(proof["id"], 0) for proof in proofs)
 
             # Use ceiling division to round up fees (matches mint behavior)
             return (sum_fees + 999) // 1000
@@ -2218,15 +2476,15 @@ class Wallet:
             Amount in base units (e.g., cents for USD, satoshis for BTC)
         """
         # For fiat currencies, convert to cents (multiply by 100)
-        if unit in ["usd", "eur", "gbp", "cad", "chf", "aud", "jpy", "cny", "inr"]:
+        if unit in _FIAT_UNITS:
             return amount * 100
         # For crypto, most are already in base units
-        elif unit in ["sat", "msat"]:
+        elif unit in _SAT_UNITS:
             return amount
         elif unit == "btc":
             return amount * 100_000_000  # Convert BTC to satoshis
         # For stablecoins, typically use cents as well
-        elif unit in ["usdt", "usdc", "dai"]:
+        elif unit in _STABLECOIN_UNITS:
             return amount * 100
         else:
             # Default to no conversion for unknown units
@@ -2243,15 +2501,15 @@ class Wallet:
             Amount in user-friendly units (e.g., dollars for USD)
         """
         # For fiat currencies, convert from cents (divide by 100)
-        if unit in ["usd", "eur", "gbp", "cad", "chf", "aud", "jpy", "cny", "inr"]:
+        if unit in _FIAT_UNITS:
             return amount / 100
         # For crypto, most are already in user-friendly units
-        elif unit in ["sat", "msat"]:
+        elif unit in _SAT_UNITS:
             return float(amount)
         elif unit == "btc":
             return amount / 100_000_000  # Convert satoshis to BTC
         # For stablecoins, typically use cents as well
-        elif unit in ["usdt", "usdc", "dai"]:
+        elif unit in _STABLECOIN_UNITS:
             return amount / 100
         else:
             # Default to no conversion for unknown units
@@ -2266,27 +2524,31 @@ class Wallet:
         Returns:
             List of mint URLs that support the unit
         """
-        supporting_mints = []
 
-        for mint_url in self.mint_urls:
+        async def supports_unit(mint_url: str) -> bool:
             try:
                 mint = self._get_mint(mint_url)
                 keysets = await mint.get_keysets_info()
 
                 # Check if any keyset supports the requested unit
-                for keyset in keysets:
-                    if keyset.get("unit") == unit:
-                        supporting_mints.append(mint_url)
-                        break
+                return any(keyset.get("unit") == unit for keyset in keysets)
 
             except Exception as e:
                 # Only print error if it's not a connection error
                 error_msg = str(e).lower()
                 if "connection" not in error_msg and "timeout" not in error_msg:
                     print(f"Error checking mint {mint_url}: {e}")
-                continue
+                return False
 
-        return supporting_mints
+        # Query all mints concurrently, keeping the configured order
+        results = await asyncio.gather(
+            *(supports_unit(mint_url) for mint_url in self.mint_urls)
+        )
+        return [
+            mint_url
+            for mint_url, supported in zip(self.mint_urls, results)
+            if supported
+        ]
 
     def _validate_currency_unit(self, unit: CurrencyUnit) -> None:
         """Validate currency unit is supported per NUT-01.
@@ -2299,19 +2561,7 @@ class Wallet:
         """
         # Type checking ensures unit is valid CurrencyUnit at compile time
         # This method can be extended for runtime validation if needed
-        if unit not in [
-            "btc",
-            "sat",
-            "msat",
-            "usd",
-            "eur",
-            "gbp",
-            "jpy",
-            "auth",
-            "usdt",
-            "usdc",
-            "dai",
-        ]:
+        if unit not in _VALID_UNITS:
             raise ValueError(f"Unsupported currency unit: {unit}")
 
     # ───────────────────────── Public Helper Methods ──────────────────────────
@@ -2341,7 +2591,7 @@ class Wallet:
         """
         if not self.mint_urls:
             raise WalletError("No mint URLs configured")
-        return sorted(self.mint_urls)[0]  # Use sorted order for consistency
+        return min(self.mint_urls)  # First in sorted order, for consistency
 
     async def _select_mint_for_amount(
         self,
@@ -2446,43 +2696,60 @@ class Wallet:
         )
 
     def _sort_proofs_by_mint(self, proofs: list[Proof]) -> dict[str, list[Proof]]:
-        # Normalize mint URLs when grouping proofs
+        # Normalize mint URLs when grouping proofs, once per distinct URL
         normalized_mints: dict[str, list[Proof]] = {}
+        normalized_urls: dict[str, str] = {}
         for proof in proofs:
-            normalized_mint = normalize_mint_url(proof.get("mint", ""))
-            if normalized_mint not in normalized_mints:
-                normalized_mints[normalized_mint] = []
-            normalized_mints[normalized_mint].append(proof)
+            mint_url = proof.get("mint", "")
+            normalized_mint = normalized_urls.get(mint_url)
+            if normalized_mint is None:
+                normalized_mint = normalized_urls[mint_url] = normalize_mint_url(
+                    mint_url
+                )
+            normalized_mints.setdefault(normalized_mint, []).append(proof)
         return normalized_mints
 
+    def _list_backup_files(self) -> list[Path]:
+        """List proof backup files, rescanning only when the directory changed."""
+        try:
+            mtime = self._backup_dir.stat().st_mtime_ns
+        except OSError:
+            return []  # No backups written yet
+
+        cached = self._backup_files_cache
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, list(self._backup_dir.glob("proofs_*.json")))
+            self._backup_files_cache = cached
+        return list(cached[1])
+
     async def _cleanup_spent_proof_backups(self) -> int:
         """Clean up backup files that only contain spent/invalid proofs.
 
         Returns:
             Number of backup files cleaned up
         """
-        backup_dir = Path.cwd() / "proof_backups"
-        if not backup_dir.exists():
+        if not self._list_backup_files():
             return 0
 
         # Get current valid proofs and known spent proofs
         state = await self.fetch_wallet_state(
             check_proofs=False, check_local_backups=False
         )
-        valid_proof_ids = set(f"{p['secret']}:{p['C']}" for p in state.proofs)
+        valid_proof_ids = _unchecked_proof_ids(state)
 
         cleaned_count = 0
-        backup_files = list(backup_dir.glob("proofs_*.json"))
+        backup_files = self._list_backup_files()
 
-        for backup_file in backup_files:
+        loaded_backups = await _load_backups(backup_files)
+        for backup_file, backup_data in zip(backup_files, loaded_backups):
             try:
-                with open(backup_file, "r") as f:
-                    backup_data = json.load(f)
+                if isinstance(backup_data, BaseException):
+                    raise backup_data
 
                 backup_proofs = backup_data.get("proofs", [])
                 if not backup_proofs:
                     # Empty backup file, remove it
-                    backup_file.unlink()
+                    _delete_backup(backup_file)
                     cleaned_count += 1
                     print(f"   🗑️  Deleted empty backup: {backup_file.name}")
                     continue
@@ -2501,7 +2768,7 @@ class Wallet:
                     valid_proofs = await self._validate_proofs_with_cache(backup_proofs)
                     if not valid_proofs:
                         # Confirmed all proofs are spent/invalid
-                        backup_file.unlink()
+                        _delete_backup(backup_file)
                         cleaned_count += 1
                         print(
                             f"   🗑️  Deleted backup with only spent proofs: {backup_file.name}"
@@ -2540,7 +2807,7 @@ class Wallet:
             "failed": 0,
         }
 
-        backup_dir = Path.cwd() / "proof_backups"
+        backup_dir = self._backup_dir
         if not backup_dir.exists():
             return stats
 
@@ -2551,58 +2818,51 @@ class Wallet:
             state = await self.fetch_wallet_state(
                 check_proofs=False, check_local_backups=False
             )
-            existing_proofs = set()
-            for proof in state.proofs:
-                proof_id = f"{proof['secret']}:{proof['C']}"
-                existing_proofs.add(proof_id)
+            existing_proofs = _unchecked_proof_ids(state)
         except Exception as e:
             print(f"❌ Error fetching wallet state: {e}")
             return stats
 
         # Scan all backup files
-        backup_files = list(backup_dir.glob("proofs_*.json"))
-        all_backup_proofs: dict[str, Proof] = {}  # proof_id -> proof
-        backup_proofs_by_mint: dict[str, list[Proof]] = {}
+        backup_files = self._list_backup_files()
+        # Collect distinct backup proofs, noting those missing from Nostr
+        seen_backup_ids: set[str] = set()
+        missing_proofs: list[Proof] = []
+        # Proof ids per backup file (None if unreadable), for the verification
+        backup_proof_ids: list[list[str] | None] = []
 
-        for backup_file in backup_files:
+        loaded_backups = await _load_backups(backup_files)
+        for backup_file, backup_data in zip(backup_files, loaded_backups):
+            backup_proof_ids.append(None)
             try:
-                with open(backup_file, "r") as f:
-                    backup_data = json.load(f)
+                if isinstance(backup_data, BaseException):
+                    raise backup_data
 
                 proofs = backup_data.get("proofs", [])
-                for proof in proofs:
-                    proof_id = f"{proof['secret']}:{proof['C']}"
-                    if proof_id not in all_backup_proofs:
-                        all_backup_proofs[proof_id] = proof
-
-                        # Group by mint
-                        mint_url = proof.get("mint", "")
-                        if mint_url:
-                            if mint_url not in backup_proofs_by_mint:
-                                backup_proofs_by_mint[mint_url] = []
-                            backup_proofs_by_mint[mint_url].append(proof)
+                proof_ids = [f"{proof['secret']}:{proof['C']}" for proof in proofs]
+                backup_proof_ids[-1] = proof_ids
+                for proof_id, proof in zip(proof_ids, proofs):
+                    if proof_id in seen_backup_ids:
+                        continue
+                    seen_backup_ids.add(proof_id)
+                    if proof_id not in existing_proofs:
+                        missing_proofs.append(proof)
 
             except Exception as e:
                 print(f"⚠️  Error reading backup file {backup_file}: {e}")
 
-        # Find missing proofs
-        missing_proof_ids = set(all_backup_proofs.keys()) - existing_proofs
-        missing_proofs: list[Proof] = []
-
-        for proof_id in missing_proof_ids:
-            missing_proofs.append(all_backup_proofs[proof_id])
-
+        total_backup_proofs = len(seen_backup_ids)
         stats = {
             "total_backup_files": len(backup_files),
-            "total_proofs_in_backups": len(all_backup_proofs),
+            "total_proofs_in_backups": total_backup_proofs,
             "missing_from_nostr": len(missing_proofs),
             "recovered": 0,
             "failed": 0,
         }
 
         print(f"📊 Found {len(backup_files)} backup files")
-        print(f"   📦 Total proofs in backups: {len(all_backup_proofs)}")
-        print(f"   ✅ Already on Nostr: {len(all_backup_proofs) - len(missing_proofs)}")
+        print(f"   📦 Total proofs in backups: {total_backup_proofs}")
+        print(f"   ✅ Already on Nostr: {total_backup_proofs - len(missing_proofs)}")
         print(f"   ❌ Missing from Nostr: {len(missing_proofs)}")
 
         if not missing_proofs:
@@ -2636,79 +2896,93 @@ class Wallet:
         for proof in valid_missing_proofs:
             mint_url = proof.get("mint", "")
             if mint_url:
-                if mint_url not in missing_by_mint:
-                    missing_by_mint[mint_url] = []
-                missing_by_mint[mint_url].append(proof)
+                missing_by_mint.setdefault(mint_url, []).append(proof)
 
         # Publish missing proofs to Nostr
         print(f"\n📤 Publishing {len(valid_missing_proofs)} missing proofs to Nostr...")
 
-        for mint_url, mint_proofs in missing_by_mint.items():
+        async def recover_mint(
+            mint_url: str, mint_proofs: list[Proof]
+        ) -> tuple[int, int]:
+            """Publish one mint's missing proofs; returns (recovered, failed)."""
+            recovered = 0
             try:
                 event_id = await self.event_manager.publish_token_event(mint_proofs)
-                stats["recovered"] += len(mint_proofs)
+                self._state_cache = None
+                recovered = len(mint_proofs)
                 print(f"   ✅ Published {len(mint_proofs)} proofs for {mint_url}")
                 print(f"      Event ID: {event_id}")
 
                 # Also create spending history for recovery (group by unit)
-                # Group recovered proofs by unit
-                recovered_by_unit: dict[str, int] = {}
+                recovered_by_unit: Counter[str] = Counter()
                 for proof in mint_proofs:
-                    unit_str = str(proof.get("unit", "sat"))
-                    recovered_by_unit[unit_str] = (
-                        recovered_by_unit.get(unit_str, 0) + proof["amount"]
-                    )
-
-                # Create spending history for each unit
-                for recovery_unit, recovery_amount in recovered_by_unit.items():
-                    await self.event_manager.publish_spending_history(
-                        direction="in",
-                        amount=recovery_amount,
-                        unit=recovery_unit,
-                        created_token_ids=[event_id]
-                        if recovery_unit == list(recovered_by_unit.keys())[0]
-                        else None,
-                    )
+                    recovered_by_unit[str(proof.get("unit", "sat"))] += proof["amount"]
+
+                # One history entry per unit, published as a single batch; the
+                # first one references the new token event
+                await self.event_manager.publish_spending_histories(
+                    [
+                        {
+                            "direction": "in",
+                            "amount": recovery_amount,
+                            "unit": recovery_unit,
+                            "created_token_ids": [event_id] if i == 0 else None,
+                        }
+                        for i, (recovery_unit, recovery_amount) in enumerate(
+                            recovered_by_unit.items()
+                        )
+                    ]
+                )
+                return recovered, 0
 
             except Exception as e:
                 print(f"   ❌ Failed to publish proofs for {mint_url}: {e}")
-                stats["failed"] += len(mint_proofs)
+                return recovered, len(mint_proofs)
+
+        # Publish for all mints concurrently; the relay manager still spaces
+        # out the individual publishes
+        results = await asyncio.gather(
+            *(
+                recover_mint(mint_url, mint_proofs)
+                for mint_url, mint_proofs in missing_by_mint.items()
+            )
+        )
+        for recovered, failed in results:
+            stats["recovered"] += recovered
+            stats["failed"] += failed
 
         # Clean up successfully recovered backup files (with verification)
         if stats["recovered"] > 0 and stats["failed"] == 0:
             print("\n🔍 Verifying recovered proofs before cleaning up backups...")
 
-            # Re-fetch state to ensure all recovered proofs are really on relays
-            await asyncio.sleep(2.0)  # Give relays time to propagate
-
             try:
-                verification_state = await self.fetch_wallet_state(
-                    check_proofs=False, check_local_backups=False
-                )
-                stored_proof_ids = set(
-                    f"{p['secret']}:{p['C']}" for p in verification_state.proofs
+                # Re-fetch state until all recovered proofs are really on relays
+                stored_proof_ids = await self._wait_for_stored_proofs(
+                    [f"{p['secret']}:{p['C']}" for p in valid_missing_proofs]
                 )
+                known_spent = self._known_spent_proofs
 
-                # Check each backup file individually
-                for backup_file in backup_files:
+                # Check each backup file individually, reusing the contents and
+                # proof ids from the scan (backups are never rewritten)
+                verified_files: list[Path] = []
+                for backup_file, backup_data, file_proof_ids in zip(
+                    backup_files, loaded_backups, backup_proof_ids
+                ):
                     try:
-                        with open(backup_file, "r") as f:
-                            backup_data = json.load(f)
+                        if isinstance(backup_data, BaseException):
+                            raise backup_data
+                        if file_proof_ids is None:
+                            raise WalletError("malformed backup file")
 
                         backup_proofs = backup_data.get("proofs", [])
-                        all_verified = True
-
-                        for proof in backup_proofs:
-                            proof_id = f"{proof['secret']}:{proof['C']}"
-                            if proof_id not in stored_proof_ids:
-                                # Check if it's spent (which is okay)
-                                if proof_id not in self._known_spent_proofs:
-                                    all_verified = False
-                                    break
+                        # Proofs not found on Nostr are fine if they are spent
+                        all_verified = all(
+                            proof_id in stored_proof_ids or proof["C"] in known_spent
+                            for proof_id, proof in zip(file_proof_ids, backup_proofs)
+                        )
 
                         if all_verified:
-                            backup_file.unlink()
-                            print(f"   ✅ Verified and deleted: {backup_file.name}")
+                            verified_files.append(backup_file)
                         else:
                             print(
                                 f"   ⚠️  Keeping backup (not all proofs verified): {backup_file.name}"
@@ -2717,6 +2991,14 @@ class Wallet:
                     except Exception as e:
                         print(f"   ⚠️  Error processing {backup_file.name}: {e}")
 
+                # Delete all verified backups at once
+                deleted = await _delete_backups(verified_files)
+                for backup_file, error in zip(verified_files, deleted):
+                    if error is None:
+                        print(f"   ✅ Verified and deleted: {backup_file.name}")
+                    else:
+                        print(f"   ⚠️  Error processing {backup_file.name}: {error}")
+
             except Exception as e:
                 print(f"   ❌ Verification failed, keeping all backups: {e}")
 
@@ -2724,17 +3006,46 @@ class Wallet:
         return stats
 
 
-async def sats_value_of_proofs(proofs: list[Proof]) -> int:
-    """Get the total value of proofs in sats."""
+async def sats_value_of_proofs(
+    proofs: list[Proof], get_mint: Callable[[str], Mint] | None = None
+) -> int:
+    """Get the total value of proofs in sats.
+
+    Exchange rates are fetched once per distinct (mint, unit) pair, all
+    concurrently. Pass ``get_mint`` (e.g. ``Wallet._get_mint``) to reuse
+    long-lived Mint instances and their rate cache across calls.
+    """
     total_sats = 0
+    amounts_by_rate: dict[tuple[str, CurrencyUnit], list[int]] = {}
     for proof in proofs:
         if proof["unit"] == "sat":
             total_sats += proof["amount"]
         elif proof["unit"] == "msat":
             total_sats += proof["amount"] // 1000
         else:
-            exchange_rate = await Mint(proof["mint"]).mint_exchange_rate(proof["unit"])
-            total_sats += int(proof["amount"] * exchange_rate)
+            amounts_by_rate.setdefault((proof["mint"], proof["unit"]), []).append(
+                proof["amount"]
+            )
+    if not amounts_by_rate:
+        return total_sats
+
+    owned_mints: dict[str, Mint] = {}
+    if get_mint is None:
+        owned_mints = {mint_url: Mint(mint_url) for mint_url, _ in amounts_by_rate}
+        get_mint = owned_mints.__getitem__
+    try:
+        rates = await asyncio.gather(
+            *(
+                get_mint(mint_url).mint_exchange_rate(unit)
+                for mint_url, unit in amounts_by_rate
+            )
+        )
+    finally:
+        for mint in owned_mints.values():
+            await mint.aclose()
+
+    for amounts, exchange_rate in zip(amounts_by_rate.values(), rates):
+        total_sats += sum(int(amount * exchange_rate) for amount in amounts)
     return total_sats
 
 
@@ -2746,10 +3057,13 @@ async def sats_value_of_proofs(proofs: list[Proof]) -> int:
 def normalize_mint_url(url: str) -> str:
     """Normalize mint URL by removing trailing slashes.
 
+    The result is interned, so the thousands of proofs loaded from relay
+    events share a single string object per mint.
+
     Args:
         url: Mint URL to normalize
 
     Returns:
         Normalized URL without trailing slashes
     """
-    return url.rstrip("/")
+    return sys.intern(url.rstrip("/"))
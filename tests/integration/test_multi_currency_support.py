@@ -112,7 +112,9 @@ class TestMultiCurrencySupport:
 
         # Check initial state
         initial_state = await wallet.fetch_wallet_state(check_proofs=False)
-        initial_balance_by_unit: dict[CurrencyUnit, int] = initial_state.balance_by_unit
+        initial_balance_by_unit: dict[CurrencyUnit, int] = dict(
+            initial_state.balance_by_unit
+        )
         print(f"Initial balances by unit: {initial_balance_by_unit}")
 
         # Get available currencies
@@ -319,7 +321,7 @@ class TestMultiCurrencySupport:
 
         # Get current state
         initial_state = await wallet.fetch_wallet_state(check_proofs=True)
-        initial_balances: dict[CurrencyUnit, int] = initial_state.balance_by_unit.copy()
+        initial_balances: dict[CurrencyUnit, int] = dict(initial_state.balance_by_unit)
 
         # Create tokens in available currencies
         tokens_to_redeem: dict[str, tuple[str, int]] = {}
@@ -409,7 +411,7 @@ class TestMultiCurrencySupport:
 
         # Get current proofs grouped by keyset
         state = await wallet.fetch_wallet_state(check_proofs=True)
-        proofs_by_keyset: dict[str, list[Any]] = state.proofs_by_keyset
+        proofs_by_keyset: dict[str, list[Any]] = dict(state.proofs_by_keyset)
 
         print("\n  Current proofs by keyset:")
         for keyset_id, proofs in proofs_by_keyset.items():
@@ -2,7 +2,7 @@
 """Test hash_to_curve implementation against known test vectors."""
 
 import base64
-from sixty_nuts.crypto import hash_to_curve
+from sixty_nuts.crypto import hash_to_curve, hash_to_curve_batch
 
 
 def test_hash_to_curve():
@@ -40,5 +40,12 @@ def test_hash_to_curve():
     print(f"SHA256(DOMAIN_SEPARATOR || message): {msg_hash.hex()}")
 
 
+def test_hash_to_curve_batch_matches_single():
+    """Test that the batched variant yields the same compressed points."""
+    messages = [f"secret-{i}".encode() for i in range(50)] + [b"test_message"]
+    expected = [hash_to_curve(m).format(compressed=True) for m in messages]
+    assert hash_to_curve_batch(messages) == expected
+
+
 if __name__ == "__main__":
     test_hash_to_curve()
@@ -10,6 +10,7 @@ from sixty_nuts.mint import (
     InvalidKeysetError,
     BlindedMessage,
     CurrencyUnit,
+    create_mint_client,
 )
 
 
@@ -131,6 +132,37 @@ class TestMint:
         with pytest.raises(InvalidKeysetError, match="Invalid keyset at index 0"):
             await mint.get_active_keysets()
 
+    async def test_keysets_info_cached_until_keyset_error(
+        self, mint, mock_client
+    ) -> None:
+        """Test that keyset info is reused until the mint reports a keyset error."""
+        keysets_response = Mock()
+        keysets_response.status_code = 200
+        keysets_response.json.return_value = {
+            "keysets": [
+                {"id": "00ad268c4d1f5826", "unit": "sat", "active": True},
+            ]
+        }
+        mock_client.request.return_value = keysets_response
+        mint.client = mock_client
+
+        first = await mint.get_keysets_info()
+        second = await mint.get_keysets_info()
+        assert first == second
+        assert mock_client.request.call_count == 1
+
+        error_response = Mock()
+        error_response.status_code = 400
+        error_response.text = "keyset not known"
+        error_response.json.return_value = {"detail": "unknown", "code": 12001}
+        mock_client.request.return_value = error_response
+        with pytest.raises(MintError):
+            await mint.swap(inputs=[], outputs=[])
+
+        mock_client.request.return_value = keysets_response
+        await mint.get_keysets_info()
+        assert mock_client.request.call_count == 3
+
     async def test_validate_compressed_pubkey(self, mint) -> None:
         """Test compressed public key validation."""
         # Valid compressed pubkeys
@@ -329,6 +361,56 @@ async def test_mint_lifecycle() -> None:
     await mint.aclose()
 
 
+async def test_shared_client_not_closed_by_mint() -> None:
+    """Test that a mint leaves a shared client open for its owner."""
+    client = create_mint_client()
+    try:
+        mint = Mint("https://testnut.cashu.space/", client=client)
+        assert mint.client is client
+        await mint.aclose()
+        assert not client.is_closed
+    finally:
+        await client.aclose()
+    assert client.is_closed
+
+
+class TestDenominationSplit:
+    """Test denomination splitting."""
+
+    @staticmethod
+    def _greedy(amount: int, denominations: list[int]) -> dict[int, int]:
+        result: dict[int, int] = {}
+        for denom in sorted(denominations, reverse=True):
+            if amount >= denom:
+                result[denom], amount = divmod(amount, denom)
+        return result
+
+    def test_power_of_two_keyset_matches_greedy(self) -> None:
+        """Test the bit-decomposition path against the generic greedy split."""
+        ladder = [1 << i for i in range(11)]
+        for amount in [0, 1, 7, 100, 1023, 1024, 1025, 5000, 123456]:
+            split = Mint.calculate_optimal_split(amount, ladder)
+            assert split == self._greedy(amount, ladder)
+            assert list(split) == sorted(split, reverse=True)
+            assert sum(d * c for d, c in split.items()) == amount
+
+    def test_non_power_of_two_keyset(self) -> None:
+        """Test that other denomination sets still use the generic greedy split."""
+        assert Mint.calculate_optimal_split(17, [1, 5, 10]) == {10: 1, 5: 1, 1: 2}
+        # Remainder below the smallest denomination rounds up by one token
+        assert Mint.calculate_optimal_split(7, [2, 4]) == {4: 1, 2: 2}
+
+    def test_default_split(self) -> None:
+        """Test the fallback split when a keyset lists no denominations."""
+        assert Mint.calculate_optimal_split(40000, []) == {
+            16384: 2,
+            4096: 1,
+            2048: 1,
+            1024: 1,
+            64: 1,
+        }
+
+
 class TestNUT01Compliance:
     """Specific tests for NUT-01 specification compliance."""
 
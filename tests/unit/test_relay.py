@@ -1,10 +1,23 @@
 #!/usr/bin/env python3
 """Test Nostr Relay client."""
 
+import asyncio
 import pytest
 import json
+import websockets
 from unittest.mock import AsyncMock, MagicMock, patch
-from sixty_nuts.relay import Relay, RelayError, NostrEvent, NostrFilter
+from sixty_nuts import relay as relay_module
+from sixty_nuts.codec import encode_json
+from sixty_nuts.relay import (
+    EventQueue,
+    Relay,
+    RelayError,
+    NostrEvent,
+    NostrFilter,
+    QueuedEvent,
+    QueuedRelay,
+    RelayPool,
+)
 
 
 @pytest.fixture
@@ -57,6 +70,24 @@ class TestRelay:
             "wss://relay.test.com", ping_interval=20, ping_timeout=10, close_timeout=10
         )
 
+    @patch("sixty_nuts.relay.websockets.connect")
+    async def test_concurrent_connect_shares_attempt(self, mock_connect):
+        """Test that concurrent connect() calls open a single websocket."""
+        mock_ws = AsyncMock()
+        mock_ws.close_code = None
+
+        async def async_connect(*args, **kwargs):
+            await asyncio.sleep(0)
+            return mock_ws
+
+        mock_connect.side_effect = async_connect
+
+        relay = Relay("wss://relay.test.com")
+        await asyncio.gather(*(relay.connect() for _ in range(5)))
+
+        assert relay.ws is mock_ws
+        assert mock_connect.call_count == 1
+
     async def test_disconnect(self, relay, mock_websocket):
         """Test relay disconnection."""
         relay.ws = mock_websocket
@@ -77,16 +108,23 @@ class TestRelay:
 
         await relay._send(message)
 
-        mock_websocket.send.assert_called_once_with(json.dumps(message))
+        mock_websocket.send.assert_called_once()
+        sent_data = mock_websocket.send.call_args[0][0]
+        assert isinstance(sent_data, bytes)
+        assert json.loads(sent_data) == message
+        # Bytes payload must still go out as a text frame (NIP-01)
+        assert mock_websocket.send.call_args[1] == {"text": True}
 
     async def test_recv(self, relay, mock_websocket):
         """Test receiving messages."""
         relay.ws = mock_websocket
-        mock_websocket.recv.return_value = '["OK", "event_id", true]'
+        mock_websocket.recv.return_value = b'["OK", "event_id", true]'
 
         message = await relay._recv()
 
         assert message == ["OK", "event_id", True]
+        # Text frames are taken as raw bytes, skipping websockets' UTF-8 decode
+        mock_websocket.recv.assert_called_once_with(decode=False)
 
     @patch("sixty_nuts.relay.websockets.connect")
     async def test_publish_event(self, mock_connect, relay):
@@ -294,6 +332,327 @@ class TestRelay:
         assert "wss://relay1.com" in relays
         assert "wss://relay2.com" in relays
 
+    async def test_send_many(self, relay, mock_websocket):
+        """Test sending several messages back-to-back."""
+        relay.ws = mock_websocket
+        messages = [["EVENT", {"id": "a"}], ["EVENT", {"id": "b"}]]
+
+        await relay._send_many([json.dumps(m).encode() for m in messages])
+
+        sent = [json.loads(call[0][0]) for call in mock_websocket.send.call_args_list]
+        assert sent == messages
+
+    async def test_publish_events_pipelined(self, relay, mock_websocket):
+        """Test that all EVENTs are sent before OKs are collected."""
+        relay.ws = mock_websocket
+        events = [
+            NostrEvent(
+                id=f"event{i}",
+                pubkey="pubkey123",
+                created_at=1234567890,
+                kind=1,
+                tags=[],
+                content=f"Event {i}",
+                sig="sig123",
+            )
+            for i in range(3)
+        ]
+
+        # OKs arrive out of order, with one rejection
+        mock_websocket.recv.side_effect = [
+            json.dumps(["OK", "event2", True, ""]),
+            json.dumps(["NOTICE", "slow down"]),
+            json.dumps(["OK", "event0", True, ""]),
+            json.dumps(["OK", "event1", False, "blocked"]),
+        ]
+
+        results = await relay.publish_events(events)
+
+        assert results == {"event0": True, "event1": False, "event2": True}
+        assert mock_websocket.send.call_count == 3
+
+
+class TestQueuedRelay:
+    """Test cases for QueuedRelay batching."""
+
+    def test_chunk_batch_respects_byte_cap(self):
+        """Test that batches are split once the byte cap is reached."""
+        relay = QueuedRelay("wss://relay.test.com", max_batch_bytes=500)
+        batch = [
+            QueuedEvent(
+                event=NostrEvent(
+                    id=f"event{i}",
+                    pubkey="pubkey123",
+                    created_at=1234567890,
+                    kind=1,
+                    tags=[],
+                    content="x" * 100,
+                    sig="sig123",
+                )
+            )
+            for i in range(4)
+        ]
+
+        chunks = relay._chunk_batch(batch)
+
+        assert [len(chunk) for chunk in chunks] == [2, 2]
+        assert [q for chunk in chunks for q in chunk] == batch
+
+    def test_queued_event_frame_is_cached(self):
+        """Test that the serialized EVENT frame is computed once and reused."""
+        queued = QueuedEvent(
+            event=NostrEvent(
+                id="event123",
+                pubkey="pubkey123",
+                created_at=1234567890,
+                kind=1,
+                tags=[],
+                content="Test event",
+                sig="sig123",
+            )
+        )
+
+        frame = queued.encode()
+
+        assert json.loads(frame) == ["EVENT", queued.event]
+        assert queued.encode() is frame
+
+
+def _make_event(event_id: str) -> NostrEvent:
+    return NostrEvent(
+        id=event_id,
+        pubkey="pubkey123",
+        created_at=1234567890,
+        kind=1,
+        tags=[],
+        content="Test event",
+        sig="sig123",
+    )
+
+
+class TestEncodeEvent:
+    """Test cases for the fixed-layout EVENT encoder."""
+
+    def test_matches_generic_encoding(self):
+        """Test that the fast path yields the same JSON as the generic encoder."""
+        event = NostrEvent(
+            id="ab" * 32,
+            pubkey="cd" * 32,
+            created_at=1234567890,
+            kind=7375,
+            tags=[["e", "ef" * 32, "", "created"]],
+            content='quote " backslash \\ newline \n unicode \u00e9',
+            sig="01" * 64,
+        )
+
+        frame = relay_module._encode_event(event)
+
+        assert json.loads(frame) == ["EVENT", event]
+        assert frame == encode_json(["EVENT", event])
+
+    def test_unexpected_shape_falls_back(self):
+        """Test that non-hex ids or extra fields use the generic encoder."""
+        event = dict(_make_event('not"hex'))
+        assert json.loads(relay_module._encode_event(event)) == ["EVENT", event]
+
+        event = dict(_make_event("event1"), extra=1)
+        assert json.loads(relay_module._encode_event(event)) == ["EVENT", event]
+
+
+class TestEventQueue:
+    """Test cases for EventQueue priority ordering."""
+
+    async def test_batch_order_by_priority_then_fifo(self):
+        """Test that higher priorities come first, oldest first within a level."""
+        queue = EventQueue()
+        await queue.add(_make_event("low"), priority=0)
+        await queue.add(_make_event("high1"), priority=10)
+        await queue.add(_make_event("mid"), priority=5)
+        await queue.add(_make_event("high2"), priority=10)
+
+        batch = await queue.get_batch(max_size=10)
+
+        assert [q.event["id"] for q in batch] == ["high1", "high2", "mid", "low"]
+        assert queue.size == 0
+
+    async def test_requeue_lowers_priority(self):
+        """Test that a retried event goes behind events of its old level."""
+        queue = EventQueue()
+        await queue.add(_make_event("retry"), priority=0)
+        await queue.add(_make_event("other"), priority=0)
+
+        first = (await queue.get_batch(max_size=1))[0]
+        assert await queue.requeue(first) is True
+
+        batch = await queue.get_batch(max_size=10)
+        assert [q.event["id"] for q in batch] == ["other", "retry"]
+        assert batch[1].priority == -1
+
+    async def test_full_queue_evicts_lowest_priority(self):
+        """Test that a full queue drops the event that would be sent last."""
+        queue = EventQueue(max_queue_size=2)
+        await queue.add(_make_event("low"), priority=0)
+        await queue.add(_make_event("high"), priority=10)
+        await queue.add(_make_event("mid"), priority=5)
+
+        batch = await queue.get_batch(max_size=10)
+
+        assert [q.event["id"] for q in batch] == ["high", "mid"]
+
+    async def test_pending_caches_are_bounded(self):
+        """Test that pending-event caches never outgrow the queue size."""
+        queue = EventQueue(max_queue_size=2)
+        for i in range(3):
+            event = dict(_make_event(f"event{i}"), kind=7375)
+            await queue.add(event, token_data={"proofs": [i]})
+
+        assert list(queue._pending_by_id) == ["event1", "event2"]
+        assert queue.get_pending_token_data() == [{"proofs": [1]}, {"proofs": [2]}]
+
+    async def test_wait_for_events(self):
+        """Test that waiting returns at once when non-empty and wakes on add."""
+        queue = EventQueue()
+        waiter = asyncio.create_task(queue.wait_for_events())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        await queue.add(_make_event("event1"))
+        await asyncio.wait_for(waiter, timeout=1)
+
+        # Already holding events: no waiting at all
+        await asyncio.wait_for(queue.wait_for_events(), timeout=1)
+
+
+class TestRelayPool:
+    """Test cases for RelayPool message fan-out."""
+
+    async def _subscribe_pool(self, pool, callback):
+        """Subscribe a pool without real connections, capturing sent REQs."""
+        for relay in pool.relays:
+            relay.connect = AsyncMock()
+            relay._send = AsyncMock()
+        return await pool.subscribe([{"kinds": [7375]}], callback)
+
+    def _feed(self, relay, *frames):
+        """Point a relay at a mock websocket that yields frames then closes."""
+        ws = AsyncMock()
+        ws.close_code = None
+        ws.recv.side_effect = [
+            *frames,
+            websockets.exceptions.ConnectionClosed(None, None),
+        ]
+        relay.ws = ws
+
+    async def test_process_messages_delivers_shared_event_once(self):
+        """Test that an event broadcast by several relays is delivered once."""
+        pool = RelayPool(["wss://relay1.test.com", "wss://relay2.test.com"])
+        callback = MagicMock()
+        sub_id = await self._subscribe_pool(pool, callback)
+        event = {"id": "event1", "kind": 7375, "content": "x"}
+
+        for relay in pool.relays:
+            self._feed(relay, json.dumps(["EVENT", sub_id, event]).encode())
+
+        await pool.process_messages()
+
+        callback.assert_called_once_with(event)
+
+    async def test_batch_fans_out_to_all_relays(self):
+        """Test that the queue processor publishes to every relay in the pool."""
+        pool = RelayPool(["wss://relay1.test.com", "wss://relay2.test.com"])
+        first, second = pool.relays
+        batch = [QueuedEvent(event=_make_event("event1"))]
+
+        first._publish_frames = AsyncMock(return_value={"event1": False})
+        second._publish_frames = AsyncMock(return_value={"event1": True})
+
+        results = await first._publish_batch_to_relays(batch)
+
+        assert results == {"event1": True}
+        first._publish_frames.assert_awaited_once()
+        second._publish_frames.assert_awaited_once()
+
+    async def test_connect_all_tolerates_failures(self):
+        """Test that one failing relay doesn't stop the others from connecting."""
+        pool = RelayPool(["wss://relay1.test.com", "wss://relay2.test.com"])
+        first, second = pool.relays
+        first.connect = AsyncMock(side_effect=RelayError("down"))
+        second.connect = AsyncMock()
+        first.start_queue_processor = AsyncMock()
+
+        await pool.connect_all()
+
+        second.connect.assert_awaited_once()
+        first.start_queue_processor.assert_awaited_once()
+
+    async def test_subscriptions_dedupe_independently(self):
+        """Test that two subscriptions matching one event both receive it."""
+        pool = RelayPool(["wss://relay1.test.com", "wss://relay2.test.com"])
+        first_callback, second_callback = MagicMock(), MagicMock()
+        first_sub = await self._subscribe_pool(pool, first_callback)
+        second_sub = await self._subscribe_pool(pool, second_callback)
+        event = {"id": "event1"}
+
+        self._feed(
+            pool.relays[0],
+            json.dumps(["EVENT", first_sub, event]),
+            json.dumps(["EVENT", second_sub, event]),
+        )
+        self._feed(pool.relays[1], json.dumps(["EVENT", first_sub, event]))
+
+        await pool.process_messages()
+
+        first_callback.assert_called_once_with(event)
+        second_callback.assert_called_once_with(event)
+
+    async def test_unregistered_frame_does_not_consume_delivery(self):
+        """Test that a frame for a sub_id a relay no longer has is not marked seen."""
+        pool = RelayPool(["wss://relay1.test.com", "wss://relay2.test.com"])
+        callback = MagicMock()
+        sub_id = await self._subscribe_pool(pool, callback)
+        stale, live = pool.relays
+        del stale.subscriptions[sub_id]
+        event = {"id": "event1"}
+
+        self._feed(stale, json.dumps(["EVENT", sub_id, event]))
+        self._feed(live, json.dumps(["EVENT", sub_id, event]))
+
+        await pool.process_messages()
+
+        callback.assert_called_once_with(event)
+
+    async def test_unsubscribe_forgets_seen_events(self):
+        """Test that resubscribing delivers events seen by a closed subscription."""
+        pool = RelayPool(["wss://relay1.test.com"])
+        callback = MagicMock()
+        event = {"id": "event1"}
+
+        sub_id = await self._subscribe_pool(pool, callback)
+        self._feed(pool.relays[0], json.dumps(["EVENT", sub_id, event]))
+        await pool.process_messages()
+        await pool.unsubscribe(sub_id)
+
+        assert sub_id not in pool._seen_event_ids
+
+        sub_id = await self._subscribe_pool(pool, callback)
+        self._feed(pool.relays[0], json.dumps(["EVENT", sub_id, event]))
+        await pool.process_messages()
+
+        assert callback.call_count == 2
+
+    async def test_seen_event_ids_are_bounded(self):
+        """Test that each subscription's seen IDs evict the oldest entries."""
+        pool = RelayPool(["wss://relay1.test.com"], max_seen_messages=2)
+        sub_id = await self._subscribe_pool(pool, MagicMock())
+
+        self._feed(
+            pool.relays[0],
+            *(json.dumps(["EVENT", sub_id, {"id": f"event{i}"}]) for i in range(3)),
+        )
+        await pool.process_messages()
+
+        assert list(pool._seen_event_ids[sub_id]) == ["event1", "event2"]
+
 
 @pytest.mark.asyncio
 async def test_relay_lifecycle():
@@ -304,3 +663,121 @@ async def test_relay_lifecycle():
     # Just test that the object is created properly
     assert relay.url == "wss://relay.test.com"
     assert relay.ws is None
+
+
+class TestRelayClientBatch:
+    """Test publishing a token event together with its history entry."""
+
+    async def test_token_and_history_share_one_round_trip(self) -> None:
+        """Test that both events are pipelined and history cites the token id."""
+        from coincurve import PrivateKey
+
+        from sixty_nuts.crypto import nip44_decrypt
+        from sixty_nuts.events import EventManager
+        from sixty_nuts.types import Proof
+
+        privkey = PrivateKey()
+        client = relay_module.RelayClient(
+            ["wss://relay.test.com"],
+            privkey,
+            use_queued_relays=False,
+            min_relay_interval=0,
+        )
+        mock_relay = MagicMock()
+        mock_relay.url = "wss://relay.test.com"
+        mock_relay._publish_frames = AsyncMock(
+            side_effect=lambda ids, frames: {event_id: True for event_id in ids}
+        )
+        manager = EventManager(client, privkey, ["https://mint.test"])
+        proofs: list[Proof] = [
+            {
+                "id": "00ad268c4d1f5826",
+                "amount": 8,
+                "secret": "ab" * 32,
+                "C": "02" + "cd" * 32,
+                "mint": "https://mint.test",
+                "unit": "sat",
+            }
+        ]
+
+        with patch.object(
+            client, "get_relay_connections", AsyncMock(return_value=[mock_relay])
+        ):
+            token_id = await manager.publish_token_event_with_history(
+                proofs, direction="in", amount=8
+            )
+
+        mock_relay._publish_frames.assert_awaited_once()
+        event_ids, frames = mock_relay._publish_frames.await_args.args
+        assert event_ids[0] == token_id
+        history = json.loads(frames[1])[1]
+        content = json.loads(nip44_decrypt(history["content"], privkey))
+        assert ["e", token_id, "", "created"] in content
+
+    async def test_concurrent_publishers_get_spaced_slots(self) -> None:
+        """Test that concurrent callers of the rate limiter are staggered."""
+        from coincurve import PrivateKey
+
+        client = relay_module.RelayClient(
+            ["wss://relay.test.com"],
+            PrivateKey(),
+            use_queued_relays=False,
+            min_relay_interval=1.0,
+        )
+        client._last_relay_operation = 0.0
+        sleeps: list[float] = []
+
+        async def fake_sleep(delay: float) -> None:
+            sleeps.append(delay)
+
+        with (
+            patch("sixty_nuts.relay.time.time", return_value=100.0),
+            patch("sixty_nuts.relay.asyncio.sleep", side_effect=fake_sleep),
+        ):
+            await asyncio.gather(
+                *(client.rate_limit_relay_operations() for _ in range(3))
+            )
+
+        assert sleeps == [1.0, 2.0]
+        assert client._last_relay_operation == 102.0
+
+
+class TestRelayClientSharing:
+    """Test sharing relay clients between wallets and reconnect backoff."""
+
+    async def test_acquire_shares_per_key_and_release_disconnects_last(self) -> None:
+        """Test that clients are shared per key and closed by the last user."""
+        from coincurve import PrivateKey
+
+        privkey = PrivateKey()
+        urls = ["wss://relay.test.com"]
+        first = relay_module.RelayClient.acquire(urls, privkey)
+        second = relay_module.RelayClient.acquire(list(urls), privkey)
+        other = relay_module.RelayClient.acquire(urls, PrivateKey())
+        assert first is second
+        assert other is not first
+
+        with patch.object(first, "disconnect_all", AsyncMock()) as mock_disconnect:
+            await first.release()
+            mock_disconnect.assert_not_awaited()
+            await second.release()
+            mock_disconnect.assert_awaited_once()
+
+        assert relay_module.RelayClient.acquire(urls, privkey) is not first
+
+    @patch("sixty_nuts.relay.websockets.connect")
+    async def test_failed_connect_backs_off(self, mock_connect) -> None:
+        """Test that a failed connect makes the next attempt fail fast."""
+        mock_connect.side_effect = OSError("refused")
+        relay = Relay("wss://relay.test.com")
+
+        with pytest.raises(RelayError, match="Connection failed"):
+            await relay.connect()
+        with pytest.raises(RelayError, match="Backing off"):
+            await relay.connect()
+        assert mock_connect.call_count == 1
+
+        relay._retry_at = 0.0
+        with pytest.raises(RelayError, match="Connection failed"):
+            await relay.connect()
+        assert relay._connect_failures == 2
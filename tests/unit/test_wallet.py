@@ -2,10 +2,20 @@
 
 import pytest
 import asyncio
-
-from sixty_nuts.wallet import Wallet
-from sixty_nuts.crypto import generate_privkey
-from sixty_nuts.types import Proof
+import json
+import os
+
+from sixty_nuts.wallet import (
+    Wallet,
+    _backups_have_missing,
+    _y_for_secret,
+    sats_value_of_proofs,
+)
+from sixty_nuts.crypto import generate_privkey, hash_to_curve
+from sixty_nuts.types import Proof, WalletError, WalletState
+from sixty_nuts.relay import EventKind, NostrEvent
+from pathlib import Path
+from typing import cast
 from unittest.mock import patch, AsyncMock
 
 
@@ -128,6 +138,41 @@ class TestWalletFeeCalculation:
         assert input_fees == 2  # 2 proofs * 1 sat
         assert total_fees == 7  # 2 + 5
 
+    async def test_total_input_fees_reuse_fee_map(self) -> None:
+        """Test that the keyset fee map is rebuilt only for a new keyset list."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        mock_proofs: list[Proof] = [
+            {
+                "id": keyset_id,
+                "amount": 1,
+                "secret": f"secret{i}",
+                "C": f"C{i}",
+                "mint": "http://test.mint",
+                "unit": "sat",
+            }
+            for i, keyset_id in enumerate(["ks1", "ks1", "ks2"])
+        ]
+        keysets = [
+            {"id": "ks1", "input_fee_ppk": 600},
+            {"id": "ks2", "input_fee_ppk": "300"},
+        ]
+        mint = AsyncMock()
+        mint.url = "http://test.mint"
+        mint.get_keysets_info.return_value = keysets
+
+        assert await wallet.calculate_total_input_fees(mint, mock_proofs) == 2
+        fee_map = wallet._keyset_fees_cache["http://test.mint"][1]
+        assert await wallet.calculate_total_input_fees(mint, mock_proofs) == 2
+        assert wallet._keyset_fees_cache["http://test.mint"][1] is fee_map
+
+        # A refetched keyset list replaces the cached map
+        mint.get_keysets_info.return_value = [{"id": "ks1", "input_fee_ppk": 0}]
+        assert await wallet.calculate_total_input_fees(mint, mock_proofs) == 0
+
 
 class TestWalletTokenSerialization:
     """Test token serialization and parsing logic."""
@@ -302,6 +347,34 @@ class TestWalletCurrencyValidation:
         with pytest.raises(ValueError, match="Unsupported currency unit"):
             wallet._validate_currency_unit("invalid")  # type: ignore
 
+    async def test_supporting_mints_queried_concurrently(self) -> None:
+        """Test that keysets are fetched from all mints at once, keeping order."""
+        mint_urls = ["http://mint-a", "http://mint-b", "http://mint-c"]
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=mint_urls,
+            relay_urls=["ws://test.relay"],
+        )
+        all_in_flight = asyncio.Barrier(len(mint_urls))
+        units = {"http://mint-a": "usd", "http://mint-b": "sat", "http://mint-c": "usd"}
+
+        def get_mint(mint_url: str) -> AsyncMock:
+            async def get_keysets_info():
+                # Deadlocks (and times out) unless all mints are queried at once
+                await all_in_flight.wait()
+                return [{"id": "ks1", "unit": units[mint_url]}]
+
+            mint = AsyncMock()
+            mint.get_keysets_info.side_effect = get_keysets_info
+            return mint
+
+        with patch.object(wallet, "_get_mint", side_effect=get_mint):
+            supporting = await asyncio.wait_for(
+                wallet.get_mints_supporting_unit("usd"), timeout=1.0
+            )
+
+        assert supporting == ["http://mint-a", "http://mint-c"]
+
 
 class TestWalletOptimalDenominations:
     """Test optimal denomination calculation logic."""
@@ -417,3 +490,1200 @@ class TestWalletInsufficientBalanceCheck:
 
         with pytest.raises(WalletError, match="Insufficient balance"):
             wallet.raise_if_insufficient_balance(0, 1)
+
+
+class TestWalletStateGrouping:
+    """Test WalletState balance and proof groupings."""
+
+    @staticmethod
+    def _proof(amount: int, mint: str, unit: str = "sat", keyset: str = "ks1") -> Proof:
+        return {
+            "id": keyset,
+            "amount": amount,
+            "secret": f"secret-{mint}-{amount}",
+            "C": "C",
+            "mint": mint,
+            "unit": unit,  # type: ignore[typeddict-item]
+        }
+
+    def test_balance_by_mint_sums_proofs(self) -> None:
+        """Test that balances from several proofs at one mint add up."""
+        from sixty_nuts.types import WalletState
+
+        state = WalletState(
+            proofs=[
+                self._proof(1, "http://mint-a"),
+                self._proof(4, "http://mint-a"),
+                self._proof(8, "http://mint-b", unit="usd", keyset="ks2"),
+            ]
+        )
+
+        assert state.balance_by_mint == {"http://mint-a": 5, "http://mint-b": 8}
+        assert state.balance_by_unit == {"sat": 5, "usd": 8}
+        assert [len(p) for p in state.proofs_by_mint.values()] == [2, 1]
+        assert list(state.proofs_by_keyset) == ["ks1", "ks2"]
+
+    async def test_mint_unit_and_sat_totals(self) -> None:
+        """Test the per-(mint, unit) balances and the BTC-denominated total."""
+        from sixty_nuts.types import WalletState
+
+        state = WalletState(
+            proofs=[
+                self._proof(4, "http://mint-a"),
+                self._proof(1999, "http://mint-a", unit="msat"),
+                self._proof(2500, "http://mint-b", unit="msat"),
+                self._proof(8, "http://mint-b", unit="usd"),
+                self._proof(2, "http://mint-b"),
+            ]
+        )
+
+        assert state.balance_by_mint_unit == {
+            ("http://mint-a", "sat"): 4,
+            ("http://mint-a", "msat"): 1999,
+            ("http://mint-b", "msat"): 2500,
+            ("http://mint-b", "usd"): 8,
+            ("http://mint-b", "sat"): 2,
+        }
+        # msat proofs round down individually: 1 + 2
+        assert await state.total_balance_sat() == 4 + 2 + 1 + 2
+
+    def test_groupings_follow_reassigned_proofs(self) -> None:
+        """Test that the cached groupings are rebuilt when proofs change."""
+        from sixty_nuts.types import WalletState
+
+        state = WalletState(proofs=[self._proof(2, "http://mint-a")])
+        assert state.balance_by_mint == {"http://mint-a": 2}
+
+        state.proofs = [self._proof(16, "http://mint-b")]
+        assert state.balance_by_mint == {"http://mint-b": 16}
+
+        # Returned groupings are read-only views of the cache
+        with pytest.raises(TypeError):
+            state.balance_by_unit["sat"] = 0  # type: ignore[index]
+        assert state.balance_by_unit == {"sat": 16}
+
+    def test_groupings_are_built_once(self) -> None:
+        """Test that repeated reads share one build of the groupings."""
+        from sixty_nuts.types import WalletState, _ProofIndex
+
+        state = WalletState(proofs=[self._proof(2, "http://mint-a")])
+        with patch.object(_ProofIndex, "build", wraps=_ProofIndex.build) as mock_build:
+            state.balance_by_mint
+            state.balance_by_unit
+            state.proofs_by_mint
+            state.proofs_by_keyset
+
+        mock_build.assert_called_once()
+
+    def test_invalidate_after_in_place_edit(self) -> None:
+        """Test that invalidate() refreshes the groupings after in-place edits."""
+        from sixty_nuts.types import WalletState
+
+        state = WalletState(
+            proofs=[self._proof(2, "http://mint-a"), self._proof(4, "http://mint-a")]
+        )
+        assert state.balance_by_mint == {"http://mint-a": 6}
+
+        state.proofs[0] = self._proof(8, "http://mint-b", unit="usd")
+        state.invalidate()
+        assert state.balance_by_mint == {"http://mint-a": 4, "http://mint-b": 8}
+        assert state.balance_by_unit == {"usd": 8, "sat": 4}
+
+        state.proofs.remove(state.proofs[1])
+        state.proofs.append(self._proof(1000, "http://mint-a", unit="msat"))
+        state.invalidate()
+        assert state.balance_by_mint_unit == {
+            ("http://mint-b", "usd"): 8,
+            ("http://mint-a", "msat"): 1000,
+        }
+
+
+class TestWalletMintPolling:
+    """Test payment detection in mint_async."""
+
+    async def test_push_update_wakes_polling(self) -> None:
+        """Test that a pushed quote update triggers a check before the backoff."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+
+        async def watch_mint_quote(quote_id, on_update):
+            await asyncio.sleep(0.05)
+            on_update()
+            await asyncio.sleep(3600)
+
+        mint = AsyncMock()
+        mint.url = "http://test.mint"
+        mint.create_mint_quote.return_value = {"quote": "q1", "request": "lnbc1..."}
+        mint.check_quote_status_and_mint.side_effect = [
+            ({"paid": False}, None),
+            ({"paid": True}, None),
+        ]
+        mint.watch_mint_quote = watch_mint_quote
+
+        with patch.object(wallet, "_get_mint", return_value=mint):
+            invoice, task = await wallet.mint_async(100)
+            # The first backoff sleep is ~1s; the push must beat it
+            assert await asyncio.wait_for(task, timeout=0.5) is True
+
+        assert invoice == "lnbc1..."
+        assert mint.check_quote_status_and_mint.await_count == 2
+
+    async def test_polls_without_push_support(self) -> None:
+        """Test that payment is still detected when the mint has no push channel."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+
+        mint = AsyncMock()
+        mint.url = "http://test.mint"
+        mint.create_mint_quote.return_value = {"quote": "q1", "request": "lnbc1..."}
+        mint.check_quote_status_and_mint.return_value = ({"paid": True}, None)
+        mint.watch_mint_quote.return_value = None
+
+        with patch.object(wallet, "_get_mint", return_value=mint):
+            _, task = await wallet.mint_async(100)
+            assert await asyncio.wait_for(task, timeout=0.5) is True
+
+
+class TestWalletProofSelection:
+    """Test greedy proof selection."""
+
+    async def test_select_largest_proofs_at_target_mint(self) -> None:
+        """Test that the largest proofs at the target mint are picked first."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        proofs: list[Proof] = [
+            {
+                "id": "ks1",
+                "amount": amount,
+                "secret": f"s{i}",
+                "C": "C",
+                "mint": mint,
+                "unit": "sat",
+            }
+            for i, (amount, mint) in enumerate(
+                [
+                    (1, "http://test.mint"),
+                    (16, "http://other.mint"),
+                    (8, "http://test.mint/"),
+                    (2, "http://test.mint"),
+                    (4, "http://test.mint"),
+                ]
+            )
+        ]
+
+        with patch.object(
+            wallet, "_validate_proofs_with_cache", AsyncMock(return_value=proofs)
+        ):
+            selected, consumed = await wallet._select_proofs(
+                proofs, 12, "http://test.mint", "sat"
+            )
+
+        assert [p["amount"] for p in selected] == [8, 4]
+        assert consumed == selected
+
+    async def test_exact_subset_avoids_swap(self) -> None:
+        """Test that an exactly matching subset is sent without swapping."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        proofs: list[Proof] = [
+            {
+                "id": "ks1",
+                "amount": amount,
+                "secret": f"s{i}",
+                "C": f"C{i}",
+                "mint": "http://test.mint",
+                "unit": "sat",
+            }
+            for i, amount in enumerate([1, 8, 2, 4])
+        ]
+
+        with (
+            patch.object(
+                wallet, "_validate_proofs_with_cache", AsyncMock(return_value=proofs)
+            ),
+            patch.object(wallet, "_swap_proof_denominations_split") as mock_swap,
+        ):
+            selected, consumed = await wallet._select_proofs(
+                proofs, 11, "http://test.mint", "sat"
+            )
+
+        assert [p["amount"] for p in selected] == [8, 2, 1]
+        assert consumed == selected
+        mock_swap.assert_not_called()
+
+
+class TestWalletConsolidation:
+    """Test per-mint proof consolidation."""
+
+    async def test_one_failing_mint_does_not_block_others(self) -> None:
+        """Test that mints consolidate independently and failures are contained."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://mint-a", "http://mint-b"],
+            relay_urls=["ws://test.relay"],
+        )
+        proofs: list[Proof] = [
+            {
+                "id": "ks1",
+                "amount": 1,
+                "secret": f"s-{mint}-{i}",
+                "C": "C",
+                "mint": mint,
+                "unit": "sat",
+            }
+            for mint in ("http://mint-a", "http://mint-b")
+            for i in range(3)
+        ]
+
+        async def swap(mint_proofs, denoms, mint_url, unit):
+            if mint_url == "http://mint-a":
+                raise RuntimeError("mint down")
+            return ["new-proof"]
+
+        with (
+            patch.object(
+                wallet,
+                "_calculate_optimal_denominations",
+                AsyncMock(return_value={2: 1, 1: 1}),
+            ),
+            patch.object(wallet, "_swap_proof_denominations", side_effect=swap),
+            patch.object(wallet, "store_proofs", AsyncMock()) as mock_store,
+        ):
+            await wallet._consolidate_proofs(proofs)
+
+        mock_store.assert_awaited_once_with(["new-proof"])
+
+    async def test_store_failure_after_swap_is_raised(self) -> None:
+        """Test that losing swapped proofs is reported once the others finish."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://mint-a", "http://mint-b"],
+            relay_urls=["ws://test.relay"],
+        )
+        proofs: list[Proof] = [
+            {
+                "id": "ks1",
+                "amount": 1,
+                "secret": f"s-{mint}-{i}",
+                "C": "C",
+                "mint": mint,
+                "unit": "sat",
+            }
+            for mint in ("http://mint-a", "http://mint-b")
+            for i in range(3)
+        ]
+
+        async def swap(mint_proofs, denoms, mint_url, unit):
+            return [f"new-{mint_url}"]
+
+        async def store(new_proofs):
+            if new_proofs == ["new-http://mint-a"]:
+                raise RuntimeError("relay down")
+
+        with (
+            patch.object(
+                wallet,
+                "_calculate_optimal_denominations",
+                AsyncMock(return_value={2: 1, 1: 1}),
+            ),
+            patch.object(wallet, "_swap_proof_denominations", side_effect=swap),
+            patch.object(wallet, "store_proofs", side_effect=store) as mock_store,
+        ):
+            with pytest.raises(WalletError, match="http://mint-a: relay down"):
+                await wallet._consolidate_proofs(proofs)
+
+        assert mock_store.await_count == 2
+
+    async def test_target_mint_uses_its_own_unit(self) -> None:
+        """Test that another mint's unit doesn't block consolidating the target."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://mint-a", "http://mint-b"],
+            relay_urls=["ws://test.relay"],
+        )
+        proofs: list[Proof] = [
+            {
+                "id": "ks1",
+                "amount": 1,
+                "secret": f"s-{mint}-{i}",
+                "C": "C",
+                "mint": mint,
+                "unit": unit,  # type: ignore[typeddict-item]
+            }
+            for mint, unit in (("http://mint-a", "usd"), ("http://mint-b", "sat"))
+            for i in range(3)
+        ]
+
+        with (
+            patch.object(
+                wallet,
+                "_calculate_optimal_denominations",
+                AsyncMock(return_value={2: 1, 1: 1}),
+            ),
+            patch.object(
+                wallet, "_swap_proof_denominations", AsyncMock(return_value=[])
+            ) as mock_swap,
+            patch.object(wallet, "store_proofs", AsyncMock()),
+        ):
+            await wallet._consolidate_proofs(proofs, target_mint="http://mint-b")
+
+        mock_swap.assert_awaited_once_with(
+            proofs[3:], {2: 1, 1: 1}, "http://mint-b", "sat"
+        )
+
+
+class TestWalletLNURL:
+    """Test paying LNURL addresses."""
+
+    async def test_send_to_lnurl_fetches_state_once(self) -> None:
+        """Test that the balance-check state is reused for the melt."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        state = WalletState(
+            proofs=[
+                {
+                    "id": "ks1",
+                    "amount": 4096,
+                    "secret": "s1",
+                    "C": "C",
+                    "mint": "http://test.mint",
+                    "unit": "sat",
+                }
+            ],
+        )
+        lnurl_data = {
+            "callback_url": "https://example.com/cb",
+            "min_sendable": 1000,
+            "max_sendable": 10_000_000,
+        }
+
+        with (
+            patch.object(
+                wallet, "fetch_wallet_state", AsyncMock(return_value=state)
+            ) as mock_fetch,
+            patch.object(wallet, "melt", AsyncMock()) as mock_melt,
+            patch(
+                "sixty_nuts.wallet.get_lnurl_data", AsyncMock(return_value=lnurl_data)
+            ),
+            patch(
+                "sixty_nuts.wallet.get_lnurl_invoice",
+                AsyncMock(return_value=("lnbc1...", {})),
+            ),
+        ):
+            assert await wallet.send_to_lnurl("user@example.com", 1000) == 1000
+
+        mock_fetch.assert_awaited_once()
+        mock_melt.assert_awaited_once_with("lnbc1...", state=state)
+
+
+class TestWalletProofStateCache:
+    """Test the per-proof state cache used before asking mints."""
+
+    async def test_cached_states_skip_mint_check(self) -> None:
+        """Test that cached SPENT/UNSPENT proofs are resolved without a mint call."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        spent: Proof = {
+            "id": "ks1",
+            "amount": 1,
+            "secret": "s1",
+            "C": "C1",
+            "mint": "http://test.mint",
+            "unit": "sat",
+        }
+        unspent: Proof = {**spent, "secret": "s2", "C": "C2"}
+        wallet._cache_proof_state(spent, "SPENT")
+        wallet._cache_proof_state(unspent, "UNSPENT")
+
+        assert wallet._is_proof_state_cached(spent) == (True, "SPENT")
+        with patch.object(wallet, "_get_mint") as mock_get_mint:
+            valid = await wallet._validate_proofs_with_cache([spent, unspent])
+
+        assert valid == [unspent]
+        mock_get_mint.assert_not_called()
+
+    async def test_mints_checked_concurrently(self) -> None:
+        """Test that each mint's check_state runs at the same time."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://mint-a", "http://mint-b"],
+            relay_urls=["ws://test.relay"],
+        )
+        proofs: list[Proof] = [
+            {
+                "id": "ks1",
+                "amount": 1,
+                "secret": f"{i:064x}",
+                "C": f"C{i}",
+                "mint": mint_url,
+                "unit": "sat",
+            }
+            for i, mint_url in enumerate(["http://mint-a", "http://mint-b"])
+        ]
+        both_in_flight = asyncio.Barrier(2)
+
+        def get_mint(mint_url: str) -> AsyncMock:
+            async def check_state(*, Ys):
+                # Deadlocks (and times out) unless both mints are queried at once
+                await both_in_flight.wait()
+                return {"states": [{"state": "UNSPENT"} for _ in Ys]}
+
+            mint = AsyncMock()
+            mint.check_state.side_effect = check_state
+            return mint
+
+        with patch.object(wallet, "_get_mint", side_effect=get_mint):
+            valid = await asyncio.wait_for(
+                wallet._validate_proofs_with_cache(proofs), timeout=1.0
+            )
+
+        assert sorted(p["C"] for p in valid) == ["C0", "C1"]
+
+    async def test_repeated_proofs_checked_once(self) -> None:
+        """Test that a proof passed twice is sent to the mint only once."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        proof: Proof = {
+            "id": "ks1",
+            "amount": 1,
+            "secret": "00" * 32,
+            "C": "C0",
+            "mint": "http://test.mint",
+            "unit": "sat",
+        }
+        mint = AsyncMock()
+        mint.check_state.side_effect = lambda *, Ys: {
+            "states": [{"state": "UNSPENT"} for _ in Ys]
+        }
+
+        with patch.object(wallet, "_get_mint", return_value=mint):
+            valid = await wallet._validate_proofs_with_cache([proof, Proof(**proof)])
+
+        assert len(mint.check_state.await_args.kwargs["Ys"]) == 1
+        assert len(valid) == 2
+
+    def test_y_values_memoized_per_secret(self) -> None:
+        """Test that Y values are cached by secret and dropped with the cache."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        proof: Proof = {
+            "id": "ks1",
+            "amount": 1,
+            "secret": "ab" * 32,
+            "C": "C1",
+            "mint": "http://test.mint",
+            "unit": "sat",
+        }
+        expected = hash_to_curve(proof["secret"].encode()).format().hex()
+
+        wallet.clear_spent_proof_cache()
+        assert wallet._compute_proof_y_values([proof, proof]) == [expected] * 2
+        assert _y_for_secret.cache_info().hits == 1
+
+        wallet.clear_spent_proof_cache()
+        assert _y_for_secret.cache_info().currsize == 0
+
+    async def test_unchanged_proof_set_not_revalidated(self) -> None:
+        """Test that refetching the same proofs shortly after skips the mint."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        event = NostrEvent(
+            id="ev-a",
+            pubkey="",
+            created_at=1,
+            kind=EventKind.Token,
+            tags=[],
+            content="ciphertext",
+            sig="",
+        )
+        token_data = {
+            "mint": "http://test.mint",
+            "proofs": [
+                {"id": "ks1", "amount": 1, "secret": "c2VjcmV0", "C": "02aa"},
+                {"id": "ks1", "amount": 2, "secret": "b3RoZXI=", "C": "02bb"},
+            ],
+        }
+        wallet.relay_manager = AsyncMock()
+        wallet.relay_manager.fetch_wallet_events.return_value = [event]
+        wallet.relay_manager.get_pending_proofs = lambda: []
+
+        async def validate(proofs):
+            return [p for p in proofs if p["C"] != "02bb"]
+
+        with (
+            patch.object(wallet, "_decrypt_event_content", return_value=token_data),
+            patch.object(
+                wallet, "_validate_proofs_with_cache", side_effect=validate
+            ) as mock_validate,
+        ):
+            for _ in range(2):
+                state = await wallet.fetch_wallet_state(check_local_backups=False)
+                assert [p["C"] for p in state.proofs] == ["02aa"]
+            assert mock_validate.call_count == 1
+
+            # Stale results are validated again
+            wallet._validated_proofs_ttl = 0
+            await wallet.fetch_wallet_state(check_local_backups=False)
+            assert mock_validate.call_count == 2
+
+    async def test_pending_proofs_skip_validation(self) -> None:
+        """Test that pending proofs are split off and kept without validation."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        event = NostrEvent(
+            id="ev-a",
+            pubkey="",
+            created_at=1,
+            kind=EventKind.Token,
+            tags=[],
+            content="ciphertext",
+            sig="",
+        )
+        published = {"id": "ks1", "amount": 1, "secret": "c2VjcmV0", "C": "02aa"}
+        pending = {"id": "ks1", "amount": 2, "secret": "b3RoZXI=", "C": "02bb"}
+        wallet.relay_manager = AsyncMock()
+        wallet.relay_manager.fetch_wallet_events.return_value = [event]
+        # A pending copy of an already published proof stays with its event
+        wallet.relay_manager.get_pending_proofs = lambda: [
+            {"mint": "http://test.mint", "proofs": [published, pending]}
+        ]
+
+        with (
+            patch.object(
+                wallet,
+                "_decrypt_event_content",
+                return_value={"mint": "http://test.mint", "proofs": [published]},
+            ),
+            patch.object(
+                wallet, "_validate_proofs_with_cache", AsyncMock(return_value=[])
+            ) as mock_validate,
+        ):
+            state = await wallet.fetch_wallet_state(check_local_backups=False)
+
+        assert [p["C"] for p in mock_validate.call_args.args[0]] == ["02aa"]
+        assert [p["C"] for p in state.proofs] == ["02bb"]
+        assert state.proof_to_event_id is not None
+        assert state.proof_to_event_id[f"{b'other'.hex()}:02bb"] == "__pending__"
+
+
+class TestWalletMarkSpent:
+    """Test NIP-60 rollover when proofs are spent."""
+
+    async def test_rollover_only_touches_events_with_spent_proofs(self) -> None:
+        """Test that affected events roll over with exactly their unspent proofs."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        proofs: list[Proof] = [
+            {
+                "id": "ks1",
+                "amount": 1 << i,
+                "secret": f"s{i}",
+                "C": f"C{i}",
+                "mint": "http://test.mint",
+                "unit": "sat",
+            }
+            for i in range(4)
+        ]
+        state = WalletState(
+            proofs=proofs,
+            proof_to_event_id={
+                "s0:C0": "ev-a",
+                "s1:C1": "ev-a",
+                "s2:C2": "ev-b",
+                "s3:C3": "__pending__",
+            },
+        )
+        event_manager = AsyncMock()
+        event_manager.publish_token_event.return_value = "ev-new"
+        wallet.event_manager = event_manager
+
+        with patch.object(wallet, "fetch_wallet_state", AsyncMock(return_value=state)):
+            await wallet._mark_proofs_as_spent([proofs[0]])
+
+        event_manager.publish_token_event.assert_awaited_once_with(
+            [proofs[1]], deleted_token_ids=["ev-a"]
+        )
+        event_manager.delete_token_events.assert_awaited_once_with(["ev-a"])
+        [histories] = event_manager.publish_spending_histories.await_args.args
+        assert [h["amount"] for h in histories] == [1]
+
+    async def test_rollover_uses_event_index(self) -> None:
+        """Test that the per-event index is used instead of sweeping all proofs."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        spent: Proof = {
+            "id": "ks1",
+            "amount": 1,
+            "secret": "s0",
+            "C": "C0",
+            "mint": "http://test.mint",
+            "unit": "sat",
+        }
+        kept: Proof = {**spent, "amount": 2, "secret": "s1", "C": "C1"}
+        state = WalletState(
+            proofs=[],  # never swept when the index is present
+            proof_to_event_id={"s0:C0": "ev-a", "s1:C1": "ev-a"},
+            proofs_by_event={"ev-a": [spent, kept], "ev-b": [{**kept, "C": "C2"}]},
+        )
+        event_manager = AsyncMock()
+        wallet.event_manager = event_manager
+
+        with patch.object(wallet, "fetch_wallet_state", AsyncMock(return_value=state)):
+            await wallet._mark_proofs_as_spent([spent])
+
+        event_manager.publish_token_event.assert_awaited_once_with(
+            [kept], deleted_token_ids=["ev-a"]
+        )
+
+
+class TestWalletStoreProofs:
+    """Test publishing proofs to Nostr."""
+
+    async def test_state_reused_until_publish(self, tmp_path, monkeypatch) -> None:
+        """Test that store_proofs reuses recent state until it publishes."""
+        monkeypatch.chdir(tmp_path)
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        stored: Proof = {
+            "id": "ks1",
+            "amount": 1,
+            "secret": "s1",
+            "C": "C1",
+            "mint": "http://test.mint",
+            "unit": "sat",
+        }
+        fresh: Proof = {**stored, "secret": "s2", "C": "C2"}
+        wallet.event_manager = AsyncMock()
+
+        with (
+            patch.object(
+                wallet,
+                "fetch_wallet_state",
+                AsyncMock(return_value=WalletState(proofs=[stored])),
+            ) as mock_fetch,
+            patch("sixty_nuts.wallet.asyncio.sleep", AsyncMock()),
+        ):
+            await wallet.store_proofs([stored])
+            await wallet.store_proofs([stored])
+            assert mock_fetch.await_count == 1
+
+            await wallet.store_proofs([fresh])
+            await wallet.store_proofs([stored])
+            assert mock_fetch.await_count == 2
+
+        wallet.event_manager.publish_token_event.assert_awaited_once_with([fresh])
+
+    async def test_retry_logs_stored_ids_without_rewriting(self, tmp_path) -> None:
+        """Test that retries append to a sidecar and delete both when done."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://mint-a", "http://mint-b"],
+            relay_urls=["ws://test.relay"],
+        )
+        proofs: list[Proof] = [
+            {
+                "id": "ks1",
+                "amount": 1,
+                "secret": f"s{i}",
+                "C": f"C{i}",
+                "mint": mint_url,
+                "unit": "sat",
+            }
+            for i, mint_url in enumerate(["http://mint-a", "http://mint-b"])
+        ]
+        backup_file = tmp_path / "proofs_1_abc.json"
+        backup_file.write_text(json.dumps({"timestamp": 1, "proofs": proofs}))
+        original = backup_file.read_text()
+        sidecar = tmp_path / "proofs_1_abc.stored"
+        wallet.event_manager = AsyncMock()
+
+        with (
+            patch.object(
+                wallet,
+                "fetch_wallet_state",
+                AsyncMock(return_value=WalletState(proofs=proofs)),
+            ),
+            patch("sixty_nuts.wallet.asyncio.sleep", AsyncMock()),
+        ):
+            await wallet._retry_store_proofs(proofs[:1], "http://mint-a", backup_file)
+            assert backup_file.read_text() == original
+            assert sidecar.read_text() == "s0:C0\n"
+
+            await wallet._retry_store_proofs(proofs[1:], "http://mint-b", backup_file)
+
+        assert not backup_file.exists()
+        assert not sidecar.exists()
+
+    def test_backup_listing_cached_until_directory_changes(self, tmp_path) -> None:
+        """Test that the backup directory is only globbed again after it changes."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        wallet._backup_dir = tmp_path / "proof_backups"
+        assert wallet._list_backup_files() == []
+
+        wallet._backup_dir.mkdir()
+        first = wallet._backup_dir / "proofs_1_a.json"
+        first.write_text("{}")
+        assert wallet._list_backup_files() == [first]
+
+        with patch.object(Path, "glob", side_effect=AssertionError("rescanned")):
+            assert wallet._list_backup_files() == [first]
+
+        second = wallet._backup_dir / "proofs_2_b.json"
+        second.write_text("{}")
+        stat = wallet._backup_dir.stat()
+        os.utime(wallet._backup_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert sorted(wallet._list_backup_files()) == [first, second]
+
+    async def test_quick_scan_skips_unreadable_backups(self, tmp_path) -> None:
+        """Test that the backup quick scan finds a missing proof past bad files."""
+        backup_files = []
+        for i in range(5):
+            backup_file = tmp_path / f"proofs_{i}_a.json"
+            backup_file.write_text(
+                json.dumps({"proofs": [{"secret": f"s{i}", "C": f"C{i}"}]})
+            )
+            backup_files.append(backup_file)
+        broken = tmp_path / "proofs_9_a.json"
+        broken.write_text("{not json")
+        backup_files.append(broken)
+        existing = {f"s{i}:C{i}" for i in range(5)}
+
+        assert not await _backups_have_missing(backup_files, existing)
+        assert await _backups_have_missing(backup_files, existing - {"s3:C3"})
+
+    async def test_recovery_scan_counts_distinct_and_missing(self, tmp_path) -> None:
+        """Test that the recovery scan dedupes backups and finds missing proofs."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        wallet._backup_dir = tmp_path
+        proofs: list[Proof] = [
+            {
+                "id": "ks1",
+                "amount": 1,
+                "secret": f"s{i}",
+                "C": f"C{i}",
+                "mint": "http://test.mint",
+                "unit": "sat",
+            }
+            for i in range(3)
+        ]
+        (tmp_path / "proofs_1_a.json").write_text(json.dumps({"proofs": proofs[:2]}))
+        (tmp_path / "proofs_2_b.json").write_text(json.dumps({"proofs": proofs[1:]}))
+
+        with patch.object(
+            wallet,
+            "fetch_wallet_state",
+            AsyncMock(return_value=WalletState(proofs=proofs[:1])),
+        ):
+            stats = await wallet.scan_and_recover_local_proofs()
+
+        assert stats["total_backup_files"] == 2
+        assert stats["total_proofs_in_backups"] == 3
+        assert stats["missing_from_nostr"] == 2
+
+    async def test_recovery_publishes_and_deletes_verified_backups(
+        self, tmp_path
+    ) -> None:
+        """Test that recovered backups are deleted once found on Nostr."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://mint-a", "http://mint-b"],
+            relay_urls=["ws://test.relay"],
+        )
+        wallet._backup_dir = tmp_path
+        proofs: list[Proof] = [
+            {
+                "id": "ks1",
+                "amount": 2**i,
+                "secret": f"s{i}",
+                "C": f"C{i}",
+                "mint": mint_url,
+                "unit": "sat",
+            }
+            for i, mint_url in enumerate(["http://mint-a", "http://mint-b"])
+        ]
+        for i, proof in enumerate(proofs):
+            (tmp_path / f"proofs_{i}_a.json").write_text(
+                json.dumps({"proofs": [proof]})
+            )
+        wallet.event_manager = AsyncMock()
+        wallet.event_manager.publish_token_event.return_value = "ev-new"
+
+        with (
+            patch.object(
+                wallet,
+                "fetch_wallet_state",
+                AsyncMock(
+                    side_effect=[WalletState(proofs=[]), WalletState(proofs=proofs)]
+                ),
+            ),
+            patch.object(
+                wallet,
+                "_validate_proofs_with_cache",
+                AsyncMock(side_effect=lambda p: p),
+            ),
+            patch("sixty_nuts.wallet.asyncio.sleep", AsyncMock()),
+        ):
+            stats = await wallet.scan_and_recover_local_proofs(auto_publish=True)
+
+        assert stats["recovered"] == 2
+        assert stats["failed"] == 0
+        assert wallet.event_manager.publish_token_event.await_count == 2
+        histories = sorted(
+            (
+                call.args[0]
+                for call in wallet.event_manager.publish_spending_histories.await_args_list
+            ),
+            key=lambda entries: entries[0]["amount"],
+        )
+        assert histories == [
+            [
+                {
+                    "direction": "in",
+                    "amount": amount,
+                    "unit": "sat",
+                    "created_token_ids": ["ev-new"],
+                }
+            ]
+            for amount in (1, 2)
+        ]
+        assert list(tmp_path.glob("proofs_*.json")) == []
+
+    async def test_wait_for_stored_proofs_polls_until_present(self) -> None:
+        """Test that propagation is polled instead of waited out with a sleep."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        proof: Proof = {
+            "id": "ks1",
+            "amount": 1,
+            "secret": "s0",
+            "C": "C0",
+            "mint": "http://test.mint",
+            "unit": "sat",
+        }
+        fetch = AsyncMock(
+            side_effect=[WalletState(proofs=[]), WalletState(proofs=[proof])]
+        )
+
+        with (
+            patch.object(wallet, "fetch_wallet_state", fetch),
+            patch("sixty_nuts.wallet.asyncio.sleep", AsyncMock()) as mock_sleep,
+        ):
+            stored = await wallet._wait_for_stored_proofs(["s0:C0"])
+
+        assert "s0:C0" in stored
+        assert fetch.await_count == 2
+        mock_sleep.assert_awaited_once_with(0.25)
+
+
+class TestWalletTransfer:
+    """Test moving balance between mints."""
+
+    async def test_multi_mint_transfer_fetches_state_once(self) -> None:
+        """Test that draining several source mints reuses one wallet state."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://a", "http://b", "http://target"],
+            relay_urls=["ws://test.relay"],
+        )
+        state = WalletState(
+            proofs=[
+                {
+                    "id": "ks1",
+                    "amount": amount,
+                    "secret": f"s-{mint_url}",
+                    "C": f"C-{mint_url}",
+                    "mint": mint_url,
+                    "unit": "sat",
+                }
+                for mint_url, amount in [("http://a", 64), ("http://b", 32)]
+            ],
+        )
+
+        async def no_op() -> None:
+            return None
+
+        async def mint_async(amount: int, **kwargs):
+            return f"lnbc{amount}", asyncio.ensure_future(no_op())
+
+        with (
+            patch.object(
+                wallet, "fetch_wallet_state", AsyncMock(return_value=state)
+            ) as mock_fetch,
+            patch.object(wallet, "mint_async", side_effect=mint_async),
+            patch.object(wallet, "melt", AsyncMock()) as mock_melt,
+        ):
+            result = await wallet.transfer_balance_to_mint(80, to_mint="http://target")
+
+        assert result == (80, "sat")
+        mock_fetch.assert_awaited_once()
+        assert [c.args[0] for c in mock_melt.await_args_list] == ["lnbc64", "lnbc16"]
+        assert [c.kwargs["target_mint"] for c in mock_melt.await_args_list] == [
+            "http://a",
+            "http://b",
+        ]
+
+    async def test_cleanup_reads_backups_concurrently(
+        self, tmp_path, monkeypatch
+    ) -> None:
+        """Test that cleanup loads every backup and skips unreadable ones."""
+        monkeypatch.chdir(tmp_path)
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        kept: Proof = {
+            "id": "ks1",
+            "amount": 1,
+            "secret": "s1",
+            "C": "C1",
+            "mint": "http://test.mint",
+            "unit": "sat",
+        }
+        backup_dir = tmp_path / "proof_backups"
+        backup_dir.mkdir()
+        (backup_dir / "proofs_1_empty.json").write_text('{"proofs": []}')
+        (backup_dir / "proofs_2_broken.json").write_text("{not json")
+        (backup_dir / "proofs_3_kept.json").write_text(json.dumps({"proofs": [kept]}))
+
+        with patch.object(
+            wallet,
+            "fetch_wallet_state",
+            AsyncMock(return_value=WalletState(proofs=[kept])),
+        ):
+            assert await wallet._cleanup_spent_proof_backups() == 1
+
+        assert sorted(p.name for p in backup_dir.iterdir()) == [
+            "proofs_2_broken.json",
+            "proofs_3_kept.json",
+        ]
+
+    async def test_sats_value_fetches_each_rate_once(self) -> None:
+        """Test that proofs sharing a mint and unit trigger one rate lookup."""
+
+        def make_proof(i: int, unit: str) -> Proof:
+            return cast(
+                Proof,
+                {
+                    "id": "ks1",
+                    "amount": 100,
+                    "secret": f"s{i}",
+                    "C": f"C{i}",
+                    "mint": "http://m",
+                    "unit": unit,
+                },
+            )
+
+        proofs = [make_proof(i, u) for i, u in enumerate(["usd", "usd", "eur", "sat"])]
+        mint = AsyncMock()
+        mint.mint_exchange_rate.side_effect = lambda unit: {"usd": 2.5, "eur": 3.0}[
+            unit
+        ]
+
+        total = await sats_value_of_proofs(proofs, lambda url: mint)
+
+        assert total == 100 + 2 * 250 + 300
+        assert sorted(c.args[0] for c in mint.mint_exchange_rate.await_args_list) == [
+            "eur",
+            "usd",
+        ]
+
+
+class TestWalletEventDecryption:
+    """Test caching of decrypted event content."""
+
+    def test_event_content_decrypted_once(self) -> None:
+        """Test that an event's content is decrypted once and then cached."""
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        wallet._event_content_cache_size = 1
+        event = NostrEvent(
+            id="ev-a",
+            pubkey="",
+            created_at=0,
+            kind=EventKind.Token,
+            tags=[],
+            content="ciphertext",
+            sig="",
+        )
+        other = NostrEvent(**{**event, "id": "ev-b"})
+
+        with patch(
+            "sixty_nuts.wallet.nip44_decrypt", return_value='{"mint": "m"}'
+        ) as mock_decrypt:
+            assert wallet._decrypt_event_content(event) == {"mint": "m"}
+            assert wallet._decrypt_event_content(event) == {"mint": "m"}
+            assert mock_decrypt.call_count == 1
+
+            # The oldest entry is evicted once the cache is full
+            wallet._decrypt_event_content(other)
+            wallet._decrypt_event_content(event)
+            assert mock_decrypt.call_count == 3
+
+    def test_ingest_proofs_skips_seen_and_indexes(self) -> None:
+        """Test that ingestion converts secrets and drops already seen proofs."""
+        all_proofs: list = []
+        proof_to_event_id: dict[str, str] = {}
+        raw = [
+            {"id": "ks1", "amount": 1, "secret": "c2VjcmV0", "C": "02aa"},
+            {"id": "ks1", "amount": 2, "secret": "c2VjcmV0", "C": "02aa"},
+        ]
+
+        first = Wallet._ingest_proofs(
+            raw, "http://m", "ev-a", all_proofs, proof_to_event_id
+        )
+        second = Wallet._ingest_proofs(
+            raw, "http://m", "__pending__", all_proofs, proof_to_event_id
+        )
+
+        assert [p["amount"] for p in first] == [1]
+        assert second == []
+        assert all_proofs == first
+        assert first[0]["secret"] == b"secret".hex()
+        assert first[0]["unit"] == "sat"
+        assert proof_to_event_id == {f"{b'secret'.hex()}:02aa": "ev-a"}
+
+
+class TestWalletSwapSplit:
+    """Test swapping into separately tracked send and change outputs."""
+
+    async def test_outputs_partitioned_into_send_and_change(self) -> None:
+        """Test that swap results come back already split, in ascending order."""
+        from coincurve import PrivateKey
+
+        wallet = Wallet(
+            nsec=generate_privkey(),
+            mint_urls=["http://test.mint"],
+            relay_urls=["ws://test.relay"],
+        )
+        keys = {str(a): PrivateKey().public_key.format().hex() for a in (1, 2, 4)}
+        point = PrivateKey().public_key.format().hex()
+
+        mint = AsyncMock()
+        mint.url = "http://test.mint"
+        mint.get_keysets_info.return_value = []
+        mint.get_active_keysets.return_value = [
+            {"id": "ks1", "unit": "sat", "keys": keys}
+        ]
+
+        async def swap(*, inputs, outputs):
+            return {
+                "signatures": [
+                    {"id": o["id"], "amount": o["amount"], "C_": point} for o in outputs
+                ]
+            }
+
+        mint.swap.side_effect = swap
+        inputs: list[Proof] = [
+            {
+                "id": "ks1",
+                "amount": 8,
+                "secret": "s",
+                "C": "C",
+                "mint": "http://test.mint",
+                "unit": "sat",
+            }
+        ]
+
+        with patch.object(wallet, "_get_mint", return_value=mint):
+            send, change = await wallet._swap_proof_denominations_split(
+                inputs, {4: 1, 1: 1}, {2: 1, 1: 1}, "http://test.mint", "sat"
+            )
+
+        sent_amounts = [o["amount"] for o in mint.swap.await_args.kwargs["outputs"]]
+        assert sent_amounts == [1, 1, 2, 4]
+        assert [p["amount"] for p in send] == [1, 4]
+        assert [p["amount"] for p in change] == [1, 2]
+
+
+class TestWalletRelayDiscovery:
+    """Test relay discovery when entering the wallet context."""
+
+    async def test_discovery_reacquires_instead_of_mutating_shared_client(
+        self,
+    ) -> None:
+        """Test that discovered relays get their own client, not the shared one."""
+        from sixty_nuts.relay import RelayClient
+
+        nsec = generate_privkey()
+        discovered = ["wss://found.relay"]
+        with (
+            patch("sixty_nuts.wallet.get_relays_from_env", return_value=[]),
+            patch(
+                "sixty_nuts.relay.get_relays_for_wallet",
+                AsyncMock(return_value=discovered),
+            ),
+            patch.object(RelayClient, "get_relay_connections", AsyncMock()),
+            patch.object(RelayClient, "disconnect_all", AsyncMock()),
+        ):
+            bystander = Wallet(nsec=nsec, mint_urls=["http://test.mint"])
+            wallet = Wallet(nsec=nsec, mint_urls=["http://test.mint"])
+            shared = wallet.relay_manager
+            assert bystander.relay_manager is shared
+
+            await wallet.__aenter__()
+
+            assert shared.relay_urls == []
+            assert wallet.relay_manager is not shared
+            assert wallet.relay_manager.relay_urls == discovered
+            assert wallet.event_manager.relay_manager is wallet.relay_manager
+            assert shared._users == 1
+
+            # A later wallet with the discovered relays shares the new client
+            later = Wallet(
+                nsec=nsec, mint_urls=["http://test.mint"], relay_urls=discovered
+            )
+            assert later.relay_manager is wallet.relay_manager